@@ -1,12 +1,14 @@
 """Пакет модулей для анализа кода.
 
 - analyser: анализ кода и получение элементов
+- ast_analyser: анализ кода по синтаксическому дереву
 - data: модуль с контейнерами данных
 - enums: модуль с типами данных
 - utils: утилиты анализа для analyser
 """
 __all__ = [
     'analyser',
+    'ast_analyser',
     'data',
     'enums',
     'utils'
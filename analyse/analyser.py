@@ -36,10 +36,17 @@ class Analyser:
         self.__prop = prop
         """Словарь с настройками, переданный в конструктор."""
 
+    def clear(self):
+        """Очистить результаты, чтобы использовать анализатор повторно
+        (полученные ранее результаты не изменяются)."""
+        self.classes = Classes()
+        self.sequence = Sequence()
+        self.elements = SubElements()
+
     def _module_doc(self, module, name):
         """Документирование модуля.
 
-        :param module: список строк
+        :param module: список строк или LineTable
         :param name: имя модуля
         """
         doc_type = DocType.doc
@@ -72,7 +79,7 @@ class Analyser:
         """Документирование переменных или функций в блоке кода.
 
         :param module: имя модуля
-        :param block: список строк
+        :param block: список строк или LineTable (срез модуля)
         :param indent: int, отступ
         :param is_cls: является ли блок кода классом (для обработки __init__)
         :param cls: имя класса (при None - элемент модуля)
@@ -125,7 +132,7 @@ class Analyser:
         """Документирование классов в блоке кода.
 
         :param module: имя модуля
-        :param block: список строк
+        :param block: список строк или LineTable (срез модуля)
         :param indent: int, отступ
         :param els: tuple, иерархия имён суб-элементов,
         в порядке от верхнего до нижнего
@@ -221,7 +228,7 @@ class Analyser:
     def analyse(self, module, name):
         """Анализ и полное документирование всех элементов модуля.
 
-        :param module: список строк
+        :param module: список строк или LineTable
         :param name: имя модуля
         """
         # получение настроек
@@ -318,6 +325,7 @@ class Analyser:
             else:
                 return result  # выход на глубине
 
+        module = utils.get_table(module)  # разбор строк один раз на модуль
         self._module_doc(module, name)  # документирование модуля
         ind = utils.get_indent(module)  # получение отступа
         var_doc = False
@@ -0,0 +1,393 @@
+"""Анализ и документирование кода по синтаксическому дереву (ast)."""
+import ast
+import io
+import tokenize
+from analyse.analyser import Analyser
+import analyse.utils as utils
+from analyse.enums import *
+
+__all__ = ['ASTAnalyser']
+
+
+class ASTAnalyser(Analyser):
+    """Анализатор и документатор кода на основе модулей ast и tokenize.
+
+    Строит ту же модель (Sequence, SubElements, Classes), что и Analyser,
+    за один разбор модуля. Модули, которые не удаётся разобрать,
+    анализируются текстовым алгоритмом Analyser.
+    """
+    def __init__(self, prop):
+        """
+
+        :param prop: Словарь с настройками, аналогично Analyser.
+        """
+        Analyser.__init__(self, prop)
+        self.__prop = prop
+        """Словарь с настройками, переданный в конструктор."""
+        self.__lines = []
+        """Строки текущего модуля."""
+        self.__comments = {}
+        """Комментарии текущего модуля, {номер строки: комментарий}."""
+        self.__inline = set()
+        """Номера строк, в которых комментарий стоит после кода."""
+
+    @staticmethod
+    def __is_doc(node):
+        """Является ли узел строкой документации.
+
+        :param node: ast.stmt
+        :return: bool
+        """
+        return isinstance(node, ast.Expr) and\
+            isinstance(node.value, ast.Constant) and\
+            isinstance(node.value.value, str)
+
+    @staticmethod
+    def __get_targets(node):
+        """Получить имена переменных, которым присваивается значение.
+
+        :param node: ast.stmt
+        :return: list, имена
+        """
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        else:
+            return []
+        result = []
+        for target in targets:
+            if isinstance(target, ast.Name):
+                result.append(target.id)
+            elif isinstance(target, (ast.Tuple, ast.List)):
+                for el in target.elts:
+                    if isinstance(el, ast.Name):
+                        result.append(el.id)
+        return result
+
+    @staticmethod
+    def __get_name(node):
+        """Получить имя функции или класса в том же виде, что и Analyser:
+        имя(параметры) или имя(супер-классы).
+
+        :param node: ast.FunctionDef, ast.AsyncFunctionDef или ast.ClassDef
+        :return: str
+        """
+        if isinstance(node, ast.ClassDef):
+            args = [ast.unparse(b) for b in node.bases]
+            args += [ast.unparse(k) for k in node.keywords]
+            if args:
+                return node.name + '(' + ', '.join(args) + ')'
+            return node.name
+        name = node.name + '(' + ast.unparse(node.args) + ')'
+        if node.returns:
+            name += ' -> ' + ast.unparse(node.returns)
+        return name
+
+    def __read_comments(self, lines):
+        """Прочитать все комментарии модуля.
+
+        :param lines: список строк
+        """
+        self.__comments = {}
+        self.__inline = set()
+        readline = io.StringIO(''.join(lines)).readline
+        for token in tokenize.generate_tokens(readline):
+            if token.type != tokenize.COMMENT:
+                continue
+            number = token.start[0]
+            self.__comments[number] = token.string[1:].strip()
+            if token.line[:token.start[1]].strip():  # комментарий после кода
+                self.__inline.add(number)
+
+    def __get_comment_lines(self, pos, step):
+        """Получить комментарии, идущие подряд (пустые строки пропускаются).
+
+        :param pos: номер строки старта (с 1)
+        :param step: 1 - читать вниз, -1 - вверх
+        :return: list, комментарии в порядке чтения
+        """
+        result = []
+        while 0 < pos <= len(self.__lines):
+            if pos in self.__comments and pos not in self.__inline:
+                result.append(self.__comments[pos])
+            elif self.__lines[pos-1].strip():  # строка с кодом
+                break
+            pos += step
+        return result
+
+    def __get_comments(self, node):
+        """Получить комментарии к элементу: на строке и после, либо до,
+        по аналогии с utils.get_comments.
+
+        :param node: ast.stmt
+        :return: list, комментарии
+        """
+        result = []
+        if node.lineno in self.__inline:  # однострочный коммент
+            result.append(self.__comments[node.lineno])
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef,
+                             ast.ClassDef)):
+            last = node.lineno  # комментарии в начале тела блока
+        else:
+            last = node.end_lineno
+        after = self.__get_comment_lines(last + 1, 1)  # коммент ПОСЛЕ
+        if after:
+            result += after
+        elif not result:  # если ПОСЛЕ и однострочного нет - коммент ДО
+            first = node.lineno
+            for decorator in getattr(node, 'decorator_list', ()):
+                first = min(first, decorator.lineno)
+            result += reversed(self.__get_comment_lines(first - 1, -1))
+        return result
+
+    def __format_doc(self, node):
+        """Получить строки документации в том же виде, что и utils.get_docs.
+
+        :param node: ast.Expr, строка документации
+        :return: list
+        """
+        strip = self.__prop['strip']
+        result = []
+        for line in node.value.value.split('\n'):
+            if strip:
+                line = line.strip()
+            elif result:  # отступ относительно открывающих кавычек
+                spaces = utils.get_first_spaces(line) - node.col_offset
+                line = ' ' * spaces + line.strip()
+            else:
+                line = line.rstrip()
+            result.append(line)
+        if result and not result[-1]:  # строка с закрывающими кавычками
+            del result[-1]
+        if result and not result[0]:  # строка с открывающими кавычками
+            del result[0]
+        return result
+
+    def __get_doc(self, node, doc_node=None):
+        """Получить документацию либо комментарии элемента.
+
+        :param node: ast.stmt, элемент
+        :param doc_node: ast.Expr, строка документации (если есть)
+        :return: tuple, (DocType тип, (строки...))
+        """
+        if doc_node:
+            doc = self.__format_doc(doc_node)
+            if doc:
+                return DocType.doc, tuple(doc)
+        com = self.__get_comments(node)
+        if com:
+            return DocType.com, tuple(com)
+        return None, ()
+
+    def __get_init_targets(self, body):
+        """Получить элементы класса, определённые в __init__.
+
+        :param body: list, тело класса
+        :return: list, [(имя, узел, строка документации), ...]
+        """
+        init = None
+        for node in body:
+            if isinstance(node, ast.FunctionDef) and node.name == '__init__':
+                init = node
+                break
+        if not init:
+            return []
+        result = []
+        blocks = [init.body]
+        while blocks:  # обход вложенных блоков, кроме функций и классов
+            block = blocks.pop(0)
+            for i, node in enumerate(block):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef,
+                                     ast.ClassDef)):
+                    continue
+                for field in ('body', 'orelse', 'finalbody'):
+                    if isinstance(getattr(node, field, None), list):
+                        blocks.append(getattr(node, field))
+                for handler in getattr(node, 'handlers', ()):
+                    blocks.append(handler.body)
+                if isinstance(node, ast.Assign):
+                    targets = node.targets
+                elif isinstance(node, ast.AnnAssign):
+                    targets = [node.target]
+                else:
+                    continue
+                doc_node = None
+                if i + 1 < len(block) and self.__is_doc(block[i+1]):
+                    doc_node = block[i+1]
+                for target in targets:
+                    if isinstance(target, ast.Attribute) and\
+                            isinstance(target.value, ast.Name) and\
+                            target.value.id == 'self':
+                        result.append((target.attr, node, doc_node))
+        return result
+
+    def __is_allowed(self, step, key):
+        """Проверить, документировать ли элементы на заданной глубине.
+
+        :param step: int, глубина (0 - элементы модуля и классов)
+        :param key: str, опция с глубиной для типа элементов
+        :return: bool
+        """
+        if step == 0:
+            return True
+        depth = self.__prop['depth']
+        if depth != -1 and depth < step:
+            return False
+        return self.__prop[key] == -1 or self.__prop[key] >= step
+
+    def __variables(self, module, body, cls, hie, is_cls):
+        """Документирование переменных в блоке кода.
+
+        :param module: имя модуля
+        :param body: list, тело блока
+        :param cls: имя класса (при None - элемент модуля)
+        :param hie: tuple, иерархия имён суб-элементов
+        :param is_cls: является ли блок кода классом (для обработки __init__)
+        """
+        found = []  # (имя, узел, строка документации)
+        for i, node in enumerate(body):
+            doc_node = None
+            if i + 1 < len(body) and self.__is_doc(body[i+1]):
+                doc_node = body[i+1]
+            for name in self.__get_targets(node):
+                found.append((name, node, doc_node))
+        if is_cls:
+            found += self.__get_init_targets(body)
+        names = set()
+        for name, node, doc_node in found:
+            if name in names or self._is_private(name):
+                continue
+            names.add(name)
+            self.sequence.add(module, cls, hie + (name,))
+            self.elements.add(name, module, ElementType.var, cls, hie,
+                              doc=self.__get_doc(node, doc_node))
+
+    def __get_defs(self, body, types):
+        """Получить определения функций или классов в блоке кода.
+
+        :param body: list, тело блока
+        :param types: типы узлов ast
+        :return: list, [(имя, узел), ...], без повторов и приватных
+        """
+        result = []
+        names = set()
+        for node in body:
+            if not isinstance(node, types):
+                continue
+            name = self.__get_name(node)
+            if name in names or self._is_private(name):
+                continue
+            names.add(name)
+            result.append((name, node))
+        return result
+
+    def __functions(self, module, body, cls, hie):
+        """Документирование функций в блоке кода.
+
+        :param module: имя модуля
+        :param body: list, тело блока
+        :param cls: имя класса (при None - элемент модуля)
+        :param hie: tuple, иерархия имён суб-элементов
+        :return: list, [(имя, узел), ...]
+        """
+        functions = self.__get_defs(body, (ast.FunctionDef,
+                                           ast.AsyncFunctionDef))
+        if cls:
+            el_type = ElementType.met
+        else:
+            el_type = ElementType.fun
+        for name, node in functions:
+            doc_node = None
+            if node.body and self.__is_doc(node.body[0]):
+                doc_node = node.body[0]
+            self.sequence.add(module, cls, hie + (name,))
+            self.elements.add(name, module, el_type, cls, hie,
+                              doc=self.__get_doc(node, doc_node))
+        return functions
+
+    def __classes(self, module, body, hie):
+        """Документирование классов в блоке кода.
+
+        :param module: имя модуля
+        :param body: list, тело блока
+        :param hie: tuple, иерархия имён суб-элементов
+        :return: list, [(имя, узел), ...]
+        """
+        classes = self.__get_defs(body, ast.ClassDef)
+        for name, node in classes:
+            sup = tuple(ast.unparse(b) for b in node.bases)
+            self.classes.add(name, module, sup)
+            doc_node = None
+            if node.body and self.__is_doc(node.body[0]):
+                doc_node = node.body[0]
+            doc = self.__get_doc(node, doc_node)
+            if hie:  # сохранение в иерархии элементов
+                self.sequence.add(module, name, hie + (name,))
+                self.elements.add(name, module, ElementType.cl, None,
+                                  hie + (name,), doc=doc)
+            else:  # сохранение в модуле
+                self.sequence.add(module, name)
+                self.elements.add(name, module, ElementType.cl, doc=doc)
+        return classes
+
+    def __block(self, module, body, cls=None, hie=(), step=0, cls_hie=None,
+                is_cls=False):
+        """Документирование всех элементов блока кода, рекурсивно.
+
+        :param module: имя модуля
+        :param body: list, тело блока
+        :param cls: имя класса (при None - элемент модуля)
+        :param hie: tuple, иерархия имён суб-элементов
+        :param step: int, глубина блока
+        :param cls_hie: tuple, иерархия для вложенных классов
+        (при None - hie)
+        :param is_cls: является ли блок кода классом (для обработки __init__)
+        """
+        if cls_hie is None:
+            cls_hie = hie
+        for f in self.__prop['first']:
+            if f == 'v' and self.__is_allowed(step, 'depth_vars'):
+                self.__variables(module, body, cls, hie, is_cls)
+            elif f == 'f' and self.__is_allowed(step, 'depth_func'):
+                for name, node in self.__functions(module, body, cls, hie):
+                    self.__block(module, node.body, cls, hie + (name,),
+                                 step + 1)
+            elif f == 'c' and self.__is_allowed(step, 'depth'):
+                for name, node in self.__classes(module, body, cls_hie):
+                    if cls is None and not cls_hie:  # класс модуля
+                        self.__block(module, node.body, name, (), step,
+                                     (name,), True)
+                    else:  # вложенный класс
+                        self.__block(module, node.body, cls,
+                                     cls_hie + (name,), step + 1,
+                                     is_cls=True)
+
+    def analyse(self, module, name):
+        """Анализ и полное документирование всех элементов модуля.
+        Если модуль не разбирается - используется Analyser.analyse.
+
+        :param module: список строк или LineTable
+        :param name: имя модуля
+        """
+        lines = list(module)
+        try:
+            tree = ast.parse(''.join(lines))
+            self.__lines = lines
+            self.__read_comments(lines)
+        except (SyntaxError, ValueError, tokenize.TokenError):
+            Analyser.analyse(self, module, name)
+            return
+        # документирование модуля
+        doc = []
+        doc_type = DocType.doc
+        if tree.body and self.__is_doc(tree.body[0]):
+            doc = self.__format_doc(tree.body[0])
+        if not doc:  # если нет документации - читем комменты
+            doc = utils.get_module_docs_or_comments(lines, True,
+                                                    self.__prop['strip'])
+            doc_type = DocType.com
+        if doc:
+            self.elements.add(None, name, ElementType.mo, doc=(doc_type, doc))
+        self.sequence.add(name)
+        self.__block(name, tree.body)
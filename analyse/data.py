@@ -1,5 +1,15 @@
 """Модуль с контейнерами данных."""
-__all__ = ['Classes', 'Elements', 'SubElements', 'Sequence']
+import sys
+import struct
+from array import array
+from analyse.enums import ElementType, DocType
+
+__all__ = ['Classes', 'Element', 'ElementsView', 'Elements', 'SubElements',
+           'Names', 'NamesView', 'Sequence', 'encode', 'decode', 'MAGIC',
+           'FORMAT']
+
+_KEYS_NONE = (None,)
+"""Имена узла, в котором только элемент с именем None (общий tuple)."""
 
 
 class Classes:
@@ -17,6 +27,16 @@ class Classes:
         Ключ - имя модуля
         Значение - list, [класс, ...]
         """
+        self.subs = {}
+        """Обратный индекс наследования.
+
+        Ключ - str, название супер-класса
+        Значение - dict, {суб-класс: None, ...}
+        """
+        self.__order = {}
+        """Порядковые номера классов в cls (для порядка суб-классов)."""
+        self.__hie = {}
+        """Вычисленные иерархии, {(класс, модуль, sub): dict, ...}."""
 
     @staticmethod
     def cut_round(line):
@@ -38,12 +58,42 @@ class Classes:
         ((класс, модуль), ...)
         """
         name = self.cut_round(name)
-        self.cls[name] = (sup_names, module)
+        self.__set(name, (sup_names, module))
         if module in self.names:
             self.names[module].append(name)
         else:
             self.names[module] = [name]
 
+    def __set(self, name, value):
+        """Записать класс в cls и обновить обратный индекс.
+
+        :param name: str, название класса
+        :param value: tuple, ((супер-класс, ...), модуль)
+        """
+        if name in self.cls:  # удаление старых супер-классов из индекса
+            for sup in self.cls[name][0]:
+                self.subs[sup].pop(name, None)
+        else:
+            self.__order[name] = len(self.__order)
+        self.cls[name] = value
+        for sup in value[0]:
+            self.subs.setdefault(sup, {})[name] = None
+        self.__hie.clear()  # иерархии устарели
+
+    def merge(self, other):
+        """Добавить классы из другого контейнера, в том же порядке,
+        в котором они добавлялись в него.
+
+        :param other: Classes
+        """
+        for module in other.names:
+            for name in other.names[module]:
+                self.__set(name, other.cls[name])
+                if module in self.names:
+                    self.names[module].append(name)
+                else:
+                    self.names[module] = [name]
+
     def get_super_names(self, name, module=None):
         """Получить супер-классы.
 
@@ -71,27 +121,35 @@ class Classes:
         :return: tuple, суб-классы - ((суб-класс, модуль), ...)
         """
         name = self.cut_round(name)
+        if name not in self.subs:
+            return ()
         result = []
-        for cls in self.cls:
+        # в порядке добавления классов
+        for cls in sorted(self.subs[name], key=self.__order.__getitem__):
             val = self.cls[cls]
-            if name in val[0]:
-                if module:
-                    if module == val[1]:
-                        result.append((cls, val[1]))
-                else:
+            if module:
+                if module == val[1]:
                     result.append((cls, val[1]))
+            else:
+                result.append((cls, val[1]))
         result = tuple(result)
         return result
 
     def get_sub_or_sup_hie(self, name, sub=True, module=None):
         """Получить полную иерархию классов.
 
+        Иерархии запоминаются до изменения контейнера (возвращаемые
+        словари общие, их нельзя изменять). При циклическом наследовании
+        повторный класс в ветке не раскрывается.
+
         :param name: str, имя класса
         :param sub: bool, True - иерархия суб-классов, False - супер-классов
         :param module: str, имя модулья
         :return: dict, {класс: (модуль, [{класс: ...}, ...]), ...}
         """
         name = self.cut_round(name)
+        path = set()  # классы текущей ветки (для обнаружения циклов)
+        cycles = [0]  # количество обрезанных циклов
 
         def parse_tuple(tuple_arg):
             """Получить дальнейшую ступень иерархии классов.
@@ -117,66 +175,359 @@ class Classes:
                 val = dict_arg[cls]
                 if val[1]:  # раскрытие tuple
                     add = []
+                    path.add(cls)
                     for tup in val[1]:  # обработка всех пар (класс, модуль)
                         if tup:
-                            parse = parse_tuple(tup)  # дальнейшее раскрытие
-                            d_parse = parse_dict(parse)  # рекурсия
-                            if d_parse:
-                                add.append(d_parse)
-                            else:
-                                add.append(parse)
+                            if tup[0] in path:  # цикл - без раскрытия
+                                cycles[0] += 1
+                                add.append({tup[0]: (tup[1], ())})
+                                continue
+                            add.append(parse_hie(tup))
+                    path.discard(cls)
                     result[cls] = (val[0], add)
             return result
 
-        return parse_dict(parse_tuple((name, module)))
+        def parse_hie(tuple_arg):
+            """Получить иерархию класса (с запоминанием).
+
+            :param tuple_arg: tuple, (name, module), (класс, модуль)
+            :return: dict, {класс: (модуль, [{класс: ...}, ...])}
+            """
+            key = (tuple_arg[0], tuple_arg[1], sub)
+            if key in self.__hie:
+                return self.__hie[key]
+            before = cycles[0]
+            parse = parse_tuple(tuple_arg)  # дальнейшее раскрытие
+            d_parse = parse_dict(parse)  # рекурсия
+            if not d_parse:
+                d_parse = parse
+            if cycles[0] == before:  # без обрезанных циклов - не зависит
+                self.__hie[key] = d_parse  # от ветки
+            return d_parse
+
+        result = parse_hie((name, module))
+        if not result[name][1]:  # без иерархии
+            return {}
+        return result
+
+
+class Element:
+    """Запись таблицы элементов: элемент или узел иерархии."""
+    __slots__ = ('keys', 'type', 'doc')
+
+    def __init__(self, keys=None, type_=None, doc=None):
+        """
+
+        :param keys: имена вложенных записей (None - запись-элемент)
+        :param type_: ElementType тип элемента
+        :param doc: tuple, (DocType тип, (строки...)), документация
+        """
+        self.keys = keys
+        """tuple или list, имена вложенных записей, в порядке добавления
+        (None - запись-элемент без вложенных)."""
+        self.type = type_
+        """ElementType тип элемента. У узла - тип элемента с именем None
+        (None - такого элемента нет или он хранится отдельной записью)."""
+        self.doc = doc
+        """tuple, (DocType тип, (строки...)), документация."""
+
+    def get(self):
+        """Получить элемент.
+
+        :return: tuple, (ElementType, (DocType, ()))
+        """
+        return self.type, self.doc
+
+
+class ElementsView:
+    """Элементы узла таблицы Elements в виде словаря только для чтения.
+
+    Значения читаются из таблицы по именам вложенных записей узла, без
+    копирования: элемент - tuple, вложенный узел - ElementsView.
+    """
+    __slots__ = ('__els', '__path', '__local')
+
+    def __init__(self, els, path, local=False):
+        """
+
+        :param els: dict, таблица с элементами (см. Elements.els)
+        :param path: tuple, путь к узлу
+        :param local: bool, True - без элемента с именем None (только
+        вложенные элементы)
+        """
+        self.__els = els
+        self.__path = path
+        self.__local = local
+
+    def __getitem__(self, key):
+        if key is None and self.__local:
+            raise KeyError(key)
+        entry = self.__els.get(self.__path + (key,))
+        if entry is None:
+            node = self.__els[self.__path]
+            if key is None and node.type is not None:  # хранится в узле
+                return node.get()
+            raise KeyError(key)
+        if entry.keys is None:
+            return entry.get()
+        return ElementsView(self.__els, self.__path + (key,))
+
+    def __contains__(self, key):
+        if key is None:
+            return not self.__local and (
+                self.__els[self.__path].type is not None or
+                self.__path + (None,) in self.__els)
+        return self.__path + (key,) in self.__els
+
+    def __iter__(self):
+        for key in self.__els[self.__path].keys:
+            if key is not None or not self.__local:
+                yield key
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+    def get(self, key, default=None):
+        """Получить значение по имени.
+
+        :param key: имя
+        :param default: значение, если имени нет
+        :return: tuple (элемент), ElementsView или default
+        """
+        if key in self:
+            return self[key]
+        return default
+
+    def keys(self):
+        """Получить имена.
+
+        :return: list
+        """
+        return list(self)
+
+    def values(self):
+        """Получить значения.
+
+        :return: list
+        """
+        return [self[key] for key in self]
+
+    def items(self):
+        """Получить пары (имя, значение).
+
+        :return: list
+        """
+        return [(key, self[key]) for key in self]
+
+    def __eq__(self, other):
+        if isinstance(other, (ElementsView, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return 'ElementsView(' + repr(dict(self.items())) + ')'
 
 
 class Elements:
     """Контейнер с элементами."""
     def __init__(self):
-        self.els = {}
-        """Словарь с элементами. Каждый элемент - tuple, (ElementType, tuple):
+        self.els = {(): Element([])}
+        """Таблица с элементами. Ключ - tuple, полный путь к элементу,
+        значение - Element: элемент или узел, keys которого - индекс имён
+        вложенных записей (по ним getters читают таблицу, см.
+        ElementsView). Каждый элемент - tuple, (ElementType, tuple):
         (тип, документация) - (ElementType, (DocType, ())).
 
-        Ключи: модуль => класс => суб-элемент.
+        Путь: модуль => класс => суб-элемент => имя (None - имя без
+        значения). Элемент с именем None хранится в записи узла (без
+        отдельной записи на каждый элемент).
 
         Перменные класса:
-        модуль: {класс: {имя: (ElementType, (DocType, ()))}}.
+        (модуль, класс, имя).
 
         Локальные переменные методов класса:
-        модуль: {
-            класс: {
-                None: {
-                    суб-элемент: {имя: {None: (ElementType, (DocType, ()))}}
-                }
-            }
-        }.
+        (модуль, класс, None, суб-элемент, имя, None).
 
         Глобальные переменные:
-        модуль: {
-            None: {
-                None: {
-                    имя: (ElementType, (DocType, ()))
-                }
-            }
-        }.
+        (модуль, None, None, имя).
 
         Локальные переменные функций модуля:
-        модуль: {
-            None: {
-                суб-элемент: {имя: {None: (ElementType, (DocType, ()))}}
-            }
-        }.
+        (модуль, None, суб-элемент, имя, None).
 
         Чтобы добавить документацию по модулю, достаточно использовать
         None в качестве имени.
         """
 
+    def _find(self, path):
+        """Найти значение по пути.
+
+        :param path: tuple, путь
+        :return: Element (узел), tuple (элемент) или None (нет пути)
+        """
+        entry = self.els.get(path)
+        if entry is not None:
+            if entry.keys is None:  # элемент
+                return entry.get()
+            return entry
+        if path and path[-1] is None:  # элемент, хранящийся в узле
+            entry = self.els.get(path[:-1])
+            if entry is not None and entry.keys is not None and\
+                    entry.type is not None:
+                return entry.get()
+        return None
+
+    def _has(self, path, key):
+        """Проверить, есть ли в узле запись с именем key.
+
+        :param path: tuple, путь к узлу
+        :param key: имя
+        :return: bool, False - в том числе если по пути нет узла
+        """
+        entry = self.els.get(path)
+        if entry is None or entry.keys is None:
+            return False
+        if key is None and entry.type is not None:  # хранится в узле
+            return True
+        return path + (key,) in self.els
+
+    def _is_node(self, path):
+        """Проверить, является ли запись по пути узлом.
+
+        :param path: tuple, путь
+        :return: bool
+        """
+        return self.els.get(path) is not None and\
+            self.els[path].keys is not None
+
+    @staticmethod
+    def _add_key(entry, key):
+        """Добавить имя вложенной записи в узел.
+
+        :param entry: Element, узел
+        :param key: имя
+        """
+        if not entry.keys:  # первое имя в узле
+            entry.keys = _KEYS_NONE if key is None else (key,)
+        else:
+            if type(entry.keys) == tuple:
+                entry.keys = list(entry.keys)
+            entry.keys.append(key)
+
+    def _node(self, path):
+        """Получить узел по пути, недостающие узлы создаются (элемент на
+        пути становится элементом с именем None в узле).
+
+        :param path: tuple, путь
+        :return: Element
+        """
+        entry = self.els.get(path)
+        if entry is None:
+            self._add_key(self._node(path[:-1]), path[-1])
+            entry = self.els[path] = Element(())
+        elif entry.keys is None:
+            entry.keys = _KEYS_NONE
+        return entry
+
+    def _remove(self, path):
+        """Удалить записи по пути (со всеми вложенными), имя в узле
+        остаётся.
+
+        :param path: tuple, путь
+        """
+        entry = self.els.pop(path, None)
+        if entry is None:  # элемент, хранящийся в узле
+            parent = self.els[path[:-1]]
+            parent.type = None
+            parent.doc = None
+        elif entry.keys:
+            for key in entry.keys:
+                if key is not None or entry.type is None:
+                    self._remove(path + (key,))
+
+    def _replace(self, path):
+        """Подготовить путь к записи: старые записи по пути удаляются
+        (место в узле сохраняется), недостающие узлы создаются.
+
+        :param path: tuple, путь
+        :return: Element, узел, в котором будет запись
+        """
+        parent = self._node(path[:-1])
+        if self._has(path[:-1], path[-1]):  # замена
+            self._remove(path)
+        else:
+            self._add_key(parent, path[-1])
+        return parent
+
+    def _set(self, path, el_type, doc):
+        """Записать элемент по пути (с заменой).
+
+        :param path: tuple, путь
+        :param el_type: ElementType тип элемента
+        :param doc: tuple, (DocType тип, (строки...)), документация
+        """
+        parent = self._replace(path)
+        if path[-1] is None:  # хранится в узле
+            parent.type = el_type
+            parent.doc = doc
+        else:
+            self.els[path] = Element(None, el_type, doc)
+
+    def _clear(self, path):
+        """Записать пустой узел по пути (с заменой).
+
+        :param path: tuple, путь
+        """
+        self._replace(path)
+        self.els[path] = Element(())
+
+    def _set_local(self, path, el_type, doc):
+        """Записать локальный элемент: узел по пути (с заменой) с
+        элементом с именем None.
+
+        :param path: tuple, путь
+        :param el_type: ElementType тип элемента
+        :param doc: tuple, (DocType тип, (строки...)), документация
+        """
+        self._clear(path)
+        self._set(path + (None,), el_type, doc)
+
+    def _get(self, path, local=False):
+        """Получить значение по пути.
+
+        :param path: tuple, путь
+        :param local: bool, True - без элемента с именем None (только
+        вложенные элементы)
+        :return: tuple (элемент), ElementsView (узел) или {} (нет пути)
+        """
+        value = self._find(path)
+        if value is None:
+            return {}
+        if type(value) == tuple:
+            return value
+        return ElementsView(self.els, path, local)
+
+    def _walk(self, path):
+        """Получить все записи по пути (со вложенными).
+
+        :param path: tuple, путь
+        :return: генератор tuple, (путь, Element)
+        """
+        entry = self.els[path]
+        yield path, entry
+        if entry.keys:
+            for key in entry.keys:
+                if key is not None or entry.type is None:
+                    yield from self._walk(path + (key,))
+
     def add(
             self, name, module, el_type,
             cls=None, sub_el=None, doc=(None, ())
     ):
-        """Добавить элемент в словарь.
+        """Добавить элемент в таблицу (запись с тем же путём заменяется).
+
+        Пути повторяют прежние вложенные словари, в том числе локальные
+        элементы первого элемента модуля (модуль, None, None, суб-элемент,
+        имя) и класса, которого ещё нет (модуль, класс, суб-элемент, имя).
 
         :param name: имя элемента
         :param module: имя модуля
@@ -185,66 +536,39 @@ class Elements:
         :param sub_el: имя суб-элемента (None если его нет)
         :param doc: tuple, (DocType тип, (строки...)), документация
         """
-        if module in self.els:  # пополнение модуля
-            mod = self.els[module]
+        mod = (module,)
+        if sub_el is None:
             if cls:  # элемент класса
-                if cls in mod:  # пополнение класса
-                    if sub_el:  # элемент элемента класса
-                        se = mod[cls]
-                        if None in se:  # пополнение суб-элемента
-                            if sub_el in se[None]:
-                                se[None][sub_el][name] = {None: (el_type, doc)}
-                            else:
-                                se[None][sub_el] =\
-                                    {name: {None: (el_type, doc)}}
-                            se[None][sub_el][name] = {None: (el_type, doc)}
-                        else:  # добавление суб-элемента
-                            se[None] = {
-                                sub_el: {name: {None: (el_type, doc)}}
-                            }
-                    else:  # элемент класса
-                        mod[cls][name] = (el_type, doc)
-                else:  # добавление класса
-                    if sub_el:  # добавление суб-элемента
-                        mod[cls] = {sub_el: {name: {None: (el_type, doc)}}}
-                    else:  # добавление элемента
-                        mod[cls] = {name: (el_type, doc)}
+                self._set(mod + (cls, name), el_type, doc)
             else:  # элемент модуля
-                if sub_el:  # элемент элемента модуля
-                    if None in mod:  # пополнение элементов модуля
-                        se = mod[None]
-                        if sub_el in se:  # пополнение элемента
-                            se[sub_el][name] = {None: (el_type, doc)}
-                        else:  # добавление элемента
-                            se[sub_el] = {name: {None: (el_type, doc)}}
-                    else:  # добавление элемента модуля
-                        mod[None] = {sub_el: {name: {None: (el_type, doc)}}}
-                else:  # элемент модуля
-                    if None in mod:  # пополнение элементов модуля
-                        se = mod[None]
-                        if None in se:  # пополнение элементов
-                            se[None][name] = (el_type, doc)
-                        else:  # добавление элемента
-                            se[None] = {name: (el_type, doc)}
-                    else:  # добавление элемента модуля
-                        mod[None] = {None: {name: (el_type, doc)}}
-        else:  # добавление модуля
-            if cls:  # пополнение класса
-                if sub_el:  # пополение элементов элемента класса
-                    self.els[module] = {
-                        cls: {None: {sub_el: {name: {None: (el_type, doc)}}}}
-                    }
-                else:  # пополнение элементов
-                    self.els[module] = {cls: {name: (el_type, doc)}}
-            else:  # пополнение модуля
-                if sub_el:  # пополнение элементов элемента модуля
-                    self.els[module] = {
-                        None: {None: {sub_el: {name: {None: (el_type, doc)}}}}
-                    }
-                else:  # пополнение элементов модуля
-                    self.els[module] = {
-                        None: {None: {name: (el_type, doc)}}
-                    }
+                self._set(mod + (None, None, name), el_type, doc)
+        elif cls:  # элемент элемента класса
+            if mod in self.els and mod + (cls,) not in self.els:
+                path = mod + (cls, sub_el, name)
+            else:
+                path = mod + (cls, None, sub_el, name)
+            self._set_local(path, el_type, doc)
+        else:  # элемент элемента модуля
+            if mod in self.els:
+                path = mod + (None, sub_el, name)
+            else:
+                path = mod + (None, None, sub_el, name)
+            self._set_local(path, el_type, doc)
+
+    def merge(self, other):
+        """Добавить модули из другого контейнера (модули с теми же именами
+        заменяются).
+
+        :param other: Elements
+        """
+        for module in other.els[()].keys:
+            mod = (module,)
+            self._replace(mod)  # место модуля сохраняется
+            for path, entry in other._walk(mod):  # копии, чтобы
+                keys = entry.keys  # контейнеры не зависели друг от друга
+                if type(keys) == list:
+                    keys = keys.copy()
+                self.els[path] = Element(keys, entry.type, entry.doc)
 
     def get_module(self, module):
         """Получить документацию по модулю.
@@ -252,56 +576,33 @@ class Elements:
         :param module: имя модуля
         :return: tuple, (ElementType, (DocType, ()))
         """
-        if module in self.els:
-            mod = self.els[module]
-            if None in mod and None in mod[None] and None in mod[None][None]\
-                    and None in mod[None][None][None]:
-                return mod[None][None][None][None]
-        return ()
+        return self._get((module, None, None, None, None)) or ()
 
     def get_global(self, module):
         """Получить глобальные элементы модуля.
 
         :param module: имя модуля
-        :return: dict, {имя: (ElementType, (DocType, ()))}
+        :return: ElementsView, {имя: (ElementType, (DocType, ()))}
         """
-        if module in self.els:
-            mod = self.els[module]
-            if None in mod and None in mod[None]:
-                return mod[None][None]
-        return {}
+        return self._get((module, None, None))
 
     def get_global_local(self, module, el):
         """Получить локальные перменные элемента модуля.
 
         :param module: имя модуля
         :param el: имя элемента
-        :return: dict, {имя: (ElementType, (DocType, ()))}
+        :return: ElementsView, {имя: {None: (ElementType, (DocType, ()))}}
         """
-        if module in self.els:
-            mod = self.els[module]
-            if None in mod and el in mod[None]:
-                result = mod[None][el].copy()
-                if None in result:
-                    del result[None]
-                return result
-        return {}
+        return self._get((module, None, el), True)
 
     def get_self(self, module, cls):
         """Получить элементы класса.
 
         :param module: имя модуля
         :param cls: имя класса
-        :return: dict, {имя: (ElementType, (DocType, ()))}
+        :return: ElementsView, {имя: (ElementType, (DocType, ()))}
         """
-        if module in self.els:
-            mod = self.els[module]
-            if cls in mod:
-                result = mod[cls].copy()
-                if None in result:
-                    del result[None]
-                return result
-        return {}
+        return self._get((module, cls), True)
 
     def get_self_local(self, module, cls, el):
         """Получить элементы элемента класса.
@@ -309,63 +610,39 @@ class Elements:
         :param module: имя модуля
         :param cls: имя класса
         :param el: имя элемента
-        :return: dict, {имя: (ElementType, (DocType, ()))}
+        :return: ElementsView, {имя: {None: (ElementType, (DocType, ()))}}
         """
-        if module in self.els:
-            mod = self.els[module]
-            if cls in mod and None in mod[cls] and el in mod[cls][None]:
-                result = mod[cls][None][el].copy()
-                if None in result:
-                    del result[None]
-                return result
-        return {}
+        return self._get((module, cls, None, el), True)
 
 
 class SubElements(Elements):
     """Расширенный контейнер с элементами, полная глубина данных.
 
-    Словарь els заполняется полными данными о локальных элементах.
+    Таблица els заполняется полными данными о локальных элементах.
 
     Локальные переменные методов класса:
-    модуль: {
-        класс: {
-            None: {
-                суб-элемент: {
-                    имя: {
-                        None: (ElementType, (DocType, ()))
-                        суб-элемент1: {
-                            имя: {
-                                None: (ElementType, (DocType, ()))
-                                cуб-элемент2: {
-                                    имя: {None: (ElementType, (DocType, ()))}
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
+    (модуль, класс, None, суб-элемент, имя, None),
+    (модуль, класс, None, суб-элемент, имя, суб-элемент1, имя, None),
+    ...
 
     Вложенная глубина может быть любой, по аналогии.
 
     Локальные переменные функций модуля:
-    модуль: {
-        None: {
-            суб-элемент: {
-                имя: {
-                    None: (ElementType, (DocType, ()))
-                    суб-элемент1: ...
-                }
-            }
-        }
-    }
+    (модуль, None, суб-элемент, имя, None),
+    (модуль, None, суб-элемент, имя, суб-элемент1, имя, None),
+    ...
     """
     def add(
             self, name, module, el_type,
             cls=None, sub_el=(), doc=(None, ())
     ):
-        """Добавить элемент в словарь.
+        """Добавить элемент в таблицу.
+
+        Элементы с иерархией из нескольких суб-элементов добавляются в
+        узел, до которого иерархия уже есть в таблице, цепочкой
+        недостающих суб-элементов; как и прежде, цепочки остальных
+        суб-элементов добавляются в тот же узел, а класс без локальных
+        элементов заменяется узлом для них.
 
         :param name: имя элемента
         :param module: имя модуля
@@ -375,110 +652,82 @@ class SubElements(Elements):
         в порядке от верхнего до нижнего
         :param doc: tuple, (DocType тип, (строки...)), документация
         """
-        def add(pos, se_dict):
-            """Добавить элемент в самый низ иерархии, разобрав словарь els.
+        def add(pos, path):
+            """Добавить цепочки суб-элементов, которых нет в узле.
 
             :param pos: позиция старта в sub_el
-            :param se_dict: словарь (ссылающийся на self.els)
+            :param path: tuple, путь к узлу
             """
-            def add_in(pos_, se_dict_):
-                if pos_ >= len(sub_el):
-                    return
-                se_dict_[sub_el[pos_]] = {}
-                pos_ += 1
-                if pos_ >= len(sub_el):
-                    se_dict_[sub_el[pos_-1]] = {name: {None: (el_type, doc)}}
-                else:
-                    add_in(pos_, se_dict_[sub_el[pos_-1]])
-
             while pos < len(sub_el):
-                if sub_el[pos] not in se_dict:
-                    add_in(pos, se_dict)
+                if not self._has(path, sub_el[pos]):
+                    chain = path
+                    for key in sub_el[pos:]:
+                        chain += (key,)
+                        self._clear(chain)
+                    self._set_local(chain + (name,), el_type, doc)
                 pos += 1
 
-        def get_pos(se_dict):
-            """Получить последнюю позицию в словаре,
-            до которой ведёт иерархия sub_el.
+        def get_pos(path):
+            """Получить путь, до которого иерархия sub_el есть в
+            таблице, и позицию последнего найденного имени в sub_el.
 
-            :param se_dict: словарь (ссылающийся на self.els)
-            :return: tuple, индекс последней позиции и разложенный словарь
+            :param path: tuple, путь к узлу
+            :return: tuple, (позиция, путь)
             """
             pos = 0
-            for s in sub_el:
-                if s in se_dict:
-                    se_dict = se_dict[s]
-                else:
+            for key in sub_el:
+                if not self._has(path, key):
                     break
+                path += (key,)
                 pos += 1
-            if pos > 0:
-                pos -= 1
-            return pos, se_dict
+            return max(pos - 1, 0), path
 
         if not sub_el:
             Elements.add(self, name, module, el_type, cls, None, doc)
         elif len(sub_el) == 1:
             Elements.add(self, name, module, el_type, cls, sub_el[0], doc)
         else:
-            if module in self.els:
-                mod = self.els[module]
-                if cls:
-                    if cls in mod:
-                        se = mod[cls]
-                        if None in se:
-                            p_pos = get_pos(se)
-                            if type(p_pos[1]) == dict:
-                                add(*p_pos)
-                        else:
-                            mod[cls] = {None: {}}
-                            add(0, mod[cls][None])
-                    else:
-                        mod[cls] = {None: {}}
-                        add(0, mod[cls][None])
-                else:
-                    if None in mod:
-                        se = mod[None]
-                        p_pos = get_pos(se)
-                        if type(p_pos[1]) == dict:
-                            add(*p_pos)
-                    else:
-                        mod[None] = {}
-                        add(0, mod[None])
+            mod = (module,)
+            if mod not in self.els:  # новый модуль
+                path = mod + (cls,) if cls else mod + (None,)
+                self._node(path)
+                add(0, path)
+            elif cls and self._has(mod + (cls,), None):
+                pos, path = get_pos(mod + (cls,))
+                if self._is_node(path):
+                    add(pos, path)
+            elif cls:  # класс без локальных элементов
+                self._clear(mod + (cls,))
+                self._clear(mod + (cls, None))
+                add(0, mod + (cls, None))
+            elif mod + (None,) in self.els:
+                pos, path = get_pos(mod + (None,))
+                if self._is_node(path):
+                    add(pos, path)
             else:
-                self.els[module] = {}
-                mod = self.els[module]
-                if cls:
-                    mod[cls] = {}
-                    add(0, mod[cls])
-                else:
-                    mod[None] = {}
-                    add(0, mod[None])
+                self._clear(mod + (None,))
+                add(0, mod + (None,))
 
     def __get_local(self, module, cls=None, el=()):
-        """Получить словарь суб-элементов элемента.
+        """Получить суб-элементы элемента.
 
         :param module: имя модуля
         :param cls: имя класса (None если элемент модуля)
         :param el: tuple, иерархия имён суб-элементов,
         в порядке от верхнего до нижнего (нужного)
-        :return: dict, {имя: {None: (ElementType, (DocType, ())), ...}}
-        """
-        if module in self.els:
-            mod = self.els[module]
-            if cls and cls in mod:
-                mod = mod[cls]
-            i = 0
-            while i < len(el):
-                if el[i] in mod:
-                    mod = mod[el[i]]
-                    i += 1
-                else:
-                    break
-            if i == len(el):
-                result = mod.copy()
-                if None in result:
-                    del result[None]
-                return result
+        :return: ElementsView, {имя: {None: (ElementType, (DocType, ())),
+        ...}}
+        """
+        path = (module,)
+        if path not in self.els:
             return {}
+        if cls and self._has(path, cls):
+            path += (cls,)
+        for key in el:
+            if not self._has(path, key):
+                return {}
+            path += (key,)
+        return self._get(path, True)
 
     def get_global_local(self, module, el=()):
         """Получить локальные перменные элемента модуля.
@@ -486,7 +735,8 @@ class SubElements(Elements):
         :param module: имя модуля
         :param el: tuple / str, иерархия имён суб-элементов,
         в порядке от верхнего до нижнего (нужного)
-        :return: dict, {имя: {None: (ElementType, (DocType, ())), ...}}
+        :return: ElementsView, {имя: {None: (ElementType, (DocType, ())),
+        ...}}
         """
         if type(el) == str or len(el) == 1:
             return Elements.get_global_local(self, module, el[0])
@@ -500,12 +750,74 @@ class SubElements(Elements):
         :param cls: имя класса (None если элемент модуля)
         :param el: tuple / str, иерархия имён суб-элементов,
         в порядке от верхнего до нижнего (нужного)
-        :return: dict, {имя: {None: (ElementType, (DocType, ())), ...}}
+        :return: ElementsView, {имя: {None: (ElementType, (DocType, ())),
+        ...}}
         """
-        if type(el) == str or len(el) == 1:
-            return Elements.get_global_local(self, module, el[0])
-        else:
+        if type(el) == str:
+            el = (el,)
+        if len(el) != 1:
             return self.__get_local(module, cls, el)
+        if cls is None:
+            return Elements.get_global_local(self, module, el[0])
+        # элементы метода: (модуль, класс, None, метод)
+        return Elements.get_self_local(self, module, cls, el[0])
+
+
+class Names(list):
+    """Список неповторяющихся имён в порядке добавления, с проверкой
+    вхождения за O(1)."""
+    __slots__ = ('__set',)
+
+    def __init__(self, names=()):
+        """
+
+        :param names: имена
+        """
+        list.__init__(self, names)
+        self.__set = set(self)
+
+    def append(self, name):
+        """Добавить имя в конец.
+
+        :param name: str, имя
+        """
+        list.append(self, name)
+        self.__set.add(name)
+
+    def __contains__(self, name):
+        return name in self.__set
+
+
+class NamesView:
+    """Представление списка имён только для чтения (без копирования)."""
+    __slots__ = ('__names',)
+
+    def __init__(self, names):
+        """
+
+        :param names: Names или list
+        """
+        self.__names = names
+
+    def __iter__(self):
+        return iter(self.__names)
+
+    def __len__(self):
+        return len(self.__names)
+
+    def __getitem__(self, index):
+        return self.__names[index]
+
+    def __contains__(self, name):
+        return name in self.__names
+
+    def __eq__(self, other):
+        if isinstance(other, NamesView):
+            other = other.__names
+        return list(self.__names) == list(other)
+
+    def __repr__(self):
+        return 'NamesView(' + repr(list(self.__names)) + ')'
 
 
 class Sequence:
@@ -514,6 +826,8 @@ class Sequence:
         self.mods = {}
         """Словарь с последовательностями модулей, классов и элементов.
 
+        Списки имён - Names, getters возвращают NamesView.
+
         {
             None: [модуль1, модуль2, модуль3, ...]
             модуль: {
@@ -564,14 +878,14 @@ class Sequence:
                         if e not in se_dict[None][0]:
                             se_dict[None][0].append(e)
                     else:
-                        se_dict[None] = [[e], []]
+                        se_dict[None] = [Names((e,)), Names()]
                 else:
                     # в список элементов, все последующие - в список классов
                     if None in se_dict:
                         if e not in se_dict[None][1]:
                             se_dict[None][1].append(e)
                     else:
-                        se_dict[None] = [[], [e]]
+                        se_dict[None] = [Names(), Names((e,))]
                     one = True
                 if e in se_dict:  # раскрытие словаря в глубину
                     se_dict = se_dict[e]
@@ -590,7 +904,7 @@ class Sequence:
                         if cls not in se[None][0]:
                             se[None][0].append(cls)
                     else:
-                        se[None] = [[cls], []]
+                        se[None] = [Names((cls,)), Names()]
                 else:
                     mod[None] = {None: [cls]}
                 if el:  # добавление элемента в класс
@@ -609,7 +923,7 @@ class Sequence:
             if None in self.mods:  # добавление в список модулей
                 self.mods[None].append(module)
             else:
-                self.mods[None] = [module]
+                self.mods[None] = Names((module,))
             self.mods[module] = {}  # создание словаря с элементами модуля
             mod = self.mods[module]
             if cls:  # элемент класса
@@ -619,38 +933,68 @@ class Sequence:
                 mod[None] = {}
                 add(mod[None], False)
 
+    @staticmethod
+    def _copy(value):
+        """Скопировать последовательности модуля (словари и списки имён).
+
+        :param value: dict, list или Names (см. mods), str
+        :return: копия
+        """
+        if type(value) == dict:
+            return {key: Sequence._copy(value[key]) for key in value}
+        if type(value) == Names:
+            return Names(value)
+        if type(value) == list:
+            return [Sequence._copy(item) for item in value]
+        return value
+
+    def merge(self, other):
+        """Добавить модули из другого контейнера (модули с теми же именами
+        заменяются).
+
+        :param other: Sequence
+        """
+        for module in other.get_modules():
+            if module not in self.mods:
+                if None in self.mods:  # добавление в список модулей
+                    self.mods[None].append(module)
+                else:
+                    self.mods[None] = Names((module,))
+            # копии, чтобы контейнеры не зависели друг от друга
+            self.mods[module] = self._copy(other.mods[module])
+
     def get_modules(self):
         """Получить последовательность модулей.
 
-        :return: list
+        :return: NamesView
         """
         if None in self.mods:
-            return self.mods[None]
-        return []
+            return NamesView(self.mods[None])
+        return NamesView(())
 
     def get_classes(self, module):
         """Получить последовательность классов.
 
         :param module: имя модуля
-        :return: list
+        :return: NamesView
         """
         if module in self.mods:
             mod = self.mods[module]
             if None in mod and None in mod[None]:
-                return mod[None][None][0]
-        return []
+                return NamesView(mod[None][None][0])
+        return NamesView(())
 
     def get_global_elements(self, module):
         """Получить последовательность элементов модуля.
 
         :param module: имя модуля
-        :return: list
+        :return: NamesView
         """
         if module in self.mods:
             mod = self.mods[module]
             if None in mod and None in mod[None]:
-                return mod[None][None][1]
-        return []
+                return NamesView(mod[None][None][1])
+        return NamesView(())
 
     @staticmethod
     def __get_local(se_dict, el=()):
@@ -659,16 +1003,16 @@ class Sequence:
         :param se_dict: словарь (ссылающийся на self.mods)
         :param el: tuple, иерархия имён элементов,
         в порядке от верхнего до нижнего
-        :return: list
+        :return: NamesView
         """
         for e in el:
             if e in se_dict:
                 se_dict = se_dict[e]
             else:  # искомого элемента в иерархии нет
-                return []
+                return NamesView(())
         if None in se_dict:
-            return se_dict[None][0]
-        return []
+            return NamesView(se_dict[None][0])
+        return NamesView(())
 
     def get_global_local_elements(self, module, el=()):
         """Получить последовательность элементов
@@ -677,28 +1021,28 @@ class Sequence:
         :param module: имя модуля
         :param el: tuple, иерархия имён элементов,
         в порядке от верхнего до нижнего
-        :return: list
+        :return: NamesView
         """
         if module in self.mods:
             mod = self.mods[module]
             if None in mod:
                 return self.__get_local(mod[None], el)
-        return []
+        return NamesView(())
 
     def get_self_elements(self, module, cls):
         """Получить последовательность элементов класса.
 
         :param module: имя модуля
         :param cls: имя класса
-        :return: list
+        :return: NamesView
         """
         if module in self.mods:
             mod = self.mods[module]
             if cls in mod:
                 se = mod[cls]
                 if None in se:
-                    return se[None][0]
-        return []
+                    return NamesView(se[None][0])
+        return NamesView(())
 
     def get_self_local_elements(self, module, cls, el=()):
         """Получить последовательность элементов
@@ -708,10 +1052,319 @@ class Sequence:
         :param cls: имя класса
         :param el: tuple, иерархия имён элементов,
         в порядке от верхнего до нижнего
-        :return: list
+        :return: NamesView
         """
         if module in self.mods:
             mod = self.mods[module]
             if cls in mod:
-                return self.__get_local(mod[None], el)
-        return []
+                return self.__get_local(mod[cls], el)
+        return NamesView(())
+
+
+MAGIC = b'NPDM'
+"""Сигнатура сериализованной модели (см. encode)."""
+FORMAT = 1
+"""Версия формата сериализованной модели."""
+
+# метки значений в потоке чисел
+__NONE, __STR, __TUPLE, __LIST, __NAMES, __DICT, __INT, __EL_TYPE,\
+    __DOC_TYPE, __TRUE, __FALSE = range(11)
+__STRS = 16
+"""Прибавляется к метке tuple, list и Names, если в них только строки
+(записываются номера строк, без меток)."""
+__HEAD = struct.Struct('<4sB')
+"""Сигнатура и версия формата."""
+__SIZE = struct.Struct('<cQ')
+"""Тип чисел массива (см. array) и размер массива."""
+
+
+def __write_array(out, values):
+    """Записать массив неотрицательных чисел наименьшей подходящей
+    разрядности (little-endian).
+
+    :param out: bytearray
+    :param values: list, числа
+    """
+    top = max(values, default=0)
+    for code in 'BHIQ':  # от меньшей разрядности к большей
+        if top < 1 << 8 * array(code).itemsize:
+            break
+    data = array(code, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    out += __SIZE.pack(code.encode(), len(data))
+    out += data.tobytes()
+
+
+def __read_array(data, pos):
+    """Прочитать массив чисел (см. __write_array).
+
+    :param data: bytes
+    :param pos: int, смещение
+    :return: tuple, (list, int), (числа, смещение после массива)
+    """
+    code, count = __SIZE.unpack_from(data, pos)
+    pos += __SIZE.size
+    result = array(code.decode())
+    end = pos + count * result.itemsize
+    result.frombytes(data[pos:end])
+    if sys.byteorder == 'big':
+        result.byteswap()
+    return result.tolist(), end
+
+
+def __encode_value(value, ints, strings):
+    """Записать значение (словари, списки, строки, ...) в поток чисел.
+
+    :param value: значение
+    :param ints: list, поток чисел
+    :param strings: dict, таблица строк, {строка: номер}
+    """
+    type_ = type(value)
+    if type_ is str:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        ints += (__STR, index)
+    elif value is None:
+        ints.append(__NONE)
+    elif type_ is tuple or type_ is list or type_ is Names:
+        if type_ is tuple:
+            tag = __TUPLE
+        elif type_ is list:
+            tag = __LIST
+        else:
+            tag = __NAMES
+        if all(type(item) is str for item in value):  # только номера
+            ints += (tag + __STRS, len(value))
+            for item in value:
+                index = strings.get(item)
+                if index is None:
+                    index = strings[item] = len(strings)
+                ints.append(index)
+            return
+        ints += (tag, len(value))
+        for item in value:
+            __encode_value(item, ints, strings)
+    elif type_ is dict:
+        ints += (__DICT, len(value))
+        for key in value:
+            __encode_value(key, ints, strings)
+            __encode_value(value[key], ints, strings)
+    elif type_ is ElementType:
+        ints += (__EL_TYPE, value)
+    elif type_ is DocType:
+        ints += (__DOC_TYPE, value)
+    elif type_ is bool:
+        ints.append(__TRUE if value else __FALSE)
+    elif type_ is int:  # знак в младшем бите
+        ints += (__INT, value << 1 if value >= 0 else (-value << 1) - 1)
+    else:
+        raise TypeError('unsupported type: ' + type_.__name__)
+
+
+def __decode_value(next_, strings):
+    """Прочитать значение из потока чисел (см. __encode_value).
+
+    :param next_: функция получения следующего числа потока
+    :param strings: list, таблица строк
+    :return: значение
+    """
+    tag = next_()
+    if tag == __STR:
+        return strings[next_()]
+    if tag == __NONE:
+        return None
+    if tag > __STRS:  # tuple, list или Names только со строками
+        items = [strings[next_()] for i in range(next_())]
+        tag -= __STRS
+    elif tag == __DICT:
+        result = {}
+        for i in range(next_()):
+            key = __decode_value(next_, strings)
+            result[key] = __decode_value(next_, strings)
+        return result
+    elif tag == __TUPLE or tag == __LIST or tag == __NAMES:
+        items = [__decode_value(next_, strings) for i in range(next_())]
+    elif tag == __EL_TYPE:
+        return ElementType(next_())
+    elif tag == __DOC_TYPE:
+        return DocType(next_())
+    elif tag == __INT:
+        value = next_()
+        return value >> 1 if not value & 1 else -((value + 1) >> 1)
+    elif tag == __TRUE or tag == __FALSE:
+        return tag == __TRUE
+    else:
+        raise ValueError('corrupted model data')
+    if tag == __TUPLE:
+        return tuple(items)
+    if tag == __NAMES:
+        return Names(items)
+    return items
+
+
+def __encode_elements(elements, path, ints, strings):
+    """Записать записи Elements (в глубину, от пути).
+
+    Пути не записываются: они восстанавливаются по именам узлов. Имена
+    записываются номерами строк + 1 (0 - None), документация вида
+    (DocType, (строки...)) - без меток.
+
+    :param elements: Elements
+    :param path: tuple, путь к записи
+    :param ints: list, поток чисел
+    :param strings: dict, таблица строк, {строка: номер}
+    """
+    entry = elements.els[path]
+    keys = entry.keys
+    if keys is None:
+        ints.append(0)
+    else:
+        ints += (1 if type(keys) is tuple else 2, len(keys))
+        for key in keys:
+            if key is None:
+                ints.append(0)
+                continue
+            index = strings.get(key)
+            if index is None:
+                index = strings[key] = len(strings)
+            ints.append(index + 1)
+    ints.append(0 if entry.type is None else entry.type + 1)
+    doc = entry.doc
+    if doc is None:
+        ints.append(0)
+    elif type(doc) is tuple and len(doc) == 2 and\
+            (doc[0] is None or type(doc[0]) is DocType) and\
+            type(doc[1]) is tuple and\
+            all(type(line) is str for line in doc[1]):
+        ints += (2 if doc[0] is None else doc[0] + 3, len(doc[1]))
+        for line in doc[1]:
+            index = strings.get(line)
+            if index is None:
+                index = strings[line] = len(strings)
+            ints.append(index)
+    else:  # документация другого вида
+        ints.append(1)
+        __encode_value(doc, ints, strings)
+    if keys:
+        for key in keys:
+            if key is not None or entry.type is None:
+                __encode_elements(elements, path + (key,), ints, strings)
+
+
+def __decode_elements(els, path, next_, strings):
+    """Прочитать записи Elements (см. __encode_elements).
+
+    :param els: dict, таблица с элементами (заполняется)
+    :param path: tuple, путь к записи
+    :param next_: функция получения следующего числа потока
+    :param strings: list, таблица строк
+    """
+    kind = next_()
+    keys = None
+    if kind:
+        keys = [None if index == 0 else strings[index - 1]
+                for index in [next_() for i in range(next_())]]
+        if kind == 1:  # tuple
+            keys = _KEYS_NONE if keys == [None] else tuple(keys)
+    type_ = __EL_TYPES[next_()]
+    doc = next_()
+    if doc > 1:
+        doc = (__DOC_TYPES[doc - 2],
+               tuple([strings[next_()] for i in range(next_())]))
+    elif doc:
+        doc = __decode_value(next_, strings)
+    else:
+        doc = None
+    els[path] = Element(keys, type_, doc)
+    if keys:
+        for key in keys:
+            if key is not None or type_ is None:
+                __decode_elements(els, path + (key,), next_, strings)
+
+
+__EL_TYPES = (None,) + tuple(ElementType)
+"""Типы элементов по записанным номерам (0 - None)."""
+__DOC_TYPES = (None,) + tuple(DocType)
+"""Типы документации по записанным номерам (0 - None)."""
+
+
+def encode(model):
+    """Сериализовать модель в компактный двоичный вид.
+
+    Формат: сигнатура MAGIC и версия FORMAT, таблица строк (длины и
+    строки в UTF-8, каждая строка записывается один раз) и поток чисел
+    (метки, номера строк, размеры). Записи Elements идут подряд, в
+    глубину, без путей. Числа записываются массивом наименьшей
+    подходящей разрядности, поэтому (де)сериализация выполняется в
+    основном встроенными функциями.
+
+    :param model: tuple, (Sequence, Elements или SubElements, Classes),
+    любой из контейнеров может быть None
+    :return: bytes
+    """
+    sequence, elements, classes = model
+    ints = []
+    strings = {}
+    if sequence is None:
+        ints.append(0)
+    else:
+        ints.append(1)
+        __encode_value(sequence.mods, ints, strings)
+    if elements is None:
+        ints.append(0)
+    else:
+        ints.append(2 if isinstance(elements, SubElements) else 1)
+        __encode_elements(elements, (), ints, strings)
+    if classes is None:
+        ints.append(0)
+    else:
+        ints.append(1)
+        __encode_value(classes.cls, ints, strings)
+        __encode_value(classes.names, ints, strings)
+    out = bytearray(__HEAD.pack(MAGIC, FORMAT))
+    __write_array(out, [len(string) for string in strings])
+    text = ''.join(strings).encode('utf-8', 'surrogatepass')
+    out += struct.pack('<Q', len(text))
+    out += text
+    __write_array(out, ints)
+    return bytes(out)
+
+
+def decode(data):
+    """Восстановить модель из двоичного вида (см. encode).
+
+    :param data: bytes
+    :return: tuple, (Sequence, Elements или SubElements, Classes),
+    контейнеры, которые не были записаны, - None
+    """
+    magic, version = __HEAD.unpack_from(data)
+    if magic != MAGIC or version != FORMAT:
+        raise ValueError('unsupported model format')
+    lengths, pos = __read_array(data, __HEAD.size)
+    size = struct.unpack_from('<Q', data, pos)[0]
+    pos += 8
+    text = data[pos:pos + size].decode('utf-8', 'surrogatepass')
+    strings = []
+    start = 0
+    for length in lengths:
+        strings.append(text[start:start + length])
+        start += length
+    next_ = iter(__read_array(data, pos + size)[0]).__next__
+    sequence = elements = classes = None
+    if next_():
+        sequence = Sequence()
+        sequence.mods = __decode_value(next_, strings)
+    kind = next_()
+    if kind:
+        elements = SubElements() if kind == 2 else Elements()
+        elements.els = {}
+        __decode_elements(elements.els, (), next_, strings)
+    if next_():
+        classes = Classes()
+        cls = __decode_value(next_, strings)
+        for name in cls:  # индексы восстанавливаются при добавлении
+            classes.add(name, cls[name][1], cls[name][0])
+        classes.names = __decode_value(next_, strings)
+    return sequence, elements, classes
@@ -2,9 +2,10 @@
 import re
 
 __all__ = [
-    'IsDoc', 'get_first_spaces', 'get_classes', 'get_init_elements',
-    'get_elements', 'get_functions', 'get_docs', 'get_comments',
-    'get_module_docs_or_comments', 'get_block', 'get_indent', 'get_index'
+    'IsDoc', 'LineTable', 'get_table', 'get_first_spaces', 'get_classes',
+    'get_init_elements', 'get_elements', 'get_functions', 'get_docs',
+    'get_comments', 'get_module_docs_or_comments', 'get_block', 'get_indent',
+    'get_index'
 ]
 
 
@@ -14,17 +15,29 @@ class IsDoc:
         self.doc = False
         """bool, открыты ли кавычки документации."""
 
-    def is_doc(self, line):
-        """Является ли строка документацией.
+    @staticmethod
+    def count(line):
+        """Подсчитать кавычки документации в начале и в конце строки.
 
         :param line: строка
-        :return: bool, True если истина
+        :return: int, 0 - кавычек нет, 1 - кавычки открываются или
+        закрываются, 2 - однострочная документация
         """
+        line = line.strip()
         count = 0
-        if line.strip()[:3] == '"""':
+        if line[:3] == '"""':
             count += 1
-        if line.strip()[-3:] == '"""':
+        if line[-3:] == '"""':
             count += 1
+        return count
+
+    def switch(self, count):
+        """Является ли строка документацией, по заранее подсчитанным
+        кавычкам (см. count).
+
+        :param count: int, результат count
+        :return: bool, True если истина
+        """
         if count == 1:  # одни кавычки - значит документация многострочна
             self.doc = not self.doc
             return True
@@ -33,6 +46,14 @@ class IsDoc:
             return True
         return self.doc
 
+    def is_doc(self, line):
+        """Является ли строка документацией.
+
+        :param line: строка
+        :return: bool, True если истина
+        """
+        return self.switch(self.count(line))
+
 
 def get_first_spaces(line):
     """Получить кол-во пробелов и табов в начале строки.
@@ -48,54 +69,263 @@ def get_first_spaces(line):
     return result
 
 
-def __for(func, lines, indent=-1):
+def _class_name(line):
+    """Получить имя класса из строки с его определением.
+
+    :param line: строка без отступов
+    :return: str, имя(супер-классы) или None
+    """
+    if line[:6] == 'class ' and ':' in line:
+        return line[6:line.index(':')].strip()
+
+
+def _function_name(line):
+    """Получить имя функции из строки с её определением.
+
+    :param line: строка без отступов
+    :return: str, имя(параметры) или None
+    """
+    if line[:4] == 'def ' and ':' in line:
+        return line[4:line.index(':')].strip()
+
+
+def _element_name(line):
+    """Получить имя переменной из строки с присвоением.
+
+    :param line: строка без отступов
+    :return: str, имя или None
+    """
+    if line[:3] == 'if ' or line[:5] == 'elif ':  # обрезка условий
+        line = __trim_if(line)
+    elif line[:4] == 'def ' or line[:6] == 'while ':
+        return
+    if '=' in line:  # поиск присвоения в строке
+        first = line.split('=')[0].strip()
+        if re.match('^[a-zAа-яЯ0-9-_]*$', first):
+            return first
+
+
+def _init_name(line):
+    """Получить имя элемента класса из строки с присвоением self.
+
+    :param line: строка без отступов
+    :return: str, имя или None
+    """
+    if line[:3] == 'if ' or line[:5] == 'elif ':
+        # если PEP8 не соблюдается
+        line = __trim_if(line)
+    if line[:5] == 'self.' and '=' in line:
+        first = line[5:line.index('=')].strip()
+        if re.match('^[a-zAа-яЯ0-9-_]*$', first):
+            return first
+
+
+def _compose(first, second):
+    """Объединить два перехода состояния IsDoc.
+
+    Переходы: 0 - без изменений, 1 - переключение, 2 - закрытие кавычек,
+    3 - открытие кавычек (для строк совпадают с IsDoc.count).
+
+    :param first: int, переход, выполняемый первым
+    :param second: int, переход, выполняемый вторым
+    :return: int, итоговый переход
+    """
+    if second == 0:
+        return first
+    elif second == 1:
+        return (1, 0, 3, 2)[first]
+    return second
+
+
+def _apply(move, doc):
+    """Применить переход (см. _compose) к состоянию IsDoc.
+
+    :param move: int, переход
+    :param doc: bool, состояние до перехода
+    :return: bool, состояние после перехода
+    """
+    if move == 0:
+        return doc
+    elif move == 1:
+        return not doc
+    return move == 3
+
+
+class LineTable:
+    """Таблица с классификацией строк модуля.
+
+    Каждая строка разбирается один раз (отступ, пустая ли, комментарий,
+    кавычки документации, определение класса, функции или переменной),
+    после чего все утилиты модуля работают только с готовыми значениями.
+    Поддерживает len, итерацию и индексацию, как обычный список строк.
+
+    Срез таблицы - это диапазон (start, end) по тем же колонкам,
+    без копирования строк. Индексы в срезе считаются от его начала.
+    """
+    def __init__(self, lines=()):
+        """
+
+        :param lines: список строк
+        """
+        self.lines = list(lines)
+        """list, исходные строки."""
+        self.strip = []
+        """list, строки без отступов (str.strip)."""
+        self.spaces = []
+        """list, кол-во пробелов и табов в начале строки."""
+        self.blank = []
+        """list, bool, является ли строка пустой."""
+        self.comment = []
+        """list, bool, является ли строка комментарием."""
+        self.quotes = []
+        """list, кавычки документации в строке (см. IsDoc.count)."""
+        self.classes = []
+        """list, имена классов из определений (иначе None)."""
+        self.functions = []
+        """list, имена функций из определений (иначе None)."""
+        self.elements = []
+        """list, имена переменных из присвоений (иначе None)."""
+        self.init = []
+        """list, имена элементов из присвоений self (иначе None)."""
+        for line in self.lines:
+            stripped = line.strip()
+            self.strip.append(stripped)
+            self.spaces.append(get_first_spaces(line))
+            self.blank.append(not stripped)
+            self.comment.append(stripped[:1] == '#')
+            self.quotes.append(IsDoc.count(stripped))
+            self.classes.append(_class_name(stripped))
+            self.functions.append(_function_name(stripped))
+            self.elements.append(_element_name(stripped))
+            self.init.append(_init_name(stripped))
+        self.ends = []
+        """list, индекс конца блока строки - первая следующая не пустая
+        строка с меньшим отступом (для пустых строк -1)."""
+        self.moves = []
+        """list, переход состояния IsDoc (см. _compose) за весь блок
+        строки, от неё до конца блока."""
+        self.start = 0
+        """int, начало среза в колонках."""
+        self.end = len(self.lines)
+        """int, конец среза в колонках."""
+        self.__index()
+
+    def __index(self):
+        """Вычислить концы блоков всех строк за один проход со стеком."""
+        count = len(self.lines)
+        self.ends = [-1] * count
+        self.moves = [0] * count
+        stack = []  # строки, для которых ещё не найден конец блока
+        i = count - 1
+        while i >= 0:  # проход снизу вверх
+            if not self.blank[i]:
+                move = self.quotes[i]
+                while stack and self.spaces[stack[-1]] >= self.spaces[i]:
+                    # вложенные блоки заканчиваются внутри блока строки
+                    nested = stack.pop()
+                    move = _compose(move, self.moves[nested])
+                if stack:
+                    self.ends[i] = stack[-1]
+                else:
+                    self.ends[i] = count
+                self.moves[i] = move
+                stack.append(i)
+            i -= 1
+
+    def view(self, start, end):
+        """Получить срез таблицы без копирования колонок.
+
+        :param start: int, начало среза (индекс в срезе self)
+        :param end: int, конец среза (индекс в срезе self)
+        :return: LineTable
+        """
+        table = LineTable.__new__(LineTable)
+        table.__dict__.update(self.__dict__)
+        table.start = min(self.start + start, self.end)
+        table.end = max(min(self.start + end, self.end), table.start)
+        return table
+
+    __hash__ = None  # как и список строк, таблица не хэшируется
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __iter__(self):
+        return iter(self.lines[self.start:self.end])
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):  # часть таблицы
+            start, end, step = item.indices(len(self))
+            return self.view(start, end)
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError('LineTable index out of range')
+        return self.lines[self.start + item]
+
+
+def get_table(lines):
+    """Получить таблицу с классификацией строк.
+
+    :param lines: список строк или LineTable
+    :return: LineTable (если передана таблица - она же)
+    """
+    if isinstance(lines, LineTable):
+        return lines
+    return LineTable(lines)
+
+
+def __for(names, lines, indent=-1):
     """Цикличная обработка списка строк для большинства алгоритмов.
 
-    :param func: функция, в кторую передаётся строка, возвращает строку
-    или None
-    :param lines: список строк
+    Вложенные блоки пропускаются целиком, по индексу концов блоков.
+
+    :param names: list, колонка имён из LineTable
+    :param lines: LineTable
     :param indent: отступ в начале строки (при -1 не анализируется),
     чтобы обрабатывать только нужные блоки
     :return: list, [(имя, индекс), ...]
     """
     result = []
-    elements = []
-    i = 0
+    elements = set()
     doc = IsDoc()
-    for line in lines:
-        i += 1
-        if (not line or line.isspace()) or doc.is_doc(line) or (
-                    line.strip()[0] == '#'):
+    blank = lines.blank
+    quotes = lines.quotes
+    comment = lines.comment
+    spaces = lines.spaces
+    i = lines.start
+    while i < lines.end:
+        if indent > -1 and not blank[i] and spaces[i] > indent:
+            # пропуск вложенного блока целиком
+            doc.doc = _apply(lines.moves[i], doc.doc)
+            i = lines.ends[i]
+            continue
+        if blank[i] or doc.switch(quotes[i]) or comment[i]:
             # пропуск не нужного
+            i += 1
             continue
-        if indent > -1:  # обработка только заданного блока
-            fs = get_first_spaces(line)
-            if fs < indent:
-                break
-            elif fs != indent:  # пропуск вложенных блоков
-                continue
-        element = func(line)
+        if indent > -1 and spaces[i] < indent:
+            # обработка только заданного блока
+            break
+        element = names[i]
         if element and element not in elements:
             # вернулось значение - добавляем в список
-            result.append((element, i-1))
-            elements.append(element)
+            result.append((element, i - lines.start))
+            elements.add(element)
+        i += 1
     return result
 
 
 def get_classes(lines, start=0):
     """Получить классы.
 
-    :param lines: список строк
+    :param lines: список строк или LineTable
     :param start: отступ в начале строки (при -1 не анализируется),
     чтобы обрабатывать только нужные блоки
     :return: list, [(имя(супер-классы), индекс), (имя, индекс), ...]
     """
-    def func(line):  # поиск в строке определения класса
-        line = line.strip()
-        if line[:6] == 'class ' and ':' in line:
-            return line[6:line.index(':')].strip()
-
-    return __for(func, lines, start)
+    table = get_table(lines)
+    return __for(table.classes, table, start)
 
 
 def __clean(line, ch):
@@ -159,87 +389,67 @@ def __trim_if(line):
 def get_init_elements(init):
     """Получить элементы класса, определённые в __init__.
 
-    :param init: список строк (весь метод __init__)
+    :param init: список строк или LineTable (весь метод __init__)
     :return: list, [(имя, индекс), ...]
     """
-    def func(line):  # поиск присвоения в строке
-        line = line.strip()
-        if line[:3] == 'if ' or line[:5] == 'elif ':
-            # если PEP8 не соблюдается
-            line = __trim_if(line)
-        if line[:5] == 'self.' and '=' in line:
-            first = line[5:line.index('=')].strip()
-            if re.match('^[a-zAа-яЯ0-9-_]*$', first):
-                return first
-
-    return __for(func, init)
+    table = get_table(init)
+    return __for(table.init, table)
 
 
 def get_elements(lines, indent=0):
     """Получить список элементов.
 
-    :param lines: список строк
+    :param lines: список строк или LineTable
     :param indent: отступ в начале строки (при -1 не анализируется),
     чтобы обрабатывать только нужные блоки
     :return: list, [(имя, индекс), ...]
     """
-    def func(line):
-        line = line.strip()
-        if line[:3] == 'if ' or line[:5] == 'elif ':  # обрезка условий
-            line = __trim_if(line)
-        elif line[:4] == 'def ' or line[:6] == 'while ':
-            return
-        if '=' in line:  # поиск присвоения в строке
-            first = line.split('=')[0].strip()
-            if re.match('^[a-zAа-яЯ0-9-_]*$', first):
-                return first
-    return __for(func, lines, indent)
+    table = get_table(lines)
+    return __for(table.elements, table, indent)
 
 
 def get_functions(lines, start=0):
     """Получить список функций.
 
-    :param lines: список строк
+    :param lines: список строк или LineTable
     :param start: отступ в начале строки (при -1 не анализируется),
     чтобы обрабатывать только нужные блоки
     :return: list, [(имя(параметры), индекс), ...]
     """
-    def func(line):  # поиск в строке определения функции
-        line = line.strip()
-        if line[:4] == 'def ' and ':' in line:
-            return line[4:line.index(':')].strip()
-
-    return __for(func, lines, start)
+    table = get_table(lines)
+    return __for(table.functions, table, start)
 
 
 def get_docs(lines, elements, strip=False):
     """Получить документацию по элементам.
 
-    :param lines: список строк
+    :param lines: список строк или LineTable
     :param elements: tuple / list, элементы, (имя, индекс)
     :param strip: bool, True - обрезать отступы
     :return: dict, {имя: [документация...], ...}
     """
+    table = get_table(lines)
+    first_spaces = table.spaces
     result = {}
     for el in elements:
-        i = el[1]+1
+        first = table.start + el[1]+1
+        i = first
         indent = -1
         doc = IsDoc()
         add = []
-        while i < len(lines):
-            no_strip = lines[i]  # для получения отступа
-            line = no_strip.strip()  # для остальных алгоритмов
+        while i < table.end:
+            line = table.strip[i]
             spaces = ''
             if indent != -1:  # если первый отступ уже известен
-                spaces = ' ' * (get_first_spaces(no_strip) - indent)
-            if (not doc.doc and not line) or (line and line[0] == '#'):
+                spaces = ' ' * (first_spaces[i] - indent)
+            if (not doc.doc and not line) or table.comment[i]:
                 # пропуск комментов и пустых строк ДО
                 i += 1
                 continue
-            if doc.is_doc(line):
+            if doc.switch(table.quotes[i]):
                 if indent == -1:  # получение первого отступа в документации
-                    indent = get_first_spaces(no_strip)
-                    spaces = ' ' * (get_first_spaces(no_strip) - indent)
+                    indent = first_spaces[i]
+                    spaces = ' ' * (first_spaces[i] - indent)
                 if not doc.doc:  # это однострочная документация
                     if line == '"""':  # строка состоит из закрывающих кавычек
                         break
@@ -248,7 +458,7 @@ def get_docs(lines, elements, strip=False):
                     add.append(line)
                     break
                 # обработка контента многострочной документации
-                if i == el[1]+1:  # чистка первой строки от кавычек
+                if i == first:  # чистка первой строки от кавычек
                     line = line[line.index('"""')+3:]
                     if not line:
                         continue
@@ -278,10 +488,12 @@ def get_comments(lines, elements):
     """Получить комментарии к элементу. Читает комментарии до, на строке
     и после. Если есть комментарий на строке, то только он + после.
 
-    :param lines: список строк
+    :param lines: список строк или LineTable
     :param elements: список tuple, [(имя, индекс), ...]
     :return: dict, {имя: [комментарии], ...}
     """
+    table = get_table(lines)
+
     def get(pos, rev=False):
         """Получить комментарии до или после.
 
@@ -291,16 +503,16 @@ def get_comments(lines, elements):
         """
         doc = IsDoc()
         com = []
-        while (rev and pos >= 0) or (not rev and pos < len(lines)):
-            line = lines[pos].strip()
-            if not line or doc.is_doc(line):
+        while (rev and pos >= table.start) or (not rev and pos < table.end):
+            line = table.strip[pos]
+            if not line or doc.switch(table.quotes[pos]):
                 # пропуск не нужного
                 if rev:
                     pos -= 1
                 else:
                     pos += 1
                 continue
-            if line[0] == '#':  # строка - комментарий
+            if table.comment[pos]:  # строка - комментарий
                 com.append(line[1:].strip())
             else:  # нет - прерывание цикла
                 break
@@ -327,14 +539,15 @@ def get_comments(lines, elements):
     result = {}
     for el in elements:
         add = []
-        comment = get_one(lines[el[1]])  # однострочный коммент
+        comment = get_one(table[el[1]])  # однострочный коммент
         if comment:
             add.append(comment)
-        comments = get(el[1]+1)  # многострочный коммент ПОСЛЕ
+        pos = table.start + el[1]
+        comments = get(pos+1)  # многострочный коммент ПОСЛЕ
         if comments:
             add += comments
         elif not comment:  # если ПОСЛЕ и однострочного нет
-            comments = get(el[1]-1, True)  # многострочный коммент ДО
+            comments = get(pos-1, True)  # многострочный коммент ДО
             if comments:
                 add += comments
         if add:
@@ -345,20 +558,20 @@ def get_comments(lines, elements):
 def get_module_docs_or_comments(lines, com=False, strip=False):
     """Получить документацию или комментарии модуля.
 
-    :param lines: список строк
+    :param lines: список строк или LineTable
     :param com: bool, True - получить комментарии, False - документацию
     :param strip: bool, True - обрезать отступы
     :return: list
     """
+    table = get_table(lines)
     result = []
     doc = IsDoc()
     indent = -1
-    for line in lines:
-        no_strip = line  # для получения отступа
-        line = line.strip()  # для остальных алгоритмов
+    for i in range(table.start, table.end):
+        line = table.strip[i]
         spaces = ''
         if indent != -1:  # если отступ уже известен
-            spaces = ' ' * (get_first_spaces(no_strip) - indent)
+            spaces = ' ' * (table.spaces[i] - indent)
         if not doc.doc and (not line or (line[:6] == 'import'
                                          or line[:4] == 'from')):
             # пропуск импортов и пустых строк ДО
@@ -369,11 +582,11 @@ def get_module_docs_or_comments(lines, com=False, strip=False):
                 continue
         elif com:  # выход из цикла при завершении комментариев
             break
-        if not com and doc.is_doc(line):  # сохранение документации
+        if not com and doc.switch(table.quotes[i]):  # сохранение документации
             if not strip:
                 if indent == -1:  # получение первого отступа в документации
-                    indent = get_first_spaces(no_strip)
-                    spaces = ' ' * (get_first_spaces(no_strip) - indent)
+                    indent = table.spaces[i]
+                    spaces = ' ' * (table.spaces[i] - indent)
                 line = spaces + line
             result.append(line)
             if not doc.doc:  # документация однострочная - прерывание цикла
@@ -403,44 +616,41 @@ def get_module_docs_or_comments(lines, com=False, strip=False):
 def get_block(lines, index, indent=4):
     """Получить блок кода.
 
-    :param lines: список строк
+    :param lines: список строк или LineTable
     :param index: индекс элемента
     :param indent: отступ в начале строки
-    :return: list, блок кода с данным отступом
+    :return: LineTable, срез с блоком кода с данным отступом
     """
-    i = index+1
-    while i < len(lines):  # анализ с заданной позиции
-        line = lines[i]
-        if not line or line.isspace():  # пропуск пустых строк
-            i += 1
-            continue
-        if get_first_spaces(line) < indent:  # проверка отступа
-            break
+    table = get_table(lines)
+    i = table.start + index+1
+    while i < table.end and table.blank[i]:  # пропуск пустых строк
         i += 1
-    if i == index+1:  # иначе в блоке будет первая строка
-        return []
-    return lines[index+1:i]
+    while i < table.end and table.spaces[i] >= indent:  # проверка отступа
+        # блок строки целиком входит в искомый, переход к его концу
+        i = table.ends[i]
+    return table.view(index+1, i - table.start)
 
 
 def get_indent(lines):
     """Получить кол-во символов отступа в начале строки.
 
-    :param lines: список строк
+    :param lines: список строк или LineTable
     :return: int (-1 если отступ не найден)
     """
+    table = get_table(lines)
     block = False
     doc = IsDoc()
-    for line in lines:
-        if not doc.is_doc(line) and not block and\
+    for i in range(table.start, table.end):
+        line = table.lines[i]
+        if not doc.switch(table.quotes[i]) and not block and\
                 ((line[:6] == 'class ' or line[:4] == 'def ') and ':' in line)\
                 or line[:5] == 'pass ':
             # поиск блока
             block = True
             continue
-        if block and line and not line.isspace() and not (
-                    line.strip()[0] == '#'):
+        if block and not table.blank[i] and not table.comment[i]:
             # определение отступа в блоке
-            return get_first_spaces(line)
+            return table.spaces[i]
     return -1
 
 
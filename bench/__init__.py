@@ -0,0 +1,9 @@
+"""Пакет с замерами производительности.
+
+- project: создание синтетических проектов
+- bench: замеры этапов генерации и сравнение с базовыми результатами
+"""
+__all__ = [
+    'project',
+    'bench'
+]
@@ -0,0 +1,243 @@
+"""Модуль с замерами производительности этапов генерации на
+синтетических проектах.
+
+Запуск из корня npdoc:
+python3 -m bench.bench [-shape medium] [-out results.json]
+[-baseline baseline.json]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import subprocess
+import tempfile
+from argparse import ArgumentParser
+from analyse.analyser import Analyser
+from generate.rst.rst_generator import RSTGenerator
+import bench.project as project
+import core.parser as parser
+import core.reader as reader
+import core.writer as writer
+import lang.lang as locale
+
+__all__ = ['STAGES', 'NPDOC', 'THRESHOLD', 'MIN_DELTA', 'run', 'compare',
+           'main']
+
+STAGES = ('startup', 'read', 'analyse', 'hie', 'render', 'write')
+"""Отдельно замеряемые этапы: запуск (npdoc.py -h в отдельном процессе,
+без запуска интерпретатора - импорт модулей, нужных для справки и
+проверки аргументов), чтение (core.reader), анализ (Analyser.analyse_all),
+иерархии классов (Classes.get_sub_or_sup_hie), генерация
+(RSTGenerator.gen_project), запись (core.writer). Полный запуск
+замеряется как e2e_proc<количество процессов>."""
+NPDOC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))), 'npdoc.py')
+"""Путь к npdoc.py (для замера запуска)."""
+THRESHOLD = 0.1
+"""Допустимое замедление относительно базового результата (доля)."""
+MIN_DELTA = 0.005
+"""Замедление меньше этого (в секундах) не учитывается (погрешность)."""
+
+
+def __measure(func, repeat, prepare=None):
+    """Замерить время выполнения функции.
+
+    :param func: функция, func(результат prepare)
+    :param repeat: int, количество повторов
+    :param prepare: функция подготовки (вызывается перед каждым повтором,
+    не замеряется) или None
+    :return: dict, {'min': float, 'median': float, 'runs': [float, ...]},
+    секунды
+    """
+    runs = []
+    for i in range(repeat):
+        arg = prepare() if prepare else None
+        start = time.perf_counter()
+        func(arg)
+        runs.append(time.perf_counter() - start)
+    return __get_stats(runs)
+
+
+def __get_stats(runs):
+    """Получить статистику замеров.
+
+    :param runs: list, время каждого повтора в секундах
+    :return: dict, см. __measure
+    """
+    ordered = sorted(runs)
+    return {'min': ordered[0], 'median': ordered[len(ordered) // 2],
+            'runs': runs}
+
+
+def __startup():
+    """Запустить npdoc.py -h в отдельном процессе.
+
+    :return: float, время выполнения npdoc.py в секундах (без запуска
+    интерпретатора)
+    """
+    code = ('import sys, time, runpy\n'
+            'sys.argv = [%r, "-h"]\n'
+            'start = time.perf_counter()\n'
+            'try:\n'
+            '    runpy.run_path(sys.argv[0], run_name="__main__")\n'
+            'except SystemExit:\n'
+            '    pass\n'
+            'sys.stderr.write(repr(time.perf_counter() - start))') % NPDOC
+    result = subprocess.run([sys.executable, '-c', code], check=True,
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE,
+                            cwd=os.path.dirname(NPDOC))
+    return float(result.stderr)
+
+
+def __analyse(prop, contents):
+    """Анализ модулей.
+
+    :param prop: dict, словарь с настройками
+    :param contents: dict, {имя модуля: список строк, ...}
+    :return: tuple, (Sequence, SubElements, Classes)
+    """
+    analyser = Analyser(prop)
+    analyser.analyse_all(list(contents.values()), list(contents))
+    return analyser.get_result()
+
+
+def __hie(classes):
+    """Получить иерархии суб-классов и супер-классов всех классов.
+
+    :param classes: Classes
+    """
+    for module in classes.names:
+        for name in classes.names[module]:
+            classes.get_sub_or_sup_hie(name, True, module)
+            classes.get_sub_or_sup_hie(name, False, module)
+
+
+def run(shape, procs=(1, 4), repeat=3, seed=0):
+    """Замерить время этапов на синтетическом проекте.
+
+    :param shape: dict, форма проекта (см. project.SHAPES)
+    :param procs: tuple, количества процессов для полного запуска
+    :param repeat: int, количество повторов каждого замера
+    :param seed: int, начальное значение генератора случайных чисел
+    :return: dict, {'shape': dict, 'python': str, 'results':
+    {этап: {'min': float, 'median': float, 'runs': list}, ...}}
+    """
+    from core.core import Generator
+    lang = locale.get_lang('ru')
+    temp = tempfile.mkdtemp(prefix='npdoc_bench_')
+    try:
+        path = os.path.join(temp, 'project')
+        out = os.path.join(temp, 'docs')
+        os.mkdir(out)
+        modules = project.gen_project(path, shape, seed)
+        prop = parser.get_dict(['-path', path, '-out', out], lang)[0]
+        results = {}
+        __startup()  # кэш локализации и байт-кода
+        # запуск быстрый, разброс больше - больше повторов
+        results['startup'] = __get_stats(
+            [__startup() for i in range(repeat * 5)])
+        results['read'] = __measure(lambda arg: reader.get_names(modules),
+                                    repeat)
+        contents = reader.get_names(modules)
+        results['analyse'] = __measure(lambda arg: __analyse(prop, contents),
+                                       repeat)
+        # иерархии запоминаются контейнером, поэтому анализ на каждый повтор
+        results['hie'] = __measure(
+            __hie, repeat, lambda: __analyse(prop, contents)[2])
+        result = __analyse(prop, contents)
+        results['render'] = __measure(
+            lambda arg: RSTGenerator(*result, prop, lang).gen_project(),
+            repeat)
+        pages = RSTGenerator(*result, prop, lang).gen_project()
+        results['write'] = __measure(
+            lambda arg: writer.write_rst_project(*pages, out), repeat)
+        for proc in procs:  # полный запуск
+            prop = parser.get_dict(['-path', path, '-out', out, '-proc',
+                                    str(proc), '-cleardir'], lang)[0]
+            results['e2e_proc' + str(proc)] = __measure(
+                lambda arg: Generator(prop, lang).start(), repeat)
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+    return {'shape': shape, 'python': platform.python_version(),
+            'results': results}
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """Сравнить результаты с базовыми (по минимальному времени).
+
+    :param current: dict, результаты (см. run)
+    :param baseline: dict, базовые результаты (см. run)
+    :param threshold: float, допустимое замедление (доля)
+    :return: list, [(этап, базовое время, время, отношение, замедление ли),
+    ...], только этапы, которые есть в обоих результатах
+    """
+    result = []
+    for stage, times in current['results'].items():
+        if stage not in baseline['results']:
+            continue
+        base = baseline['results'][stage]['min']
+        ratio = times['min'] / base if base else 1.0
+        slower = ratio > 1 + threshold and\
+            times['min'] - base > MIN_DELTA
+        result.append((stage, base, times['min'], ratio, slower))
+    return result
+
+
+def main(args):
+    """Запуск из командной строки.
+
+    :param args: list, аргументы (без имени программы)
+    :return: int, код возврата (1 - есть замедления)
+    """
+    parser_ = ArgumentParser('python3 -m bench.bench',
+                             description='Замеры производительности npdoc')
+    parser_.add_argument('-shape', default='medium',
+                         choices=sorted(project.SHAPES),
+                         help='форма проекта (по-умолчанию medium)')
+    for key in project.SHAPES['medium']:  # замена параметров формы
+        parser_.add_argument('-' + key, type=type(
+            project.SHAPES['medium'][key]), help='параметр формы ' + key)
+    parser_.add_argument('-proc', nargs='*', type=int, default=[1, 4],
+                         help='количества процессов для полного запуска')
+    parser_.add_argument('-repeat', type=int, default=3,
+                         help='количество повторов замеров')
+    parser_.add_argument('-seed', type=int, default=0,
+                         help='начальное значение случайных чисел')
+    parser_.add_argument('-out', type=str,
+                         help='записать результаты в JSON файл')
+    parser_.add_argument('-baseline', type=str,
+                         help='сравнить с результатами из JSON файла')
+    parser_.add_argument('-threshold', type=float, default=THRESHOLD,
+                         help='допустимое замедление (по-умолчанию 0.1)')
+    opt = vars(parser_.parse_args(args))
+    shape = dict(project.SHAPES[opt['shape']])
+    for key in shape:
+        if opt[key] is not None:
+            shape[key] = opt[key]
+    current = run(shape, opt['proc'], opt['repeat'], opt['seed'])
+    for stage, times in current['results'].items():
+        print('%-12s %.4f' % (stage, times['min']))
+    if opt['out']:
+        with open(opt['out'], 'w') as file:
+            json.dump(current, file, indent=2)
+    if not opt['baseline']:
+        return 0
+    with open(opt['baseline']) as file:
+        baseline = json.load(file)
+    if baseline['shape'] != shape:
+        print('формы проектов различаются, сравнение неточное')
+    code = 0
+    for stage, base, time_, ratio, slower in compare(current, baseline,
+                                                    opt['threshold']):
+        print('%-12s %.4f -> %.4f x%.2f%s' % (stage, base, time_, ratio,
+                                             ' ЗАМЕДЛЕНИЕ' if slower else ''))
+        if slower:
+            code = 1
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,124 @@
+"""Модуль для создания синтетических проектов заданной формы."""
+import os
+import random
+
+__all__ = ['SHAPES', 'gen_module', 'gen_project']
+
+SHAPES = {
+    'small': {'modules': 10, 'lines': 100, 'depth': 1, 'classes': 2,
+              'fanout': 2, 'docs': 0.5},
+    'medium': {'modules': 60, 'lines': 400, 'depth': 2, 'classes': 4,
+               'fanout': 3, 'docs': 0.5},
+    'large': {'modules': 200, 'lines': 1500, 'depth': 3, 'classes': 8,
+              'fanout': 4, 'docs': 0.5},
+    'deep': {'modules': 60, 'lines': 300, 'depth': 6, 'classes': 6,
+             'fanout': 1, 'docs': 0.3},
+    'wide': {'modules': 60, 'lines': 300, 'depth': 1, 'classes': 10,
+             'fanout': 20, 'docs': 0.8},
+}
+"""Формы проектов:
+- modules: количество модулей;
+- lines: примерное количество строк в модуле;
+- depth: глубина вложенности пакетов;
+- classes: количество классов в модуле;
+- fanout: количество суб-классов у каждого класса (ветвление иерархии,
+классы наследуются от классов предыдущих модулей);
+- docs: доля функций и классов с документацией и комментариями (0 - 1).
+"""
+
+
+def __gen_func(name, indent, rnd, docs):
+    """Создать функцию (метод).
+
+    :param name: str, имя функции
+    :param indent: str, отступ
+    :param rnd: random.Random
+    :param docs: float, вероятность документации и комментариев
+    :return: list, строки функции
+    """
+    result = []
+    if rnd.random() < docs:
+        result.append(indent + '# комментарий к ' + name + '\n')
+    args = ', '.join('arg' + str(i) for i in range(rnd.randint(0, 3)))
+    if indent:
+        args = 'self, ' + args if args else 'self'
+    result.append(indent + 'def ' + name + '(' + args + '):\n')
+    body = indent + '    '
+    if rnd.random() < docs:
+        result += [body + '"""Функция ' + name + '.\n', '\n',
+                   body + ':param arg0: аргумент\n',
+                   body + ':return: значение\n', body + '"""\n']
+    for i in range(rnd.randint(1, 6)):
+        result.append(body + 'value' + str(i) + ' = ' + str(i) + '\n')
+    result.append(body + 'return value0\n')
+    result.append('\n')
+    return result
+
+
+def gen_module(index, shape, rnd):
+    """Создать модуль.
+
+    Классы называются C<модуль>_<номер>, суб-классы наследуются от
+    классов предыдущих модулей (по номеру класса в проекте), по fanout
+    суб-классов у каждого.
+
+    :param index: int, номер модуля в проекте
+    :param shape: dict, форма проекта (см. SHAPES)
+    :param rnd: random.Random
+    :return: list, строки модуля
+    """
+    docs = shape['docs']
+    result = ['"""Модуль m' + str(index) + '."""\n', 'import os\n', '\n',
+              'CONST = ' + str(index) + '\n',
+              '"""Константа модуля."""\n', '\n']
+    count = shape['classes']
+    for i in range(count):
+        number = index * count + i  # номер класса в проекте
+        name = 'C' + str(index) + '_' + str(i)
+        parent = 'object'
+        if number and shape['fanout'] > 0:
+            parent = (number - 1) // shape['fanout']
+            parent = 'C%d_%d' % (parent // count, parent % count)
+        result.append('class ' + name + '(' + parent + '):\n')
+        if rnd.random() < docs:
+            result.append('    """Класс ' + name + '."""\n')
+        result.append('    attr = ' + str(i) + '\n')
+        result.append('\n')
+        for j in range(rnd.randint(1, 3)):
+            result += __gen_func('method' + str(j), '    ', rnd, docs)
+    i = 0
+    while len(result) < shape['lines']:  # функции до нужного размера
+        result += __gen_func('func' + str(i), '', rnd, docs)
+        i += 1
+    return result
+
+
+def gen_project(path, shape, seed=0):
+    """Создать проект.
+
+    Модули распределяются по пакетам вложенностью depth (в каждом пакете
+    модули и один подпакет), имена модулей уникальны в проекте.
+
+    :param path: str, путь к директории проекта (создаётся)
+    :param shape: dict, форма проекта (см. SHAPES)
+    :param seed: int, начальное значение генератора случайных чисел
+    :return: dict, {имя модуля: путь, ...}, в порядке создания
+    """
+    rnd = random.Random(seed)
+    result = {}
+    levels = max(shape['depth'], 1)
+    per_level = -(-shape['modules'] // levels)  # с округлением вверх
+    dir_ = path
+    for index in range(shape['modules']):
+        if index and index % per_level == 0:  # следующий уровень
+            dir_ = os.path.join(dir_, 'p' + str(index // per_level))
+        os.makedirs(dir_, exist_ok=True)
+        init = os.path.join(dir_, '__init__.py')
+        if not os.path.isfile(init):
+            with open(init, 'w') as file:
+                file.write('"""Пакет."""\n')
+        name = 'm' + str(index)
+        result[name] = os.path.join(dir_, name + '.py')
+        with open(result[name], 'w') as file:
+            file.writelines(gen_module(index, shape, rnd))
+    return result
@@ -2,8 +2,15 @@
 
 __all__ = [
     'core',
+    'api',
+    'cache',
+    'index',
+    'pipeline',
+    'profiler',
     'parser',
     'reader',
+    'search',
     'writer',
+    'watcher',
     'enums'
 ]
@@ -0,0 +1,153 @@
+"""Модуль с программным интерфейсом: создание документации в памяти,
+без разбора аргументов командной строки и записи на диск."""
+import os
+from core.core import Generator
+from core.enums import *
+from generate.html.html_generator import HTMLGenerator
+from generate.rst.rst_generator import RSTGenerator
+import core.parser as parser
+import core.reader as reader
+
+__all__ = ['Documenter', 'document']
+
+
+class Documenter:
+    """Создание документации в памяти.
+
+    Настройки и локализация разбираются один раз, анализатор
+    используется повторно во всех вызовах, поэтому для обработки многих
+    небольших модулей выгоднее создать один Documenter.
+    """
+    def __init__(self, **options):
+        """
+
+        :param options: опции, как в командной строке, без дефиса
+        (например, engine='ast', private=True); lang - имя локализации,
+        cache - путь к директории кэша анализа
+        :raise TypeError: неизвестная опция
+        :raise ValueError: cache без пути и без out
+        """
+        self.lang = parser.get_lang(['-lang', options['lang']]
+                                    if options.get('lang') else [])
+        """Словарь с локализацией."""
+        self.prop = parser.get_dict([], self.lang)[0]
+        """Словарь с настройками."""
+        for key in options:
+            if key not in self.prop:
+                raise TypeError('unknown option: ' + key)
+        self.prop.update(options)
+        self.__generator = Generator(self.prop, self.lang)
+        """Generator, анализирующий модули (без запуска start)."""
+        if self.prop['cache'] is not None:  # как в Generator.start
+            if not self.prop['cache'] and not self.prop['out']:
+                raise ValueError('cache requires a path or out')
+            self.__generator.set_cache(self.prop['cache'])
+
+    @staticmethod
+    def _get_sources(sources):
+        """Привести исходный код модулей к спискам строк.
+
+        :param sources: dict, {имя модуля: str или список строк, ...}
+        :return: tuple, (list, list), (списки строк, имена модулей)
+        """
+        modules = []
+        for name in sources:
+            source = sources[name]
+            if isinstance(source, str):
+                source = source.splitlines(True)
+            modules.append(source)
+        return modules, list(sources)
+
+    def analyse(self, sources):
+        """Анализ модулей.
+
+        :param sources: dict, {имя модуля: исходный код, ...}, код - str
+        или список строк
+        :return: tuple, (Sequence, SubElements, Classes)
+        """
+        return self.__generator.analyse(*self._get_sources(sources))
+
+    def render(self, sources, root=''):
+        """Создание документации модулей.
+
+        :param sources: dict, {имя модуля: исходный код, ...}, код - str
+        или список строк
+        :param root: str, путь от страниц к корню документации (для html
+        ссылок на главную страницу и стили)
+        :return: генератор tuple, (str, генератор строк), (имя модуля,
+        документация модуля), см. RSTGenerator.iter_project и
+        HTMLGenerator.iter_project
+        """
+        doc = self.__generator.get_doc(*self._get_sources(sources),
+                                       root=root)
+        if doc:
+            yield from doc[1]
+
+    def render_path(self, path):
+        """Создание документации проекта (или модуля) с диска.
+
+        Модули каждого пакета анализируются вместе, как при запуске из
+        командной строки с одним процессом.
+
+        :param path: str, путь к Python проекту либо модулю
+        :return: генератор tuple, (str, генератор строк), (путь страницы
+        относительно корня документации без расширения, содержимое);
+        для проекта первой идёт страница index (файл стилей html -
+        HTMLGenerator.gen_style)
+        """
+        if os.path.isfile(path):
+            name = os.path.basename(path)
+            yield from self.render({name[:name.index('.')]:
+                                    reader.get_file(path)})
+            return
+        tree = reader.walk(path, self.prop['include'], self.prop['exclude'])
+        if self.prop['gen'] == 'rst':  # rst проект
+            m_names, modules, p_names, packages = tree[path]
+            index = m_names + [pack + '/*' for pack in p_names]
+            yield 'index', iter(RSTGenerator(
+                None, None, None, self.prop, self.lang).gen_index(
+                names=index))
+        elif self.prop['gen'] == 'html':  # html проект
+            pages = []
+            for dir_ in tree:
+                rel = os.path.relpath(dir_, path)
+                pages += [os.path.normpath(os.path.join(rel, name)).replace(
+                    os.sep, '/') for name in tree[dir_][0]]
+            yield 'index', iter(HTMLGenerator(
+                None, None, None, self.prop, self.lang).gen_index(pages))
+        for dir_ in tree:
+            m_names, modules, p_names, packages = tree[dir_]
+            rel = os.path.relpath(dir_, path)
+            root = os.path.relpath(path, dir_)
+            root = '' if root == '.' else root.replace(os.sep, '/') + '/'
+            sources = {name: reader.get_file(modules[name])
+                       for name in m_names}
+            for name, lines in self.render(sources, root):
+                yield os.path.normpath(os.path.join(rel, name)), lines
+
+
+def document(path=None, sources=None, model=False, **options):
+    """Создать документацию в памяти.
+
+    :param path: str, путь к Python проекту либо модулю (см.
+    Documenter.render_path)
+    :param sources: dict, {имя модуля: исходный код, ...} (вместо path),
+    код - str или список строк
+    :param model: bool, True - вернуть результат анализа, а не
+    документацию (только с sources)
+    :param options: опции, как в командной строке, без дефиса
+    :return: генератор страниц (см. Documenter.render и render_path) или
+    tuple, (Sequence, SubElements, Classes)
+    :raise ValueError: нет ни path, ни sources, или model с path
+    """
+    if sources is None:
+        if path is None:
+            raise ValueError('path or sources is required')
+        if model:
+            raise ValueError('model requires sources, not path')
+    documenter = Documenter(**options)
+    if sources is not None:
+        if model:
+            return documenter.analyse(sources)
+        return documenter.render(sources)
+    return documenter.render_path(path)
@@ -0,0 +1,118 @@
+"""Модуль с кэшем результатов анализа модулей на диске."""
+import os
+import struct
+import hashlib
+import analyse.data as data
+
+__all__ = ['Cache', 'OPTIONS', 'VERSION', 'DIR']
+
+OPTIONS = ('first', 'depth', 'depth_vars', 'depth_func', 'hide', 'private',
+           'magic', 'strip', 'engine')
+"""Опции, от которых зависит результат анализа (входят в ключ)."""
+VERSION = 5
+"""Версия формата кэша (входит в ключ)."""
+DIR = '.npdoc_cache'
+"""Имя директории кэша в директории с документацией (по-умолчанию)."""
+
+
+class Cache:
+    """Кэш результатов анализа модулей.
+
+    Каждый модуль хранится отдельным файлом, ключ - хэш содержимого
+    модуля, его имени и опций анализа, результат хранится в компактном
+    двоичном виде (см. analyse.data.encode). Размер ограничивается удалением
+    давно не использованных файлов (trim). Без пути кэш хранится в
+    памяти процесса (для опции -watch), без ограничения размера.
+    """
+    def __init__(self, path, prop, size=100):
+        """
+
+        :param path: str, путь к директории кэша (None - в памяти)
+        :param prop: dict, словарь с настройками
+        :param size: int, максимальный размер кэша в мегабайтах
+        """
+        self.path = path
+        """Путь к директории кэша."""
+        self.size = size * 1024 * 1024
+        """Максимальный размер кэша в байтах."""
+        self.__opt = repr((VERSION,) + tuple(prop.get(o) for o in OPTIONS))
+        """Строка с опциями анализа для ключа."""
+        self.__memory = {}
+        """Кэш в памяти (без пути), {ключ: результат в двоичном виде}."""
+        if path is not None and not os.path.isdir(path):
+            os.makedirs(path, exist_ok=True)
+
+    def get_key(self, module, name):
+        """Получить ключ модуля.
+
+        :param module: список строк
+        :param name: имя модуля
+        :return: str
+        """
+        key = hashlib.sha256(self.__opt.encode())
+        key.update(name.encode())
+        key.update(b'\0')
+        for line in module:
+            key.update(line.encode('utf-8', 'surrogatepass'))
+        return key.hexdigest()
+
+    def get(self, key):
+        """Получить результат анализа модуля.
+
+        :param key: str, ключ (см. get_key)
+        :return: tuple, (Sequence, SubElements, Classes) или None
+        """
+        if self.path is None:  # копия, результат изменяется при слиянии
+            value = self.__memory.get(key)
+            return None if value is None else data.decode(value)
+        path = os.path.join(self.path, key)
+        try:
+            with open(path, 'rb') as file:
+                result = data.decode(file.read())
+            os.utime(path)  # отметка об использовании для trim
+        except (OSError, ValueError, struct.error, StopIteration,
+                IndexError, TypeError):
+            return None
+        return result
+
+    def set(self, key, result):
+        """Сохранить результат анализа модуля.
+
+        :param key: str, ключ (см. get_key)
+        :param result: tuple, (Sequence, SubElements, Classes)
+        """
+        if self.path is None:
+            self.__memory[key] = data.encode(result)
+            return
+        path = os.path.join(self.path, key)
+        tmp = path + '.' + str(os.getpid())  # запись без гонки процессов
+        try:
+            with open(tmp, 'wb') as file:
+                file.write(data.encode(result))
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.isfile(tmp):
+                os.remove(tmp)
+
+    def trim(self):
+        """Удалить давно не использованные модули, чтобы размер кэша
+        не превышал заданный."""
+        if self.path is None:
+            return
+        entries = []
+        total = 0
+        with os.scandir(self.path) as files:
+            for entry in files:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        entries.sort()
+        for mtime, size, path in entries:  # от давно использованных
+            if total <= self.size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
@@ -1,9 +1,18 @@
 """Модуль с главной логикой для генерации документации."""
 import os
+import threading
 from multiprocessing import Pool
 from analyse.analyser import Analyser
+from analyse.ast_analyser import ASTAnalyser
+from analyse.data import *
+from generate.html.html_generator import *
 from generate.rst.rst_generator import *
+import core.cache as cache
+import core.index as index
+import core.pipeline as pipeline
+import core.profiler as profiler
 import core.reader as reader
+import core.search as search
 import core.writer as writer
 from core.enums import *
 
@@ -12,6 +21,9 @@ __all__ = ['Generator']
 
 class Generator:
     """Генератор документации, согласно заданным параметрам."""
+    __worker = None
+    """Generator процесса пула (см. _init_worker)."""
+
     def __init__(self, prop, lang):
         """
 
@@ -20,121 +32,668 @@ class Generator:
         """
         self.__prop = prop
         self.__lang = lang
+        self.__cache = None
+        """Путь к директории кэша анализа (None - без кэша)."""
+        self.__changed = []
+        """Пути к изменённым (записанным или удалённым) файлам."""
+        self.__profiler = None
+        """Profiler с замерами последнего запуска (None - без замеров)."""
+        self.__report = None
+        """Путь к файлу отчёта с замерами."""
+        self.__analyser = None
+        """Анализатор, используемый повторно (см. _get_analyser)."""
+        self.__lock = threading.Lock()
+        """Блокировка замеров времени (запись из нескольких потоков)."""
+        self.__pool = None
+        """Пул процессов (между запусками сохраняется с опцией watch)."""
+        self.__memory = None
+        """Кэш анализа в памяти процесса (с опцией watch)."""
+        self.__results = {}
+        """Результаты анализа модулей для общей модели пакета (сохраняются
+        между запусками с опцией watch), {путь: (bytes, Classes), ...},
+        см. _proc_analyse."""
+        self.__index = None
+        """index.Index, заполняемый при запуске (опция index)."""
+        self.__update = False
+        """Записывать только изменившиеся файлы (опция update или
+        обновление с опцией watch), передаётся процессам с задачами."""
+        self.__entries = {}
+        """Записи поискового индекса (опция search, сохраняются между
+        запусками с опцией watch), {путь к модулю: (страница, записи)},
+        см. _get_entries."""
+
+    @staticmethod
+    def _init_worker(prop, lang, cache_, report):
+        """Инициализация процесса пула: настройки и локализация
+        передаются один раз на процесс, а не с каждой задачей.
+
+        :param prop: словарь с настройками
+        :param lang: словарь с локализацией
+        :param cache_: str, путь к директории кэша анализа (или None)
+        :param report: str, путь к файлу отчёта с замерами (или None)
+        """
+        worker = Generator(prop, lang)
+        worker.__cache = cache_
+        worker.__report = report
+        Generator.__worker = worker
+
+    @staticmethod
+    def _work(opt):
+        """Выполнить задачу в процессе пула (см. _init_worker и _proc).
+
+        :param opt: tuple, прочитанная задача (см. _read)
+        :return: tuple, результат _proc
+        """
+        return Generator.__worker._proc(opt)
+
+    @staticmethod
+    def _work_analyse(opt):
+        """Выполнить анализ в процессе пула (см. _proc_analyse).
+
+        :param opt: tuple, прочитанная задача (см. _read)
+        :return: tuple, результат _proc_analyse
+        """
+        return Generator.__worker._proc_analyse(opt)
+
+    @staticmethod
+    def _work_render(opt):
+        """Выполнить генерацию в процессе пула (см. _proc_render).
+
+        :param opt: tuple, задача (см. _proc_render)
+        :return: tuple, результат _proc_render
+        """
+        return Generator.__worker._proc_render(opt)
+
+    def _get_analyser(self):
+        """Получить анализатор, согласно опции engine. Анализатор
+        создаётся один раз, затем очищается и используется повторно.
 
-    def _get_doc(self, modules, names):
+        :return: Analyser или ASTAnalyser
+        """
+        if self.__analyser is not None:
+            self.__analyser.clear()
+        elif self.__prop['engine'] == 'ast':  # по синтаксическому дереву
+            self.__analyser = ASTAnalyser(self.__prop)
+        else:  # текстовый анализ
+            self.__analyser = Analyser(self.__prop)
+        return self.__analyser
+
+    def _get_cache(self):
+        """Получить кэш анализа: на диске (опция cache), в памяти (опция
+        watch, результаты сохраняются между запусками) или None.
+
+        :return: cache.Cache или None
+        """
+        if self.__cache:
+            return cache.Cache(self.__cache, self.__prop,
+                               self.__prop['cache_size'])
+        if self.__prop['watch']:
+            if self.__memory is None:
+                self.__memory = cache.Cache(None, self.__prop)
+            return self.__memory
+        return None
+
+    def set_cache(self, path):
+        """Задать директорию кэша анализа на диске (используется также в
+        core.api, где start не вызывается).
+
+        :param path: str, путь к директории кэша ('' - cache.DIR в
+        директории с документацией) или None - без кэша
+        """
+        if path is not None:
+            path = path or os.path.join(self.__prop['out'], cache.DIR)
+        self.__cache = path
+
+    def _analyse_module(self, module, name, cache_=None):
+        """Анализ модуля отдельно от других, с использованием кэша.
+
+        :param module: list, строки модуля
+        :param name: str, имя модуля
+        :param cache_: cache.Cache или None (без кэша)
+        :return: tuple, (Sequence, SubElements, Classes)
+        """
+        if cache_ is not None:
+            key = cache_.get_key(module, name)
+            result = cache_.get(key)
+            if result is not None:
+                return result
+        analyser = self._get_analyser()
+        analyser.analyse(module, name)
+        result = analyser.get_result()
+        if cache_ is not None:  # модуля не было в кэше
+            cache_.set(key, result)
+        return result
+
+    def analyse(self, modules, names, timer=None):
+        """Анализ модулей, с использованием кэша (если он включён), без
+        записи (используется также в core.api).
+
+        :param modules: list, список списков со списками строк модулей,
+        [[], ...]
+        :param names: list, имена модулей, должны совпадать по индексам с
+        modules
+        :param timer: Profiler для замера времени (None - без замера)
+        :return: tuple, (Sequence, SubElements, Classes)
         """
+        cache_ = self._get_cache()
+        if cache_ is None:  # анализ всех модулей сразу
+            analyser = self._get_analyser()
+            if timer is None:
+                analyser.analyse_all(modules, names)
+            else:  # по модулю, для замера времени каждого
+                i = 0
+                for module in modules:
+                    with timer.measure('analyse', names[i]):
+                        analyser.analyse(module, names[i])
+                    i += 1
+            return analyser.get_result()
+        sequence = Sequence()
+        elements = SubElements()
+        classes = Classes()
+        i = 0
+        for module in modules:  # каждый модуль отдельно, для кэширования
+            with profiler.measure(timer, 'analyse', names[i]):
+                result = self._analyse_module(module, names[i], cache_)
+            sequence.merge(result[0])
+            elements.merge(result[1])
+            classes.merge(result[2])
+            i += 1
+        return sequence, elements, classes
+
+    def get_doc(self, modules, names, timer=None, root=''):
+        """Создание документации модулей, без записи (используется также
+        в core.api).
 
         :param modules: list, список списков со списками строк модулей,
         [[], ...]
         :param names: list, имена модулей, должны совпадать по индексам с
         modules
+        :param timer: Profiler для замера времени (None - без замера)
+        :param root: str, путь от страниц к корню документации (html)
         :return: tuple, (DocType тип, проект);
-        - rst: tuple, (list, dict, list),
-        (список модулей, словарь с документацией модулей, документация пакета).
-        Ключи для словаря - имена модулей, содержимое - list.
+        - rst: генератор tuple, (str, генератор строк),
+        (имя модуля, документация модуля), см. RSTGenerator.iter_project;
+        - html: то же, см. HTMLGenerator.iter_project
+        """
+        return self._gen_doc(self.analyse(modules, names, timer), root)
+
+    def _gen_doc(self, model, root='', modules=None):
+        """Создание документации по результату анализа.
+
+        :param model: tuple, (Sequence, SubElements, Classes)
+        :param root: str, путь от страниц к корню документации (html)
+        :param modules: имена модулей, документацию которых нужно создать
+        (None - все модули)
+        :return: см. get_doc
         """
-        analyser = Analyser(self.__prop)
-        analyser.analyse_all(modules, names)
-        sequence, elements, classes = analyser.get_result()
         if self.__prop['gen'] == 'rst':  # rst проект
-            rst = RSTGenerator(sequence, elements, classes, self.__prop,
-                               self.__lang)
-            return DocType.rst, rst.gen_project()
+            rst = RSTGenerator(*model, self.__prop, self.__lang)
+            return DocType.rst, rst.iter_project(modules)
+        if self.__prop['gen'] == 'html':  # html проект
+            html = HTMLGenerator(*model, self.__prop, self.__lang, root)
+            return DocType.html, html.iter_project(modules)
+
+    def _get_root(self, out):
+        """Получить путь от директории страниц к корню документации.
+
+        :param out: str, путь к директории записи документации модулей
+        :return: str, с / в конце ('' - корень)
+        """
+        root = os.path.relpath(self.__prop['out'], out)
+        if root == '.':
+            return ''
+        return root.replace(os.sep, '/') + '/'
+
+    def _get_ext(self):
+        """Получить расширение файлов документации.
+
+        :return: str
+        """
+        return '.' + self.__prop['gen']
+
+    @staticmethod
+    def _get_size(modules, names):
+        """Получить суммарный размер файлов модулей.
+
+        :param modules: dict, словарь с путями к модулям
+        :param names: list, имена модулей
+        :return: int, размер в байтах
+        """
+        result = 0
+        for name in names:
+            try:
+                result += os.path.getsize(modules[name])
+            except OSError:
+                continue
+        return result
+
+    def _get_split(self, names, modules, out):
+        """Создать список задач для процессов.
 
-    def _get_split(self, names, modules, path, out):
-        """Создать список с группами модулей, для разделения по процессам.
+        Модули сортируются по размеру файла (от больших к меньшим), чтобы
+        большие модули начинали обрабатываться первыми и не задерживали
+        завершение. Без заданного шага - одна задача на модуль, иначе -
+        группы по step модулей.
 
         :param names: list, имена модулей
         :param modules: dict, словарь с путями к модулям
-        :param path: str, путь к Python проекту
         :param out: str, путь для записи документации
-        :return: list, [([list, ...], [dict, ...], str, str), ...],
+        :return: list, [(dict, str), ...],
         [
             (
-                [имя, ...],
-                {имя: путь, ...},
-                path, out
+                {имя: путь, ...},  (в порядке обработки)
+                out
             )
         ]
         """
         if self.__prop['proc'] == 1:  # 1 процесс
             if self.__prop['step'] == -1:  # шаг не задан
-                return [(names, modules, path, out)]
-        split_names = []  # разделённые имена
-        if self.__prop['step'] == -1:  # равномерное разделение на процессы
-            part = round(len(names) / self.__prop['proc'])
-            end = self.__prop['proc']
-        else:
+                return [({name: modules[name] for name in names}, out)]
+        ordered = sorted(names, key=lambda name: self._get_size(modules,
+                                                                 (name,)),
+                         reverse=True)  # от больших
+        if self.__prop['step'] > 0:
             part = self.__prop['step']
-            end = part
-        i = 1
-        while i <= end:  # разделение имён
-            m = i * part
-            split_names.append(names[m:m+part+1])
-            i += 1
-        split_modules = []  # разделённый словарь с путями
-        for block in split_names:  # используется словарь с именами
-            # чтобы содержимое групп совпадало
+        else:
+            part = 1
+        result = []  # список со сгруппированным результатом
+        i = 0
+        while i < len(ordered):  # разделение имён
             add = {}
-            for name in block:
+            for name in ordered[i:i+part]:
                 add[name] = modules[name]
-            split_modules.append(add)
-        result = []  # список со сгруппированным результатом
+            result.append((add, out))
+            i += part
+        return result
+
+    def _read(self, task):
+        """Прочитать модули задачи (выполняется в потоках чтения).
+
+        :param task: tuple, задача (см. _get_split)
+        :return: tuple, (dict, list, str, bool), (modules, содержимое
+        модулей, out, update), данные для _proc
+        """
+        modules, out = task
+        timer = None
+        if self.__profiler is not None:  # замер времени
+            timer = profiler.Profiler()
+        contents = []
+        for name in modules:  # чтение в последовательности имён
+            with profiler.measure(timer, 'read', modules[name]):
+                contents.append(reader.get_file(modules[name]))
+        if timer:
+            with self.__lock:
+                self.__profiler.merge(timer)
+        return modules, contents, out, self.__update
+
+    def _proc(self, opt):
+        """Метод для запуска в процессе. Анализ модулей, создание и
+        запись документации.
+
+        :param opt: tuple, (dict, list, str, bool), (modules, contents,
+        out, update),
+        - modules: dict, словарь с путями к модулям (в порядке обработки);
+        - contents: list, содержимое модулей (списки строк), по порядку
+        modules;
+        - out: str, путь к директории записи документации;
+        - update: bool, True - записывать только изменившиеся файлы.
+        :return: tuple, (str, list, Profiler, tuple, dict), (out, [(путь,
+        записан ли файл), ...], замеры времени или None, (modules,
+        результат анализа в двоичном виде) для индекса (опция index) или
+        None, записи поискового индекса (см. _get_entries) или None)
+        """
+        modules, contents, out, update = opt
+        timer = self._start_timer()
+        model = self.analyse(contents, list(modules), timer)
+        files = self._write_pages(self._gen_doc(model, self._get_root(out)),
+                                  out, update, timer)
+        entries = self._get_entries(modules, model, out, timer)
+        self._stop_timer(timer, modules)
+        if self.__prop['index'] is None:
+            return out, files, timer, None, entries
+        return out, files, timer, (modules, encode(model)), entries
+
+    def _proc_analyse(self, opt):
+        """Метод для запуска в процессе. Анализ каждого модуля отдельно,
+        для общей модели пакета (см. start).
+
+        Sequence и SubElements передаются в компактном двоичном виде
+        (см. analyse.data.encode), родительскому процессу нужны только
+        классы.
+
+        :param opt: tuple, (dict, list, str, bool), (modules, contents,
+        out, update), см. _proc
+        :return: tuple, (dict, list, Profiler), (modules, [(bytes,
+        Classes), ...] по порядку modules, замеры времени или None)
+        """
+        modules, contents, out, update = opt
+        timer = self._start_timer()
+        cache_ = self._get_cache()
+        results = []
         i = 0
-        while i < len(split_names):
-            result.append((split_names[i], split_modules[i], path, out))
+        for name in modules:
+            with profiler.measure(timer, 'analyse', name):
+                result = self._analyse_module(contents[i], name, cache_)
+                results.append((encode((result[0], result[1], None)),
+                                result[2]))
             i += 1
+        self._stop_timer(timer, modules)
+        return modules, results, timer
+
+    def _proc_render(self, opt):
+        """Метод для запуска в процессе. Создание и запись документации
+        модулей по общей модели пакета.
+
+        Передаются только результаты анализа модулей задачи и классы
+        всего пакета (для иерархий), а не вся модель пакета.
+
+        :param opt: tuple, (Classes, list, dict, str, bool), (classes,
+        results, modules, out, update),
+        - classes: Classes, классы всех модулей пакета;
+        - results: list, [bytes, ...], Sequence и SubElements модулей
+        задачи в двоичном виде (см. _proc_analyse), по порядку modules;
+        - modules: dict, словарь с путями к модулям задачи;
+        - out: str, путь к директории записи документации;
+        - update: bool, True - записывать только изменившиеся файлы.
+        :return: tuple, результат _proc (без данных для индекса, они
+        есть у родительского процесса)
+        """
+        classes, results, modules, out, update = opt
+        timer = self._start_timer()
+        sequence = Sequence()
+        elements = SubElements()
+        for result in results:
+            result = decode(result)
+            sequence.merge(result[0])
+            elements.merge(result[1])
+        files = self._write_pages(
+            self._gen_doc((sequence, elements, classes), self._get_root(out),
+                          list(modules)), out, update, timer)
+        entries = self._get_entries(modules, (sequence, elements, classes),
+                                    out, timer)
+        self._stop_timer(timer, modules)
+        return out, files, timer, None, entries
+
+    def _write_pages(self, doc, out, update, timer=None):
+        """Запись страниц по одной, по мере создания (в процессе, чтобы
+        страницы не передавались родительскому процессу и в памяти была
+        только одна страница).
+
+        :param doc: tuple, документация (см. _gen_doc) или None
+        :param out: str, путь к директории записи документации
+        :param update: bool, True - записывать только изменившиеся файлы
+        :param timer: Profiler для замера времени (None - без замера)
+        :return: list, [(путь, записан ли файл), ...]
+        """
+        files = []
+        if not doc:
+            return files
+        for module, lines in doc[1]:
+            with profiler.measure(timer, 'render', module):
+                lines = list(lines)
+            with profiler.measure(timer, 'write', module):
+                files += writer.write_rst_pages(((module, lines),), out,
+                                                update, self._get_ext())
+        return files
+
+    def _get_page(self, out, name):
+        """Получить страницу модуля относительно директории с
+        документацией.
+
+        :param out: str, путь к директории записи документации модуля
+        :param name: str, имя модуля
+        :return: str, путь без расширения, через /
+        """
+        page = os.path.relpath(os.path.join(out, name), self.__prop['out'])
+        return page.replace(os.sep, '/')
+
+    def _add_index(self, modules, model, out):
+        """Добавить модули в индекс (опция index).
+
+        :param modules: dict, словарь с путями к модулям
+        :param model: tuple, (Sequence, SubElements, Classes), результат
+        анализа модулей
+        :param out: str, путь к директории записи документации модулей
+        """
+        for name in modules:
+            page = self._get_page(out, name)
+            self.__index.add(page.replace('/', '.'), modules[name],
+                             page + self._get_ext(), model, name)
+
+    def _get_entries(self, modules, model, out, timer=None):
+        """Получить записи поискового индекса модулей (опция search).
+
+        :param modules: dict, словарь с путями к модулям
+        :param model: tuple, (Sequence, SubElements, Classes), результат
+        анализа модулей
+        :param out: str, путь к директории записи документации модулей
+        :param timer: Profiler для замера времени (None - без замера)
+        :return: dict, {путь к модулю: (страница, записи)}, записи - см.
+        search.get_entries, или None без опции search
+        """
+        if self.__prop['search'] is None:
+            return None
+        result = {}
+        for name in modules:
+            with profiler.measure(timer, 'index', name):
+                result[modules[name]] = (self._get_page(out, name),
+                                         search.get_entries(model, name))
         return result
 
-    def _proc(self, opt):
-        """Метод для запуска в процессе. Создание и запись документации.
-
-        :param opt: tuple, (list, dict, str, str), (names, modules, path, out),
-        - names: list, имена модулей;
-        - modules: dict, словарь с путями к модулям;
-        - out: str, путь к директории записи документации.
-        """
-        names, modules, path, out = opt
-        cont = reader.get_names(modules)
-        cont_list = []
-        for name in names:  # выравнивание последовательности
-            cont_list.append(cont[name])
-        doc = self._get_doc(cont_list, names)
-        if doc:
-            doc_type = doc[0]
-            project = doc[1]
-        else:
-            return
-        # запись
-        if doc_type == DocType.rst:  # rst проект
-            writer.write_rst_project(project[0], project[1], None, out)
+    def _start_timer(self):
+        """Начать замеры задачи в процессе (если они включены).
+
+        :return: Profiler или None
+        """
+        if self.__prop['profile'] is None:
+            return None
+        if self.__prop['profile_dump']:
+            profiler.start_dump()
+        return profiler.Profiler()
+
+    def _stop_timer(self, timer, modules):
+        """Завершить замеры задачи в процессе.
+
+        :param timer: Profiler или None
+        :param modules: dict, словарь с путями к модулям задачи
+        """
+        if timer:
+            timer.rename(modules)  # имена модулей не уникальны, нужны пути
+            if self.__prop['profile_dump']:
+                profiler.stop_dump(os.path.dirname(self.__report))
+
+    def get_changed(self):
+        """Получить изменённые при последнем запуске файлы.
 
-    def start(self):
+        :return: list, пути к записанным файлам
+        """
+        return self.__changed
+
+    def get_profile(self):
+        """Получить замеры времени последнего запуска (опция profile).
+
+        :return: tuple, (Profiler, str), (замеры, путь к отчёту) или None
+        """
+        if self.__profiler is None:
+            return None
+        return self.__profiler, self.__report
+
+    def close(self):
+        """Завершить процессы пула (если он сохранён, опция watch)."""
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool.join()
+            self.__pool = None
+
+    def start(self, changed=None):
         """Создание и запись документации.
 
+        С одним процессом без step модули каждого пакета анализируются
+        вместе в одной задаче. С несколькими процессами или заданным step
+        модули анализируются в процессах по отдельности, результаты
+        объединяются в общую модель пакета (иерархии классов по всем
+        модулям пакета, как в одной задаче), по которой страницы создаются
+        в процессах, по step модулей в задаче (без step - поровну на
+        процессы). Поэтому proc и step не влияют на результат.
+
+        При заданных changed обрабатываются только изменённые модули и
+        зависящие от них страницы (все страницы пакетов, в которых модули
+        изменены, добавлены или удалены), записываются только изменившиеся
+        файлы (как с опцией update), а страницы удалённых модулей
+        удаляются.
+
+        Список созданных файлов записывается в манифест (writer.MANIFEST),
+        с опцией update удаляются только страницы из манифеста прошлого
+        запуска, которых нет в новом, файлы, добавленные вручную,
+        остаются.
+
+        :param changed: set, пути к изменённым, добавленным и удалённым
+        модулям (None - все модули)
         :return: True в случае успеха
         """
-        def gen(names, modules, path, out):
-            """Запуск создания и записи документации в процессах.
+        def run(tasks, read, work, write_):
+            """Выполнить задачи конвейером: чтение в потоках, обработка
+            и запись страниц в процессах, сохранение результатов в потоке
+            (см. pipeline.run).
 
-            :param names: list, имена модулей
-            :param modules: dict, словарь с путями к модулям
-            :param path: str, путь к Python проекту
-            :param out: str, путь к директории записи документации
+            :param tasks: list, задачи
+            :param read: функция чтения задачи (см. _read)
+            :param work: функция процесса (см. _work)
+            :param write_: функция записи результата
+            """
+            if not tasks:  # нечего обновлять
+                return
+            size = self.__prop['queue']
+            if size < 1:  # по количеству процессов и потоков, с запасом
+                size = (self.__prop['proc'] + self.__prop['threads']) * 2
+            if self.__pool is None:  # запуск процессов
+                # настройки и локализация передаются процессам один раз
+                self.__pool = Pool(self.__prop['proc'],
+                                   Generator._init_worker,
+                                   (self.__prop, self.__lang, self.__cache,
+                                    self.__report))
+            pipeline.run(tasks, self.__pool, read, work, write_,
+                         self.__prop['threads'], size)
+
+        def merge_timer(timer):
+            """Добавить замеры задачи (в потоке записи).
+
+            :param timer: Profiler или None
             """
-            split = self._get_split(names, modules, path, out)
-            with Pool(self.__prop['proc']) as pool:  # запуск процессов
-                pool.map(self._proc, split)
+            if timer:
+                with self.__lock:
+                    self.__profiler.merge(timer)
 
-        def gen_package(path, out, root=False):
-            """Создание документации по пакетуи подпакетам (рекурсивно).
+        def write(result):
+            """Сохранение результата задачи: записанные процессом файлы,
+            индексы (выполняется в потоке записи).
+
+            :param result: tuple, результат _proc или _proc_render
+            """
+            out, files_, timer, data, entries = result
+            files.extend(files_)
+            if data is not None:  # опция index
+                with profiler.measure(timer, 'index'):
+                    self._add_index(data[0], decode(data[1]), out)
+            if entries:  # опция search
+                self.__entries.update(entries)
+            merge_timer(timer)
+
+        def is_changed(path):
+            """Проверить, затронут ли пакет изменениями: есть ли среди
+            changed добавленные, изменённые или удалённые модули пакета
+            (от них зависят иерархии классов всех страниц пакета).
+
+            :param path: str, путь к пакету
+            :return: bool
+            """
+            return packages is None or os.path.abspath(path) in packages
+
+        def gen(groups):
+            """Создание документации: задачи с анализом и генерацией
+            вместе, по задаче на пакет (один процесс без step).
+
+            :param groups: list, модули по пакетам (см. gen_package)
+            """
+            tasks = []
+            for path, out, names, modules in groups:
+                if is_changed(path):  # иерархии зависят от всего пакета
+                    tasks += self._get_split(names, modules, out)
+            tasks.sort(key=lambda task: self._get_size(task[0],
+                                                       task[0].keys()),
+                       reverse=True)
+            run(tasks, self._read, Generator._work, write)
+
+        def gen_merged(groups):
+            """Создание документации по общим моделям пакетов: анализ
+            модулей, объединение результатов, генерация страниц.
+
+            :param groups: list, модули по пакетам (см. gen_package)
+            """
+            def collect(result):
+                """Сохранение результатов анализа (в потоке записи)."""
+                modules, results, timer = result
+                i = 0
+                for name in modules:
+                    self.__results[modules[name]] = results[i]
+                    i += 1
+                merge_timer(timer)
+
+            actual = set()  # пути ко всем модулям проекта
+            tasks = []
+            for path, out, names, modules in groups:
+                actual.update(modules.values())
+                new = [name for name in names if changed is None or
+                       modules[name] in changed or
+                       modules[name] not in self.__results]
+                tasks += self._get_split(new, modules, out)
+            for path in list(self.__results):  # удалённые модули
+                if path not in actual:
+                    del self.__results[path]
+            tasks.sort(key=lambda task: self._get_size(task[0],
+                                                       task[0].keys()),
+                       reverse=True)
+            run(tasks, self._read, Generator._work_analyse, collect)
+            tasks = []
+            for path, out, names, modules in groups:
+                if not is_changed(path):  # пакет не изменился
+                    continue
+                classes = Classes()
+                for name in names:  # в порядке модулей пакета
+                    classes.merge(self.__results[modules[name]][1])
+                if self.__index is not None:
+                    with profiler.measure(self.__profiler, 'index'):
+                        for name in names:
+                            result = decode(
+                                self.__results[modules[name]][0])
+                            self._add_index(
+                                {name: modules[name]},
+                                (result[0], result[1], classes), out)
+                part = self.__prop['step']
+                if part < 1:  # по части на процесс
+                    part = -(-len(names) // self.__prop['proc'])
+                for i in range(0, len(names), part):
+                    chunk = {name: modules[name]
+                             for name in names[i:i+part]}
+                    tasks.append((classes, [self.__results[chunk[name]][0]
+                                            for name in chunk], chunk, out,
+                                   update))
+            run(tasks, lambda task: task, Generator._work_render, write)
+            if not self.__prop['watch']:  # результаты больше не нужны
+                self.__results = {}
+
+        def gen_package(path, out, groups, tree, root=False):
+            """Сбор модулей по пакету и подпакетам (рекурсивно).
 
             :param path: str, путь к Python проекту
             :param out: str, путь к директории записи документации
-            :param root: bool, True - сгенерировать index.rst
+            :param groups: list, список, в который добавляются модули
+            пакетов, [(путь к пакету, out, имена модулей, {имя: путь}), ...]
+            :param tree: dict, модули и пакеты проекта (см. reader.walk)
+            :param root: bool, True - сгенерировать index.rst (для html
+            главная страница создаётся по всем модулям, см. gen_html_index)
             """
-            p_names, packages = reader.get_packages(path)
-            m_names, modules = reader.get_modules(path, True)
+            m_names, modules, p_names, packages = tree[path]
             if root:  # если это корень, то сгенерировать index.rst
                 if self.__prop['gen'] == 'rst':  # rst проект
                     index_names = m_names.copy()
@@ -143,25 +702,110 @@ class Generator:
                     index = RSTGenerator(None, None, None, self.__prop,
                                          self.__lang
                                          ).gen_index(names=index_names)
-                    writer.write_rst_project((), (), index, out)
-            gen(m_names, modules, path, out)  # генерация модулей
-            for pack in p_names:  # рекурсиваня генерация пакетов
+                    files.extend(writer.write_rst_project(
+                        (), (), index, out, update))
+            if m_names:
+                groups.append((path, out, m_names, modules))
+            for pack in p_names:  # рекурсиваня обработка пакетов
                 new_out = os.path.join(out, pack)
                 if not os.path.isdir(new_out):
                     os.mkdir(new_out)
-                gen_package(packages[pack], new_out)
+                gen_package(packages[pack], new_out, groups, tree)
+
+        def gen_html_index(groups):
+            """Запись главной страницы html с деревом навигации по всем
+            модулям и файла стилей.
 
+            :param groups: list, модули по пакетам (см. gen_package)
+            """
+            pages = []
+            for path, out, names, modules in groups:
+                pages += [self._get_page(out, name) for name in names]
+            html = HTMLGenerator(None, None, None, self.__prop, self.__lang)
+            files.extend(writer.write_rst_project(
+                (), (), html.gen_index(pages), self.__prop['out'], update,
+                self._get_ext()))
+            path_style = os.path.join(self.__prop['out'], STYLE)
+            files.append((path_style, writer.write_file(
+                path_style, html.gen_style(), True)))
+
+        update = self.__prop['update'] or changed is not None
+        self.__update = update
+        packages = None  # пакеты с изменёнными модулями (см. is_changed)
+        if changed is not None:
+            packages = set(os.path.dirname(os.path.abspath(path))
+                           for path in changed)
         path_ = self.__prop['path']
         if not os.path.isdir(self.__prop['out']):
             os.mkdir(self.__prop['out'])
-        if self.__prop['cleardir']:
-            writer.clear_dir(self.__prop['out'])
+        self.set_cache(self.__prop['cache'])  # кэш анализа (опция cache)
+        if self.__prop['profile'] is not None:  # замер времени
+            self.__profiler = profiler.Profiler()
+            self.__report = os.path.abspath(
+                self.__prop['profile'] or
+                os.path.join(self.__prop['out'], profiler.FILE))
+        if self.__prop['cleardir'] and not update:
+            writer.clear_dir(self.__prop['out'], (self.__cache,))
+        files = []
+        groups = []
         if os.path.isdir(path_):  # если это директория (пакет)
-            gen_package(path_, self.__prop['out'], True)
-            return True
+            with profiler.measure(self.__profiler, 'walk'):
+                tree = reader.walk(path_, self.__prop['include'],
+                                   self.__prop['exclude'])
+            gen_package(path_, self.__prop['out'], groups, tree, True)
         elif os.path.isfile(path_):  # если это файл (модуль)
             name = os.path.basename(path_)
             name = name[:name.index('.')]
-            gen([name], {name: path_}, path_, self.__prop['out'])
-            return True
-        return False
+            groups.append((os.path.dirname(path_), self.__prop['out'],
+                           [name], {name: path_}))
+        else:
+            return False
+        if self.__prop['gen'] == 'html':  # html проект
+            gen_html_index(groups)
+        if self.__prop['index'] is not None:  # индекс символов
+            self.__index = index.Index(
+                self.__prop['index'] or
+                os.path.join(self.__prop['out'], index.FILE))
+        try:
+            if self.__prop['proc'] > 1 or self.__prop['step'] > 0:
+                gen_merged(groups)  # общая модель пакета
+            else:
+                gen(groups)
+            paths = set()  # все модули проекта
+            for path, out, names, modules in groups:
+                paths.update(modules.values())
+            if self.__index is not None:  # удаление модулей не из проекта
+                self.__index.retain(paths)
+                self.__index.commit()
+            if self.__prop['search'] is not None:  # поисковый индекс
+                for path in list(self.__entries):
+                    if path not in paths:  # удалённые модули
+                        del self.__entries[path]
+                with profiler.measure(self.__profiler, 'index'):
+                    files.extend(search.write(
+                        self.__prop['search'] or
+                        os.path.join(self.__prop['out'], search.DIR),
+                        self.__entries.values()))
+                if not self.__prop['watch']:
+                    self.__entries = {}
+        finally:
+            if self.__index is not None:
+                self.__index.close()
+                self.__index = None
+            if not self.__prop['watch']:
+                self.close()
+        self.__changed = [f[0] for f in files if f[1]]
+        actual = [f[0] for f in files]  # все сгенерированные файлы
+        if changed is not None:  # страницы пропущенных модулей
+            for path, out, names, modules in groups:
+                actual += [os.path.join(out, name + self._get_ext())
+                           for name in names]
+        if update:  # удаление устаревших страниц (по манифесту)
+            writer.remove_stale(self.__prop['out'], actual)
+        writer.write_manifest(self.__prop['out'], actual)
+        if self.__profiler:  # запись отчёта
+            self.__profiler.write(self.__report)
+        if self.__cache:  # ограничение размера кэша
+            cache.Cache(self.__cache, self.__prop,
+                        self.__prop['cache_size']).trim()
+        return True
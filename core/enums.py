@@ -7,3 +7,4 @@ __all__ = ['DocType']
 class DocType(IntEnum):
     """Тип документации."""
     rst = 0
+    html = 1
@@ -0,0 +1,304 @@
+"""Модуль с индексом символов проекта в SQLite (опции -index и -query)."""
+import os
+import sqlite3
+from analyse.data import Classes
+from analyse.enums import ElementType
+
+__all__ = ['Index', 'FILE', 'VERSION', 'KINDS', 'QUERIES', 'get_doc',
+           'iter_symbols']
+
+FILE = 'npdoc_index.sqlite3'
+"""Имя файла индекса в директории с документацией (по-умолчанию)."""
+VERSION = 1
+"""Версия схемы индекса (при несовпадении индекс создаётся заново)."""
+_KEY = 'npdoc_index'
+"""Ключ версии схемы в таблице meta (по нему файл опознаётся как индекс
+npdoc)."""
+KINDS = {
+    ElementType.cl: 'class',
+    ElementType.fun: 'function',
+    ElementType.met: 'method',
+    ElementType.var: 'variable'
+}
+"""Виды символов в индексе по типам элементов."""
+QUERIES = ('def', 'sub', 'undoc')
+"""Запросы опции -query: def ИМЯ - где определён символ, sub ИМЯ -
+суб-классы класса (на всю глубину), undoc - публичные функции и методы
+без документации."""
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS modules (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    page TEXT NOT NULL,
+    doc TEXT,
+    doc_type TEXT
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    id INTEGER PRIMARY KEY,
+    module INTEGER NOT NULL REFERENCES modules(id) ON DELETE CASCADE,
+    parent INTEGER REFERENCES symbols(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    doc TEXT,
+    doc_type TEXT,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bases (
+    symbol INTEGER NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    base TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS symbols_kind ON symbols(kind);
+CREATE INDEX IF NOT EXISTS symbols_module ON symbols(module);
+CREATE INDEX IF NOT EXISTS symbols_parent ON symbols(parent);
+CREATE INDEX IF NOT EXISTS bases_name ON bases(name);
+CREATE INDEX IF NOT EXISTS bases_symbol ON bases(symbol);
+'''
+"""Схема индекса."""
+_SELECT = '''
+SELECT m.name, s.qualname, s.kind, s.signature, m.path, m.page
+FROM symbols s JOIN modules m ON m.id = s.module
+'''
+"""Начало запросов символов (см. Index.find)."""
+
+
+def get_doc(element):
+    """Получить документацию элемента в виде текста.
+
+    :param element: tuple, (ElementType, (DocType, (строки...))) или None
+    :return: tuple, (str, str), (текст, тип - doc или com) или
+    (None, None) без документации
+    """
+    if not element or not element[1] or element[1][0] is None or\
+            not element[1][1]:
+        return None, None
+    return '\n'.join(element[1][1]), element[1][0].name
+
+
+def __iter_symbols(model, module, content, sequence, prefix=''):
+    """Обойти элементы модуля или класса (классы - рекурсивно).
+
+    :param model: tuple, (Sequence, SubElements, Classes)
+    :param module: str, имя модуля в модели
+    :param content: {имя: элемент} (см. SubElements.get_global)
+    :param sequence: порядок имён элементов
+    :param prefix: str, qualname класса с точкой ('' - элементы модуля)
+    :return: генератор tuple, см. iter_symbols
+    """
+    position = 0
+    for signature in sequence:
+        if signature not in content:
+            continue
+        element = content[signature]
+        if type(element) != tuple:  # с локальными элементами
+            element = element.get(None)
+        if not element or element[0] not in KINDS:
+            continue
+        qualname = prefix + Classes.cut_round(signature)
+        yield qualname, signature, element, prefix[:-1] or None, position
+        position += 1
+        if element[0] == ElementType.cl:  # элементы класса
+            yield from __iter_symbols(
+                model, module, model[1].get_self(module, signature),
+                model[0].get_self_elements(module, signature),
+                qualname + '.')
+
+
+def iter_symbols(model, module):
+    """Обойти символы модуля (классы, функции, методы, переменные) в
+    порядке Sequence, классы - вместе с их элементами.
+
+    :param model: tuple, (Sequence, SubElements, Classes)
+    :param module: str, имя модуля в модели
+    :return: генератор tuple, (qualname, сигнатура, элемент, qualname
+    класса или None, номер в модуле или классе), элемент -
+    (ElementType, (DocType, (строки...)))
+    """
+    sequence = list(model[0].get_global_elements(module))
+    sequence += model[0].get_classes(module)
+    yield from __iter_symbols(model, module, model[1].get_global(module),
+                              sequence)
+
+
+class Index:
+    """Индекс символов проекта в одном файле SQLite.
+
+    Хранит модули, классы (с супер-классами из Classes.cls), функции,
+    методы и переменные с документацией, в порядке из Sequence. Модули
+    заменяются целиком по пути к файлу, поэтому при обновлении (опция
+    watch) перезаписываются только изменённые модули. Запись выполняется
+    в одной транзакции до commit.
+    """
+    def __init__(self, path, create=True):
+        """
+
+        :param path: str, путь к файлу индекса
+        :param create: bool, True - создать индекс (пересоздать индекс
+        другой версии схемы), False - только открыть существующий
+        :raise FileNotFoundError: create=False и файла нет
+        :raise sqlite3.DatabaseError: файл не пустой и не индекс npdoc
+        (файл не изменяется) или create=False и индекс другой версии
+        """
+        if not create and not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        empty = not os.path.isfile(path) or not os.path.getsize(path)
+        self.path = path
+        """Путь к файлу индекса."""
+        self.__db = self._connect(path)
+        """sqlite3.Connection (заполняется из потока записи)."""
+        version = None if empty else self.get_meta(_KEY)
+        if version != str(VERSION) and (not create or not empty):
+            self.__db.close()
+            if version is None:  # чужой файл не удаляется
+                raise sqlite3.DatabaseError('not an npdoc index: ' + path)
+            if not create:
+                raise sqlite3.DatabaseError('index version: ' + version)
+            os.remove(path)  # индекс другой версии
+            self.__db = self._connect(path)
+        if create:
+            self.__db.executescript(_SCHEMA)
+            self.set_meta(_KEY, str(VERSION))
+            self.commit()  # файл опознаётся как индекс и без записи
+
+    @staticmethod
+    def _connect(path):
+        """Открыть файл индекса.
+
+        :param path: str, путь к файлу индекса
+        :return: sqlite3.Connection
+        """
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute('PRAGMA foreign_keys = ON')
+        return db
+
+    def get_meta(self, key):
+        """Получить значение из служебной таблицы.
+
+        :param key: str, ключ
+        :return: str или None (нет значения или таблицы)
+        """
+        try:
+            row = self.__db.execute('SELECT value FROM meta WHERE key = ?',
+                                    (key,)).fetchone()
+        except sqlite3.DatabaseError:  # пустой файл, не индекс
+            return None
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        """Записать значение в служебную таблицу.
+
+        :param key: str, ключ
+        :param value: str, значение
+        """
+        self.__db.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                          (key, value))
+
+    def add(self, name, path, page, model, module):
+        """Добавить модуль (заменить, если модуль с тем же путём есть).
+
+        :param name: str, имя модуля в проекте (пакет.модуль)
+        :param path: str, путь к файлу модуля
+        :param page: str, путь к странице документации относительно
+        директории с документацией
+        :param model: tuple, (Sequence, SubElements, Classes), результат
+        анализа (Classes может быть None)
+        :param module: str, имя модуля в модели
+        """
+        path = os.path.abspath(path)
+        self.__db.execute('DELETE FROM modules WHERE path = ?', (path,))
+        doc, doc_type = get_doc(model[1].get_global(module).get(None))
+        module_id = self.__db.execute(
+            'INSERT INTO modules (name, path, page, doc, doc_type) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (name, path, page, doc, doc_type)).lastrowid
+        ids = {}  # id классов по qualname
+        for qualname, signature, element, parent, position in\
+                iter_symbols(model, module):
+            name = Classes.cut_round(signature)
+            doc, doc_type = get_doc(element)
+            cursor = self.__db.execute(
+                'INSERT INTO symbols (module, parent, name, qualname, '
+                'signature, kind, doc, doc_type, position) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (module_id, ids.get(parent), name, qualname, signature,
+                 KINDS[element[0]], doc, doc_type, position))
+            if element[0] != ElementType.cl:
+                continue
+            ids[qualname] = cursor.lastrowid
+            cls = model[2].cls.get(name) if model[2] else None
+            if cls and cls[1] == module:  # супер-классы
+                self.__db.executemany(
+                    'INSERT INTO bases VALUES (?, ?, ?, ?)',
+                    ((cursor.lastrowid, base, base.split('.')[-1], i)
+                     for i, base in enumerate(cls[0])))
+
+    def retain(self, paths):
+        """Удалить модули, которых нет в проекте.
+
+        :param paths: пути к файлам всех модулей проекта
+        """
+        paths = set(os.path.abspath(path) for path in paths)
+        removed = [(row[0],) for row in self.__db.execute(
+            'SELECT path FROM modules') if row[0] not in paths]
+        self.__db.executemany('DELETE FROM modules WHERE path = ?', removed)
+
+    def find(self, name):
+        """Найти, где определён символ.
+
+        :param name: str, имя (A), полное имя в модуле (A.method) или
+        имя с модулем (pkg.module.A.method)
+        :return: list, [(модуль, qualname, вид, сигнатура, путь к файлу,
+        страница), ...]
+        """
+        short = name.split('.')[-1]
+        return self.__db.execute(
+            _SELECT + 'WHERE s.name = ? AND (? = s.name OR s.qualname = ? '
+            "OR m.name || '.' || s.qualname = ?) "
+            'ORDER BY m.name, s.qualname', (short, name, name, name)
+        ).fetchall()
+
+    def get_subclasses(self, name):
+        """Найти суб-классы класса на всю глубину (по имени супер-класса,
+        в т.ч. записанного через модуль: module.A).
+
+        :param name: str, имя класса
+        :return: list, см. find
+        """
+        return self.__db.execute(
+            'WITH RECURSIVE sub(id) AS ('
+            'SELECT symbol FROM bases WHERE name = ? '
+            'UNION SELECT b.symbol FROM sub '
+            'JOIN symbols c ON c.id = sub.id '
+            'JOIN bases b ON b.name = c.name) ' +
+            _SELECT + 'JOIN sub ON sub.id = s.id '
+            'ORDER BY m.name, s.qualname', (name.split('.')[-1],)
+        ).fetchall()
+
+    def get_undocumented(self):
+        """Найти публичные (без _ в начале имени) функции и методы без
+        документации и комментариев.
+
+        :return: list, см. find
+        """
+        return self.__db.execute(
+            _SELECT + "WHERE s.kind IN ('function', 'method') "
+            "AND s.doc IS NULL AND substr(s.name, 1, 1) != '_' "
+            'ORDER BY m.name, s.id'
+        ).fetchall()
+
+    def commit(self):
+        """Сохранить изменения."""
+        self.__db.commit()
+
+    def close(self):
+        """Закрыть индекс (несохранённые изменения отменяются)."""
+        self.__db.close()
@@ -26,17 +26,28 @@ def get_dict(args, lang):
     parser.add_argument('-iface', default='console', type=str,
                         help=lang['HELP']['iface'], choices=['console'])
     parser.add_argument('-gen', default='rst', type=str,
-                        help=lang['HELP']['gen'], choices=['rst'])
+                        help=lang['HELP']['gen'],
+                        choices=['rst', 'html'])
+    parser.add_argument('-engine', default='text', type=str,
+                        help=lang['HELP']['engine'], choices=['text', 'ast'])
     parser.add_argument('-v', '--version', default=False, action='store_true',
                         dest='version', help=lang['HELP']['ver'])
     parser.add_argument('-h', '--help', default=False, action='store_true',
                         dest='help', help=lang['HELP']['help'])
     parser.add_argument('-path', type=str, help=lang['HELP']['path'])
     parser.add_argument('-out', type=str, help=lang['HELP']['out'])
+    parser.add_argument('-include', nargs='*', default=[], type=str,
+                        help=lang['HELP']['include'])
+    parser.add_argument('-exclude', nargs='*', default=[], type=str,
+                        help=lang['HELP']['exclude'])
     parser.add_argument('-step', type=int, default=-1,
                         help=lang['HELP']['step'])
     parser.add_argument('-proc', type=int, default=1,
                         help=lang['HELP']['proc'])
+    parser.add_argument('-threads', type=int, default=4,
+                        help=lang['HELP']['threads'])
+    parser.add_argument('-queue', type=int, default=0,
+                        help=lang['HELP']['queue'])
     parser.add_argument('-numbered', default=False, action='store_true',
                         help=lang['HELP']['numbered'])
     parser.add_argument('-hidden', default=False, action='store_true',
@@ -56,6 +67,24 @@ def get_dict(args, lang):
                         help=lang['HELP']['strip'])
     parser.add_argument('-cleardir', default=False, action='store_true',
                         help=lang['HELP']['cleardir'])
+    parser.add_argument('-update', default=False, action='store_true',
+                        help=lang['HELP']['update'])
+    parser.add_argument('-cache', nargs='?', const='', default=None,
+                        type=str, help=lang['HELP']['cache'])
+    parser.add_argument('-cache_size', default=100, type=int,
+                        help=lang['HELP']['cache_size'])
+    parser.add_argument('-watch', default=False, action='store_true',
+                        help=lang['HELP']['watch'])
+    parser.add_argument('-index', nargs='?', const='', default=None,
+                        type=str, help=lang['HELP']['index'])
+    parser.add_argument('-query', nargs='+', type=str,
+                        help=lang['HELP']['query'])
+    parser.add_argument('-search', nargs='?', const='', default=None,
+                        type=str, help=lang['HELP']['search'])
+    parser.add_argument('-profile', nargs='?', const='', default=None,
+                        type=str, help=lang['HELP']['profile'])
+    parser.add_argument('-profile_dump', default=False, action='store_true',
+                        help=lang['HELP']['profile_dump'])
     return vars(parser.parse_known_args(args)[0]), parser.format_help()
 
 
@@ -86,6 +115,8 @@ def is_correct(kwargs):
     """
     if not kwargs:
         return False
+    elif kwargs.get('query'):  # запрос к индексу, без генерации
+        return bool(kwargs['index'] or kwargs['out'])
     elif not kwargs['path']:
         return False
     elif not kwargs['out']:
@@ -0,0 +1,110 @@
+"""Модуль с конвейером генерации: чтение (потоки), анализ и генерация
+(процессы), запись (поток), связанные ограниченными очередями."""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = ['run', 'THREADS', 'CHECK']
+
+THREADS = 4
+"""Количество потоков чтения (по-умолчанию)."""
+CHECK = 1.0
+"""Интервал проверки процессов pool в секундах (по-умолчанию)."""
+
+
+def run(tasks, pool, read, work, write, threads=THREADS, size=16,
+        check=CHECK):
+    """Выполнить задачи конвейером.
+
+    Чтение следующих задач, обработка в процессах и запись готовых
+    выполняются одновременно. Задач в работе (от начала чтения до конца
+    записи) не больше size: когда запись или процессы не успевают,
+    чтение новых задач ждёт.
+
+    Задача процесса, завершившегося аварийно (убит, нехватка памяти),
+    не возвращает ни результата, ни ошибки, поэтому во время ожидания
+    процессы pool проверяются каждые check секунд: если какой-то из них
+    завершился, запуск прерывается с ошибкой, а не ждёт бесконечно
+    (pool - без maxtasksperchild, процессы не завершаются сами).
+
+    :param tasks: итерируемый объект с задачами
+    :param pool: multiprocessing.Pool для обработки
+    :param read: функция чтения, read(задача) -> данные для work
+    (выполняется в потоках чтения)
+    :param work: функция обработки, work(данные) -> данные для write
+    (выполняется в процессах pool, должна быть доступна по имени)
+    :param write: функция записи, write(результат work) (выполняется в
+    одном потоке записи, по мере готовности результатов)
+    :param threads: int, количество потоков чтения
+    :param size: int, максимум задач в работе
+    :param check: float, интервал проверки процессов в секундах
+    :raise RuntimeError: процесс pool завершился во время работы
+    """
+    slots = threading.BoundedSemaphore(size)
+    done = queue.Queue()  # не больше size, ограничено slots
+    errors = []
+    processes = set(pool._pool)  # в т.ч. заменённые pool после выхода
+
+    def acquire():
+        """Дождаться места задачи, проверяя процессы.
+
+        :return: bool, True - место получено, False - процесс завершился
+        """
+        while not slots.acquire(timeout=check):
+            processes.update(pool._pool)
+            for process in processes:
+                if process.exitcode is not None:
+                    errors.append(RuntimeError(
+                        'worker process exited unexpectedly (exit code %d)'
+                        % process.exitcode))
+                    return False
+        return True
+
+    def fail(error):
+        """Запомнить ошибку и освободить место задачи."""
+        errors.append(error)
+        slots.release()
+
+    def writer():
+        """Поток записи."""
+        while True:
+            result = done.get()
+            if result is None:
+                return
+            try:
+                if not errors:
+                    write(result)
+            except BaseException as error:
+                errors.append(error)
+            finally:
+                slots.release()
+
+    def submit(future):
+        """Передать прочитанную задачу в процессы."""
+        try:
+            data = future.result()
+        except BaseException as error:
+            fail(error)
+            return
+        pool.apply_async(work, (data,), callback=done.put,
+                         error_callback=fail)
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    try:
+        with ThreadPoolExecutor(threads) as readers:
+            for task in tasks:
+                if not acquire():  # ожидание места в конвейере
+                    break
+                if errors:
+                    slots.release()
+                    break
+                readers.submit(read, task).add_done_callback(submit)
+        for i in range(size):  # ожидание завершения всех задач
+            if not acquire():
+                break
+    finally:
+        done.put(None)
+        thread.join()
+    if errors:
+        raise errors[0]
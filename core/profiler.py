@@ -0,0 +1,159 @@
+"""Модуль для замера времени этапов генерации (опция -profile)."""
+import os
+import time
+import json
+import cProfile
+from contextlib import contextmanager, nullcontext
+
+__all__ = ['Profiler', 'STAGES', 'FILE', 'measure', 'start_dump',
+           'stop_dump']
+
+STAGES = ('walk', 'read', 'analyse', 'render', 'write', 'index')
+"""Этапы генерации: обход проекта, чтение модулей, анализ, генерация
+и запись страниц (этапы выполняются одновременно, конвейером), запись
+индексов символов и поиска (опции index и search)."""
+FILE = 'npdoc_profile.json'
+"""Имя файла отчёта в директории с документацией (по-умолчанию)."""
+
+__dump = None
+"""cProfile.Profile процесса (при записи дампов)."""
+
+
+class Profiler:
+    """Замер времени (реального и процессорного) по этапам и модулям."""
+    def __init__(self):
+        self.stages = {}
+        """Время по этапам, {этап: [реальное, процессорное], ...}."""
+        self.modules = {}
+        """Время по модулям, {модуль: {этап: [реальное, процессорное]}}."""
+
+    @contextmanager
+    def measure(self, stage, module=None):
+        """Замерить время выполнения блока with.
+
+        :param stage: str, этап (см. STAGES)
+        :param module: str, модуль (None - время только этапа)
+        """
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self.add(stage, module, time.perf_counter() - wall,
+                     time.process_time() - cpu)
+
+    def add(self, stage, module, wall, cpu):
+        """Добавить замер.
+
+        :param stage: str, этап (см. STAGES)
+        :param module: str, модуль (None - время только этапа)
+        :param wall: float, реальное время в секундах
+        :param cpu: float, процессорное время в секундах
+        """
+        times = self.stages.setdefault(stage, [0.0, 0.0])
+        times[0] += wall
+        times[1] += cpu
+        if module is not None:
+            times = self.modules.setdefault(module, {})
+            times = times.setdefault(stage, [0.0, 0.0])
+            times[0] += wall
+            times[1] += cpu
+
+    def rename(self, names):
+        """Заменить имена модулей (например, на пути к ним).
+
+        :param names: dict, {старое имя: новое имя, ...}
+        """
+        self.modules = {names.get(k, k): v for k, v in self.modules.items()}
+
+    def merge(self, other):
+        """Добавить замеры из другого Profiler (например, из процесса).
+
+        :param other: Profiler
+        """
+        for stage, times in other.stages.items():
+            self.add(stage, None, times[0], times[1])
+        for module, stages in other.modules.items():
+            for stage, times in stages.items():
+                add = self.modules.setdefault(module, {}).setdefault(
+                    stage, [0.0, 0.0])
+                add[0] += times[0]
+                add[1] += times[1]
+
+    def get_total(self, module):
+        """Получить общее реальное время модуля.
+
+        :param module: str, модуль
+        :return: float, секунды
+        """
+        return sum(times[0] for times in self.modules[module].values())
+
+    def get_slowest(self, count=10):
+        """Получить самые медленные модули.
+
+        :param count: int, количество
+        :return: list, [(модуль, секунды), ...], от медленных к быстрым
+        """
+        result = [(module, self.get_total(module)) for module in self.modules]
+        result.sort(key=lambda item: item[1], reverse=True)
+        return result[:count]
+
+    def get_report(self):
+        """Получить отчёт.
+
+        :return: dict, {'stages': {...}, 'modules': {...}}, время в
+        секундах, для каждого этапа {'wall': float, 'cpu': float}
+        """
+        def convert(stages):
+            return {stage: {'wall': round(times[0], 6),
+                            'cpu': round(times[1], 6)}
+                    for stage, times in stages.items()}
+
+        modules = {}
+        for module, total in self.get_slowest(len(self.modules)):
+            modules[module] = convert(self.modules[module])
+            modules[module]['total'] = round(total, 6)
+        return {'stages': convert(self.stages), 'modules': modules}
+
+    def write(self, path):
+        """Записать отчёт в JSON файл.
+
+        :param path: str, путь к файлу
+        """
+        with open(path, 'w') as file:
+            json.dump(self.get_report(), file, indent=2, ensure_ascii=False)
+
+
+def measure(profiler, stage, module=None):
+    """Замерить время выполнения блока with, если замер включён.
+
+    :param profiler: Profiler или None (без замера)
+    :param stage: str, этап (см. STAGES)
+    :param module: str, модуль (None - время только этапа)
+    :return: контекстный менеджер
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.measure(stage, module)
+
+
+def start_dump():
+    """Включить cProfile в текущем процессе (один на процесс, замеры
+    задач накапливаются)."""
+    global __dump
+    if __dump is None:
+        __dump = cProfile.Profile()
+    __dump.enable()
+
+
+def stop_dump(path_dir):
+    """Выключить cProfile в текущем процессе и записать накопленный
+    дамп в файл npdoc_<pid>.prof.
+
+    :param path_dir: str, путь к директории для записи
+    """
+    if __dump is None:
+        return
+    __dump.disable()
+    __dump.dump_stats(os.path.join(path_dir,
+                                   'npdoc_' + str(os.getpid()) + '.prof'))
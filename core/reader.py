@@ -1,7 +1,12 @@
 """Модуль для чтения пакетов."""
 import os
+from fnmatch import fnmatch
 
-__all__ = ['get_file', 'get_names', 'get_modules', 'get_packages']
+__all__ = ['get_file', 'get_names', 'get_modules', 'get_packages', 'walk',
+           'SKIP']
+
+SKIP = ('__pycache__',)
+"""Имена директорий, которые всегда пропускаются (кроме скрытых)."""
 
 
 def get_file(path):
@@ -85,3 +90,98 @@ def get_packages(path):
                     names.append(file)
                     break
     return names, packages
+
+
+def __is_module(name):
+    """Проверить, является ли имя файла именем модуля.
+
+    :param name: str, имя файла
+    :return: bool
+    """
+    return len(name) >= 4 and (name[-3:] == '.py' or name[-4:] == '.pyw')
+
+
+def __match(name, rel, patterns):
+    """Проверить, подходит ли файл под один из шаблонов.
+
+    :param name: str, имя файла
+    :param rel: str, путь относительно корня проекта (через /)
+    :param patterns: list, glob шаблоны
+    :return: bool
+    """
+    for pattern in patterns:
+        if fnmatch(name, pattern) or fnmatch(rel, pattern):
+            return True
+    return False
+
+
+def walk(path, include=(), exclude=()):
+    """Обойти проект за один проход (os.scandir) и составить его список
+    модулей и пакетов.
+
+    Скрытые директории (.имя) и директории из SKIP пропускаются,
+    директории по символическим ссылкам обходятся только один раз.
+    Пакетами считаются директории, в которых есть модули (как в
+    get_packages).
+
+    :param path: str, путь к директории проекта
+    :param include: list, glob шаблоны модулей, которые нужно
+    документировать (пустой - все модули)
+    :param exclude: list, glob шаблоны модулей и директорий, которые
+    нужно пропустить (директории не обходятся)
+    :return: dict, ключи - пути к директориям, значения - tuple,
+    (list, dict, list, dict), (имена модулей, пути к модулям,
+    имена пакетов, пути к пакетам), как у get_modules и get_packages
+    """
+    result = {}
+    seen = set()  # (устройство, inode) обойдённых директорий
+
+    def scan(path_dir, rel):
+        """Обойти директорию (рекурсивно).
+
+        :param path_dir: str, путь к директории
+        :param rel: str, путь относительно корня проекта
+        :return: bool, True - в директории есть модули
+        """
+        try:
+            stat = os.stat(path_dir)
+        except OSError:
+            return False
+        if (stat.st_dev, stat.st_ino) in seen:  # уже обойдена
+            return False
+        seen.add((stat.st_dev, stat.st_ino))
+        m_names = []
+        modules = {}
+        dirs = []
+        try:
+            with os.scandir(path_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    path_entry = rel + '/' + name if rel else name
+                    if exclude and __match(name, path_entry, exclude):
+                        continue
+                    try:
+                        if entry.is_dir():
+                            if name[0] != '.' and name not in SKIP:
+                                dirs.append((name, entry.path, path_entry))
+                        elif __is_module(name) and entry.is_file():
+                            if include and not __match(name, path_entry,
+                                                       include):
+                                continue
+                            m_names.append(name[:-3])
+                            modules[name[:-3]] = entry.path
+                    except OSError:  # битая ссылка или нет доступа
+                        continue
+        except OSError:
+            return False
+        p_names = []
+        packages = {}
+        for name, path_entry, rel_entry in dirs:
+            if scan(path_entry, rel_entry):  # в директории есть модули
+                p_names.append(name)
+                packages[name] = path_entry
+        result[path_dir] = (m_names, modules, p_names, packages)
+        return bool(m_names)
+
+    scan(path, '')
+    return result
@@ -0,0 +1,178 @@
+"""Модуль с поисковым индексом для статических страниц (опция -search).
+
+Индекс - обратный: термины (части имён и слова документации) -> номера
+элементов. Он разбит на файлы, чтобы страница загружала только нужные:
+
+- index.json: {"version": VERSION, "docs": количество элементов,
+  "chunk": элементов в файле docs, "kinds": [вид, ...],
+  "shards": [первый термин шарда, ...]};
+- terms<N>.json: шард N, {термин: [[номера, где термин в имени],
+  [номера, где термин в документации]]}, номера по возрастанию, каждый
+  записан разностью с предыдущим. Термины отсортированы по всем шардам,
+  поэтому термин ищется в шарде с последним первым термином <= термина
+  (двоичный поиск по shards), для поиска по префиксу - ещё и в следующих;
+- docs<N>.json: элементы с номерами от N * chunk, {"pages": [страница,
+  ...], "docs": [[номер страницы в pages, qualname, номер вида в kinds],
+  ...]}, страница - путь относительно директории с документацией без
+  расширения, у модуля qualname пустой.
+"""
+import os
+import re
+import json
+import core.index as index
+import core.writer as writer
+
+__all__ = ['DIR', 'VERSION', 'SHARD_SIZE', 'CHUNK', 'MIN_LENGTH', 'KINDS',
+           'get_name_terms', 'get_doc_terms', 'get_entries', 'write']
+
+DIR = '_search'
+"""Имя директории индекса в директории с документацией (по-умолчанию)."""
+VERSION = 1
+"""Версия формата индекса."""
+SHARD_SIZE = 64 * 1024
+"""Примерный размер шарда с терминами в байтах."""
+CHUNK = 1000
+"""Количество элементов в одном файле docs."""
+MIN_LENGTH = 2
+"""Минимальная длина термина."""
+KINDS = ('module',) + tuple(index.KINDS.values())
+"""Виды элементов (номера видов в файлах docs)."""
+
+__WORD = re.compile(r'[^\W_]+')
+"""Слово: буквы и цифры (подчёркивание - разделитель)."""
+__CAMEL = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+"""Части слова в CamelCase (RSTGenerator -> RST, Generator)."""
+__FILE = re.compile(r'(terms|docs)\d+\.json')
+"""Файлы шардов и элементов (удаляются, если их нет в новом индексе)."""
+__JSON = {'ensure_ascii': False, 'separators': (',', ':')}
+"""Параметры json.dumps для компактной записи."""
+
+
+def __is_term(term):
+    """Проверить, подходит ли термин для индекса.
+
+    :param term: str
+    :return: bool
+    """
+    return len(term) >= MIN_LENGTH and not term.isdigit()
+
+
+def get_name_terms(name):
+    """Получить термины имени: имя целиком, части по подчёркиваниям и
+    по CamelCase.
+
+    :param name: str, имя элемента (без скобок)
+    :return: set, термины в нижнем регистре
+    """
+    result = {name.lower()}
+    for word in __WORD.findall(name):
+        result.add(word.lower())
+        for part in __CAMEL.findall(word):
+            result.add(part.lower())
+    return set(term for term in result if __is_term(term))
+
+
+def get_doc_terms(text):
+    """Получить термины документации (слова).
+
+    :param text: str, документация
+    :return: set, термины в нижнем регистре
+    """
+    return set(term for term in __WORD.findall(text.lower())
+               if __is_term(term))
+
+
+def get_entries(model, module):
+    """Получить записи индекса модуля (сам модуль и его символы).
+
+    Вызывается в процессах при генерации, родительскому процессу
+    передаются только записи.
+
+    :param model: tuple, (Sequence, SubElements, Classes)
+    :param module: str, имя модуля в модели
+    :return: list, [(qualname, номер вида в KINDS, термины имени,
+    термины документации), ...], термины - отсортированные tuple
+    """
+    doc = index.get_doc(model[1].get_global(module).get(None))[0]
+    result = [('', 0, tuple(sorted(get_name_terms(module))),
+               tuple(sorted(get_doc_terms(doc or ''))))]
+    for qualname, signature, element, parent, position in\
+            index.iter_symbols(model, module):
+        doc = index.get_doc(element)[0]
+        result.append((qualname, KINDS.index(index.KINDS[element[0]]),
+                       tuple(sorted(get_name_terms(
+                           qualname.split('.')[-1]))),
+                       tuple(sorted(get_doc_terms(doc or '')))))
+    return result
+
+
+def __delta(numbers):
+    """Записать возрастающие номера разностями с предыдущими.
+
+    :param numbers: list, номера по возрастанию
+    :return: list
+    """
+    result = []
+    last = 0
+    for number in numbers:
+        result.append(number - last)
+        last = number
+    return result
+
+
+def write(path, pages, shard_size=SHARD_SIZE, chunk=CHUNK):
+    """Записать индекс (файлы с неизменившимся содержимым не
+    перезаписываются, файлы прошлого индекса, которых больше нет,
+    удаляются).
+
+    :param path: str, путь к директории индекса
+    :param pages: итерируемый объект с tuple, (страница, записи), записи -
+    см. get_entries, номера элементов - по порядку страниц
+    :param shard_size: int, примерный размер шарда с терминами в байтах
+    :param chunk: int, количество элементов в одном файле docs
+    :return: list, [(путь, записан ли файл), ...]
+    """
+    names = {}  # {термин: [номера элементов], ...}
+    words = {}
+    chunks = []  # содержимое файлов docs
+    number = 0
+    for page, entries in sorted(pages, key=lambda page: page[0]):
+        for qualname, kind, name_terms, doc_terms in entries:
+            if number % chunk == 0:  # следующий файл docs
+                chunks.append({'pages': [], 'docs': []})
+            current = chunks[-1]
+            if not current['pages'] or current['pages'][-1] != page:
+                current['pages'].append(page)
+            current['docs'].append([len(current['pages']) - 1, qualname,
+                                    kind])
+            for term in name_terms:
+                names.setdefault(term, []).append(number)
+            for term in doc_terms:
+                words.setdefault(term, []).append(number)
+            number += 1
+    files = {}  # {имя файла: содержимое}
+    shards = []
+    size = shard_size
+    for term in sorted(names.keys() | words.keys()):
+        if size >= shard_size:  # следующий шард
+            shards.append(term)
+            shard = files['terms%d.json' % (len(shards) - 1)] = {}
+            size = 0
+        shard[term] = [__delta(names.get(term, ())),
+                       __delta(words.get(term, ()))]
+        size += len(json.dumps({term: shard[term]}, **__JSON))
+    for i in range(len(chunks)):
+        files['docs%d.json' % i] = chunks[i]
+    files['index.json'] = {'version': VERSION, 'docs': number,
+                           'chunk': chunk, 'kinds': KINDS, 'shards': shards}
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    for name in os.listdir(path):  # удаление файлов прошлого индекса
+        if __FILE.fullmatch(name) and name not in files:
+            os.remove(os.path.join(path, name))
+    result = []
+    for name in sorted(files):
+        path_file = os.path.join(path, name)
+        result.append((path_file, writer.write_file(
+            path_file, (json.dumps(files[name], **__JSON),), True)))
+    return result
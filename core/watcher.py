@@ -0,0 +1,135 @@
+"""Модуль для отслеживания изменений модулей проекта (опция -watch)."""
+import os
+import time
+import core.reader as reader
+
+try:  # inotify (Linux), если установлен пакет inotify_simple
+    import inotify_simple
+except ImportError:  # иначе - опрос времени изменения файлов
+    inotify_simple = None
+
+__all__ = ['Watcher', 'INTERVAL', 'DELAY']
+
+INTERVAL = 1.0
+"""Интервал опроса файлов в секундах (без inotify)."""
+DELAY = 0.2
+"""Задержка после первого события в секундах, чтобы собрать изменения
+нескольких файлов (сохранение из редактора, git checkout) в одно."""
+
+
+class Watcher:
+    """Отслеживание изменений модулей проекта (или одного модуля).
+
+    Изменения определяются сравнением времени изменения и размера файлов
+    с предыдущим обходом. С inotify обход выполняется после событий
+    файловой системы, без него - с интервалом INTERVAL. Наблюдение
+    inotify создаётся один раз и не прерывается между вызовами wait,
+    поэтому события во время генерации документации не теряются.
+    """
+    def __init__(self, path, include=(), exclude=(), interval=INTERVAL):
+        """
+
+        :param path: str, путь к Python проекту либо модулю
+        :param include: list, glob шаблоны документируемых модулей
+        :param exclude: list, glob шаблоны пропускаемых модулей и директорий
+        :param interval: float, интервал опроса в секундах (без inotify)
+        """
+        self.path = path
+        """Путь к проекту либо модулю."""
+        self.include = include
+        """Шаблоны документируемых модулей (см. reader.walk)."""
+        self.exclude = exclude
+        """Шаблоны пропускаемых модулей и директорий (см. reader.walk)."""
+        self.interval = interval
+        """Интервал опроса в секундах."""
+        self.__dirs = ()
+        """Отслеживаемые директории."""
+        self.__notify = None
+        """inotify_simple.INotify (None - опрос)."""
+        self.__watches = {}
+        """Наблюдения inotify, {директория: дескриптор наблюдения}."""
+        if inotify_simple is not None:
+            self.__notify = inotify_simple.INotify()
+        self.files = self.__scan()
+        """Модули с последнего обхода, {путь: (mtime_ns, размер), ...}."""
+
+    def __scan(self):
+        """Обойти проект и получить состояние модулей (наблюдение
+        добавляется для новых директорий до чтения состояния).
+
+        :return: dict, {путь: (mtime_ns, размер), ...}
+        """
+        if os.path.isdir(self.path):
+            tree = reader.walk(self.path, self.include, self.exclude)
+            paths = []
+            for m_names, modules, p_names, packages in tree.values():
+                paths += [modules[name] for name in m_names]
+            self.__dirs = tuple(tree)
+        else:
+            paths = [self.path]
+            self.__dirs = (os.path.dirname(self.path) or '.',)
+        if self.__notify is not None and self.__add_watches():
+            return self.__scan()  # новые директории: изменения до наблюдения
+        result = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:  # удалён во время обхода
+                continue
+            result[path] = (stat.st_mtime_ns, stat.st_size)
+        return result
+
+    def __add_watches(self):
+        """Добавить наблюдение inotify для новых отслеживаемых директорий.
+
+        :return: bool, True - наблюдение добавлено
+        """
+        flags = inotify_simple.flags
+        mask = flags.CREATE | flags.DELETE | flags.MODIFY |\
+            flags.CLOSE_WRITE | flags.MOVED_FROM | flags.MOVED_TO
+        added = False
+        for path in self.__dirs:
+            if path in self.__watches:
+                continue
+            try:
+                self.__watches[path] = self.__notify.add_watch(path, mask)
+            except OSError:  # удалена после обхода
+                continue
+            added = True
+        return added
+
+    def __read(self):
+        """Дождаться событий файловой системы в отслеживаемых
+        директориях (inotify), в том числе уже накопившихся."""
+        events = self.__notify.read(read_delay=int(DELAY * 1000))
+        removed = set(event.wd for event in events
+                      if event.mask & inotify_simple.flags.IGNORED)
+        if removed:  # директория удалена, наблюдение снято
+            for path in list(self.__watches):
+                if self.__watches[path] in removed:
+                    del self.__watches[path]
+
+    def wait(self):
+        """Дождаться изменения модулей.
+
+        :return: set, пути к изменённым, добавленным и удалённым модулям
+        """
+        while True:
+            if self.__notify is not None:
+                self.__read()
+            else:
+                time.sleep(self.interval)
+            files = self.__scan()
+            result = set()
+            for path in files.keys() | self.files.keys():
+                if files.get(path) != self.files.get(path):
+                    result.add(path)
+            self.files = files
+            if result:
+                return result
+
+    def close(self):
+        """Закрыть наблюдение inotify."""
+        if self.__notify is not None:
+            self.__notify.close()
+            self.__notify = None
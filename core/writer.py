@@ -1,42 +1,184 @@
 """Модуль для записи проектов в файлы."""
 import os
 import shutil
+import hashlib
 
-__all__ = ['write_rst_project']
+__all__ = ['write_rst_project', 'write_rst_pages', 'read_manifest',
+           'write_manifest', 'remove_stale', 'BUFFER', 'MANIFEST']
 
+BUFFER = 64 * 1024
+"""Размер буфера записи файлов в байтах."""
+MANIFEST = '.npdoc_manifest'
+"""Имя файла со списком сгенерированных страниц в директории с
+документацией (см. remove_stale)."""
 
-def clear_dir(path_dir):
+
+def clear_dir(path_dir, keep=()):
     """Очистить директорию.
 
     :param path_dir: str, полный путь к директории
+    :param keep: tuple, пути, которые нужно оставить
     """
+    keep = [os.path.abspath(k) for k in keep if k]
     content = os.listdir(path_dir)
     for c in content:
         path = os.path.join(path_dir, c)
+        if os.path.abspath(path) in keep:
+            continue
         if os.path.isfile(path):  # удаление файлов
             os.remove(path)
         elif os.path.isdir(path):  # удаление директорий
             shutil.rmtree(path)
 
 
-def write_rst_project(modules, mods, index, path):
+def is_changed(path, lines):
+    """Проверить, отличается ли содержимое от уже записанного в файл
+    (сравнение по хэшу).
+
+    :param path: str, путь к файлу
+    :param lines: list, строки для записи
+    :return: bool, True - файла нет или содержимое отличается
+    """
+    if not os.path.isfile(path):
+        return True
+    new = hashlib.sha1()
+    for line in lines:
+        new.update(line.encode('utf-8', 'surrogatepass'))
+        new.update(b'\n')
+    try:
+        with open(path) as file:
+            old = hashlib.sha1(file.read().encode('utf-8', 'surrogatepass'))
+    except (OSError, UnicodeDecodeError):
+        return True
+    return new.digest() != old.digest()
+
+
+def write_file(path, lines, update=False):
+    """Записать строки в файл.
+
+    :param path: str, путь к файлу
+    :param lines: list или генератор строк
+    :param update: bool, True - не перезаписывать файл,
+    если содержимое не изменилось
+    :return: bool, True - файл записан, False - пропущен
+    """
+    if update:  # для сравнения нужна вся страница
+        lines = list(lines)
+        if not is_changed(path, lines):
+            return False
+    try:
+        with open(path, 'w', buffering=BUFFER) as file:
+            for line in lines:
+                file.write(line)
+                file.write('\n')
+    except Exception:  # ошибка генерации - не оставлять часть страницы
+        if os.path.isfile(path):
+            os.remove(path)
+        raise
+    return True
+
+
+def write_rst_project(modules, mods, index, path, update=False, ext='.rst'):
     """Запись rst проекта.
 
     :param modules: list, имена модулей
     :param mods: dict, словари с документацией модулей (list)
     :param index: list, index.rst
     :param path: путь к директории для записи
+    :param update: bool, True - записывать только изменившиеся файлы
+    :param ext: str, расширение файлов документации
+    :return: list, [(путь, записан ли файл), ...]
     """
+    result = []
     if index:  # запись главной страницы (если есть)
-        path_file = os.path.join(path, 'index.rst')
-        with open(path_file, 'w') as file:
-            for line in index:
-                file.write(line)
-                file.write('\n')
+        path_file = os.path.join(path, 'index' + ext)
+        result.append((path_file, write_file(path_file, index, update)))
     for module in modules:  # запись модулей
-        path_file = os.path.join(path, module + '.rst')
-        mod = mods[module]
-        with open(path_file, 'w') as file:
-            for line in mod:
-                file.write(line)
-                file.write('\n')
+        path_file = os.path.join(path, module + ext)
+        result.append((path_file, write_file(path_file, mods[module],
+                                             update)))
+    return result
+
+
+def write_rst_pages(pages, path, update=False, ext='.rst'):
+    """Запись rst страниц по мере их генерации.
+
+    :param pages: итерируемый объект с tuple, (str, генератор строк),
+    (имя модуля, документация модуля), см. RSTGenerator.iter_project
+    :param path: путь к директории для записи
+    :param update: bool, True - записывать только изменившиеся файлы
+    :param ext: str, расширение файлов документации (.html - страницы
+    HTMLGenerator.iter_project)
+    :return: list, [(путь, записан ли файл), ...]
+    """
+    result = []
+    for module, lines in pages:
+        path_file = os.path.join(path, module + ext)
+        result.append((path_file, write_file(path_file, lines, update)))
+    return result
+
+
+def read_manifest(path_dir):
+    """Прочитать манифест страниц, записанных прошлым запуском.
+
+    :param path_dir: str, путь к директории с документацией
+    :return: set, пути относительно path_dir (пустое без манифеста)
+    """
+    try:
+        with open(os.path.join(path_dir, MANIFEST),
+                  encoding='utf-8') as file:
+            return set(line for line in file.read().split('\n') if line)
+    except OSError:
+        return set()
+
+
+def __get_relative(path_dir, files):
+    """Получить пути файлов внутри директории относительно неё.
+
+    :param path_dir: str, путь к директории с документацией
+    :param files: list, пути к файлам
+    :return: set, относительные пути (файлы вне директории пропускаются)
+    """
+    path_dir = os.path.abspath(path_dir)
+    result = set()
+    for path in files:
+        path = os.path.relpath(os.path.abspath(path), path_dir)
+        if path != os.pardir and not path.startswith(os.pardir + os.sep):
+            result.add(path)
+    return result
+
+
+def write_manifest(path_dir, files):
+    """Записать манифест сгенерированных страниц (по нему remove_stale
+    отличает устаревшие страницы от добавленных вручную).
+
+    :param path_dir: str, путь к директории с документацией
+    :param files: list, пути ко всем файлам, созданным запуском
+    """
+    write_file(os.path.join(path_dir, MANIFEST),
+               sorted(__get_relative(path_dir, files)), True)
+
+
+def remove_stale(path_dir, files):
+    """Удалить устаревшие страницы: записанные прошлым запуском (есть
+    в манифесте), но не этим, и оставшиеся после этого пустыми
+    директории. Файлы, которых нет в манифесте, не удаляются.
+
+    :param path_dir: str, путь к директории с документацией
+    :param files: list, пути ко всем файлам, созданным запуском
+    :return: list, пути к удалённым файлам
+    """
+    result = []
+    root = os.path.abspath(path_dir)
+    for name in sorted(read_manifest(path_dir) -
+                       __get_relative(path_dir, files)):
+        path = os.path.join(path_dir, name)
+        if not os.path.isfile(path):
+            continue
+        os.remove(path)
+        result.append(path)
+        dir_ = os.path.dirname(os.path.abspath(path))
+        while dir_ != root and not os.listdir(dir_):  # опустевшие
+            os.rmdir(dir_)
+            dir_ = os.path.dirname(dir_)
+    return result
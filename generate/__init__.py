@@ -2,6 +2,7 @@
 Пакет с генераторами в различные форматы:
 
 - rst - пакет с генератором в rst формат
+- html - пакет с генератором в html формат
 """
 
-__all__ = ['rst']
+__all__ = ['rst', 'html']
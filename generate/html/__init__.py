@@ -0,0 +1,3 @@
+"""Пакет с генератором в *.html формат."""
+
+__all__ = ['html_generator']
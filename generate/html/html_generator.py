@@ -0,0 +1,344 @@
+"""Генератор документации в формате html."""
+from html import escape
+from analyse.data import Classes
+from analyse.enums import *
+
+__all__ = ['HTMLGenerator', 'STYLE', 'INDEX']
+
+STYLE = 'npdoc.css'
+"""Имя файла стилей в корне документации."""
+INDEX = 'index'
+"""Имя главной страницы (с деревом навигации) без расширения."""
+_HEAD = ('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+         '<title>{title}</title>\n'
+         '<link rel="stylesheet" href="{root}' + STYLE + '">\n'
+         '</head>\n<body>\n<nav class="crumbs">{crumbs}</nav>\n<main>')
+"""Начало страницы."""
+_TAIL = '</main>\n</body>\n</html>'
+"""Конец страницы."""
+_LINK = '<a href="{href}">{text}</a>'
+"""Ссылка."""
+_TYPE = '<p class="type">{text}</p>'
+"""Тип информации (документация или комментарий)."""
+_DOC = '<pre class="{cls}">{text}</pre>'
+"""Документация или комментарий."""
+_SECTION = '<section class="{cls}" id="{id}">'
+"""Начало раздела элемента."""
+_HEADER = '<h{level}><code>{text}</code></h{level}>'
+"""Заголовок раздела элемента."""
+_HIE = '<p class="hie"><strong>{title}</strong>: {links}</p>'
+"""Супер-классы или суб-классы."""
+_CSS = (
+    'body { font-family: sans-serif; margin: 0; color: #222; }',
+    'main { max-width: 60em; margin: 0 auto; padding: 1em 2em; }',
+    'nav.crumbs { padding: 0.5em 2em; background: #eee; }',
+    'section { margin: 1em 0; }',
+    'section section { margin-left: 1.5em; }',
+    'section.class > h2 { border-bottom: 1px solid #ccc; }',
+    'pre.doc, pre.com { white-space: pre-wrap; margin: 0.3em 0; }',
+    'pre.com { color: #555; }',
+    'p.type { font-style: italic; margin: 0.3em 0; color: #777; }',
+    'dt { font-family: monospace; font-weight: bold; }',
+    'ul.nav { list-style: none; padding-left: 1.2em; }',
+)
+"""Содержимое файла стилей."""
+
+
+class HTMLGenerator:
+    """Генератор документации по пакету.
+
+    Страницы строятся по тем же Sequence, SubElements и Classes, что и в
+    RSTGenerator (с теми же настройками first, depth, nohie, notype),
+    из заранее подготовленных шаблонов, и отдаются построчно (запись -
+    буферизованная, см. core.writer). Супер-классы и суб-классы - ссылки
+    на разделы классов на страницах их модулей.
+    """
+    def __init__(self, sequence, elements, classes, prop, lang, root=''):
+        """
+
+        :param sequence: Sequence из analyse.data
+        :param elements: SubElements из analyse.data
+        :param classes: Classes из analyse.data
+        :param prop: Словарь с настройками (см. RSTGenerator).
+        :param lang: Языковой словарь.
+
+        doc - документация;
+        com - комментарий;
+        sup - супер-классы;
+        sub - суб-классы;
+        index - содержание
+        :param root: str, путь от директории страниц к корню документации
+        (с / в конце, '' - страницы в корне)
+        """
+        self.sequence = sequence
+        self.elements = elements
+        self.classes = classes
+        self.root = root
+        """Путь от директории страниц к корню документации."""
+        self.__prop = prop
+        """Словарь с настройками, переданный в конструктор."""
+        self.__lang = lang['HTML_GENERATOR']
+        """Языковой словарь генератора."""
+
+    def _gen_head(self, title, root, crumbs=()):
+        """Генерация начала страницы.
+
+        :param title: str, заголовок страницы
+        :param root: str, путь к корню документации
+        :param crumbs: tuple, ссылки в навигации после ссылки на
+        содержание (готовый html)
+        :return: str
+        """
+        links = (_LINK.format(href=root + INDEX + '.html',
+                              text=escape(self.__lang['index'])),) + crumbs
+        return _HEAD.format(title=escape(title), root=root,
+                            crumbs=' / '.join(links))
+
+    def _gen_element(self, element, type_):
+        """Генерация документации по элементу (без заголовка).
+
+        :param element: tuple, (ElementType, (DocType, ()))
+        :param type_: ElementType тип (при несовпадении вернёт None)
+        :return: list
+        """
+        if element[0] != type_:  # если элемент не заданного типа
+            return None
+        result = []
+        if element[1][1]:  # если содержимое не пустое (иначе метки не нужны)
+            cls = 'doc' if element[1][0] == DocType.doc else 'com'
+            if not self.__prop['notype']:
+                result.append(_TYPE.format(text=escape(self.__lang[cls])))
+            result.append(_DOC.format(cls=cls,
+                                      text=escape('\n'.join(element[1][1]))))
+        return result
+
+    def _gen_var(self, name, element, anchor):
+        """Генерация документации по переменной.
+
+        :param name: имя переменной
+        :param element: tuple, (ElementType, (DocType, ()))
+        :param anchor: str, id раздела родителя с точкой ('' - модуль)
+        :return: list или None (элемент - не переменная)
+        """
+        doc = self._gen_element(element, ElementType.var)
+        if doc is None:
+            return None
+        result = ['<dl>', '<dt id="%s">%s</dt>' % (escape(anchor + name),
+                                                    escape(name))]
+        if doc:
+            result += ['<dd>'] + doc + ['</dd>']
+        return result + ['</dl>']
+
+    def _gen_links(self, names):
+        """Генерация ссылок на классы.
+
+        :param names: tuple, ((класс, модуль), ...), модуль 'None' -
+        класса нет в модели (ссылка не нужна)
+        :return: str
+        """
+        result = []
+        for name, module in names:
+            if module == 'None':
+                result.append('<code>%s</code>' % escape(name))
+            else:
+                result.append(_LINK.format(
+                    href=escape(module + '.html#' + name),
+                    text='<code>%s</code>' % escape(name)))
+        return ', '.join(result)
+
+    def _iter_func(self, module, cls, name, els=(), doc=None):
+        """Генерация документации по функции или методу (построчно).
+
+        :param module: имя модуля
+        :param cls: имя класса
+        :param name: имя функции
+        :param els: tuple, иерархия имён суб-элементов,
+        в порядке от верхнего до нижнего
+        :param doc: описание функции
+        :return: генератор строк
+        """
+        gels = els + (name,)  # для вызова функций
+        anchor = '.'.join(Classes.cut_round(e) for e in
+                          els + ((cls,) if cls else ()) + (name,))
+        yield _SECTION.format(cls='function', id=escape(anchor))
+        yield _HEADER.format(level=3, text=escape(name))
+        if cls:  # если это метод класса (элементы метода, не класса)
+            content = self.elements.get_self_local(module, cls, gels)
+            sequence = self.sequence.get_self_local_elements(module, cls, gels)
+        else:  # если это функция модуля
+            content = self.elements.get_global_local(module, gels)
+            sequence = self.sequence.get_global_local_elements(module, gels)
+        if doc:  # вставка описания функции
+            yield from doc
+        if cls:
+            t_fun = ElementType.met
+        else:
+            t_fun = ElementType.fun
+        for e_name in sequence:  # обработка последовательности
+            if e_name in content:  # если есть документация
+                element = content[e_name]
+                if type(element) != tuple:
+                    element = element[None]
+                if element[0] == ElementType.var:  # переменные
+                    gv = self._gen_var(e_name, element, anchor + '.')
+                    if gv:
+                        yield from gv
+                elif element[0] == t_fun:  # функции / методы
+                    if cls:  # как в RSTGenerator
+                        continue
+                    yield from self._iter_func(
+                        module, cls, e_name, gels,
+                        self._gen_element(element, element[0]))
+                elif element[0] == ElementType.cl:  # классы
+                    yield from self._iter_class(
+                        module, e_name, els,
+                        self._gen_element(element, ElementType.cl))
+        yield '</section>'
+
+    def _iter_class(self, module, name, els=(), doc=None):
+        """Генерация документации по классу (построчно).
+
+        :param module: имя модуля
+        :param name: имя класса
+        :param els: tuple, иерархия имён суб-элементов,
+        в порядке от верхнего до нижнего
+        :param doc: описание класса
+        :return: генератор строк
+        """
+        gels = els + (name,)
+        anchor = '.'.join(Classes.cut_round(e) for e in gels)
+        yield _SECTION.format(cls='class', id=escape(anchor))
+        yield _HEADER.format(level=2 if not els else 3, text=escape(name))
+        if els:  # если это вложенный класс
+            content = self.elements.get_self_local(module, name, els)
+            sequence = self.sequence.get_self_local_elements(module, name, els)
+        else:  # если это нормальный класс
+            if not self.__prop['nohie']:  # ссылки на супер и суб классы
+                sup = self.classes.get_super_names(name)
+                sub = self.classes.get_sub_names(name)
+                if sup:
+                    yield _HIE.format(title=escape(self.__lang['sup']),
+                                      links=self._gen_links(sup))
+                if sub:
+                    yield _HIE.format(title=escape(self.__lang['sub']),
+                                      links=self._gen_links(sub))
+            content = self.elements.get_self(module, name)
+            sequence = self.sequence.get_self_elements(module, name)
+        if doc:  # вставка описания класса
+            yield from doc
+        var = []
+        classes = []
+        func = []
+        for e_name in sequence:  # заполнение списков по типам
+            if e_name in content:
+                element = content[e_name]
+                if element[0] == ElementType.var:
+                    var.append((e_name, element))
+                elif element[0] == ElementType.cl:
+                    classes.append((e_name, element))
+                elif element[0] == ElementType.met:
+                    func.append((e_name, element))
+        for first in self.__prop['first']:  # обработка последовательности
+            if first == 'v':  # переменные
+                for v in var:
+                    doc_vars = self._gen_var(v[0], v[1], anchor + '.')
+                    if doc_vars:
+                        yield from doc_vars
+            elif first == 'f':  # функции
+                for f in func:
+                    yield from self._iter_func(
+                        module, name, f[0], els,
+                        self._gen_element(f[1], ElementType.met))
+            elif first == 'c':  # классы
+                for c in classes:  # рекурсивное документирование подклассов
+                    yield from self._iter_class(
+                        module, c[0], gels,
+                        self._gen_element(c[1], ElementType.cl))
+        yield '</section>'
+
+    def _iter_module(self, module):
+        """Генерация документации по модулю (построчно).
+
+        :param module: имя модуля
+        :return: генератор строк
+        """
+        yield self._gen_head(module, self.root, ('<span>%s</span>' %
+                                                 escape(module),))
+        yield '<h1>%s</h1>' % escape(module)
+        elements = self.elements.get_global(module)
+        sequence = self.sequence.get_global_elements(module)
+        cls_sequence = self.sequence.get_classes(module)
+        if None in elements:  # документация по модулю
+            yield from self._gen_element(elements[None], ElementType.mo)
+        for first in self.__prop['first']:  # обработка последовательности
+            if first == 'c':  # отдельная обработка классов
+                for name in cls_sequence:
+                    if name in elements:
+                        yield from self._iter_class(
+                            module, name, doc=self._gen_element(
+                                elements[name], ElementType.cl))
+                continue
+            for name in sequence:  # обработка остальных типов
+                if name not in elements:
+                    continue
+                element = elements[name]
+                if first == 'v':  # переменные
+                    doc_vars = self._gen_var(name, element, '')
+                    if doc_vars:
+                        yield from doc_vars
+                elif first == 'f':  # функции
+                    doc_func = self._gen_element(element, ElementType.fun)
+                    if doc_func is not None:
+                        yield from self._iter_func(module, None, name,
+                                                   doc=doc_func)
+        yield _TAIL
+
+    def iter_project(self, modules=None):
+        """Генерация документации по пакету (по странице за раз).
+
+        :param modules: имена модулей, документацию которых нужно создать
+        (None - все модули пакета)
+        :return: генератор tuple, (str, генератор строк),
+        (имя модуля, документация модуля)
+        """
+        if modules is None:
+            modules = self.sequence.get_modules()
+        for module in modules:
+            yield module, self._iter_module(module)
+
+    def gen_index(self, pages):
+        """Генерация главной страницы с деревом навигации по проекту.
+
+        :param pages: list, страницы модулей, пути относительно корня
+        документации без расширения, через /
+        :return: list
+        """
+        result = [self._gen_head(self.__lang['index'], ''),
+                  '<h1>%s</h1>' % escape(self.__lang['index']),
+                  '<ul class="nav">']
+        opened = []  # пакеты текущей страницы, списки которых открыты
+        for page in sorted(pages, key=lambda page: page.split('/')):
+            parts = page.split('/')
+            common = 0
+            while common < min(len(opened), len(parts) - 1) and\
+                    opened[common] == parts[common]:
+                common += 1
+            while len(opened) > common:  # выход из пакетов
+                result.append('</ul></li>')
+                opened.pop()
+            for part in parts[common:-1]:  # вход в пакеты
+                result.append('<li>%s<ul class="nav">' % escape(part))
+                opened.append(part)
+            result.append('<li>%s</li>' % _LINK.format(
+                href=escape(page + '.html'), text=escape(parts[-1])))
+        result += ['</ul></li>'] * len(opened)
+        result += ['</ul>', _TAIL]
+        return result
+
+    @staticmethod
+    def gen_style():
+        """Генерация файла стилей.
+
+        :return: list
+        """
+        return list(_CSS)
@@ -82,17 +82,21 @@ class RSTGenerator:
             result += self._gen_tree(self.sequence.get_modules())
         return result
 
-    def _gen_element(self, e_name, element, type_):
+    def _gen_element(self, e_name, element, type_, head=True):
         """генерация документации по элементу.
 
         :param e_name: имя элемента
         :param element: tuple, (ElementType, (DocType, ()))
         :param type_: ElementType тип (при несовпадении вернёт None)
+        :param head: bool, False - без заголовка (только описание)
         :return: list
         """
         if element[0] != type_:  # если элемент не заданного типа
             return None
-        result = [e_name, '+' * len(e_name), '']
+        if head:
+            result = [e_name, '+' * len(e_name), '']
+        else:
+            result = []
         if element[1][1]:  # если содержимое не пустое (иначе метки не нужны)
             if not self.__prop['notype']:
                 if element[1][0] == DocType.doc:  # документация
@@ -116,15 +120,28 @@ class RSTGenerator:
         :param doc: описание функции
         :return: list
         """
+        return list(self._iter_func(module, cls, name, els, doc))
+
+    def _iter_func(self, module, cls, name, els=(), doc=None):
+        """Генерация документации по функции или методу (построчно).
+
+        :param module: имя модуля
+        :param cls: имя класса
+        :param name: имя функции
+        :param els: tuple, иерархия имён суб-элементов,
+        в порядке от верхнего до нижнего
+        :param doc: описание функции
+        :return: генератор строк
+        """
         gels = els + (name,)  # для вызова функций
         if els:  # составление иерархии в заголовке
             hie = ''
             for e in els:
                 hie += e + ' -> '
             hie += '**' + name + '**'
-            result = [hie, '~' * len(hie), '']
+            yield from (hie, '~' * len(hie), '')
         else:  # простой заголовок
-            result = [name, '-' * len(name), '']
+            yield from (name, '-' * len(name), '')
         if cls:  # если это метод класса
             if els:  # если это локальная функция
                 content = self.elements.get_self_local(module, cls, gels)
@@ -137,7 +154,8 @@ class RSTGenerator:
             content = self.elements.get_global_local(module, gels)
             sequence = self.sequence.get_global_local_elements(module, gels)
         if doc:  # вставка описания функции
-            result += doc + ['']
+            yield from doc
+            yield ''
         if cls:
             t_fun = ElementType.met
         else:
@@ -150,28 +168,25 @@ class RSTGenerator:
                 if element[0] == ElementType.var:  # переменные
                     gv = self._gen_element(e_name, element[1], ElementType.var)
                     if gv:
-                        result += gv
+                        yield from gv
                 elif element[0] == t_fun:  # функции / методы
 
                     # ВРЕМЕННЫЙ КОСТЫЛЬ
                     if cls:
                         continue
 
-                    doc_func = self._gen_element(e_name, element, element[0])
-                    if doc_func:
-                        doc_func = doc_func[3:]
-                    result += [''] + self._gen_func(module, cls, e_name, gels,
-                                                    doc_func)
+                    doc_func = self._gen_element(e_name, element, element[0],
+                                                 False)
+                    yield ''
+                    yield from self._iter_func(module, cls, e_name, gels,
+                                               doc_func)
                 elif element[0] == ElementType.cl:  # классы
                     doc_cls = self._gen_element(e_name, element,
-                                                ElementType.cl)
-                    if doc_cls:
-                        doc_cls = doc_cls[3:]
-                    result += [''] + self._gen_class(module, e_name, els,
-                                                     doc_cls)
+                                                ElementType.cl, False)
+                    yield ''
+                    yield from self._iter_class(module, e_name, els, doc_cls)
         if not cls and not els:
-            result.append('')
-        return result
+            yield ''
 
     def _gen_class(self, module, name, els=(), doc=None):
         """Генерация документации по классу.
@@ -183,6 +198,18 @@ class RSTGenerator:
         :param doc: описание класса
         :return: list
         """
+        return list(self._iter_class(module, name, els, doc))
+
+    def _iter_class(self, module, name, els=(), doc=None):
+        """Генерация документации по классу (построчно).
+
+        :param module: имя модуля
+        :param name: имя класса
+        :param els: tuple, иерархия имён суб-элементов,
+        в порядке от верхнего до нижнего
+        :param doc: описание класса
+        :return: генератор строк
+        """
         gels = els + (name,)
         if els:  # если это вложенный класс
             # последовательность в заголовок
@@ -190,11 +217,11 @@ class RSTGenerator:
             for e in els:
                 hie += e + ' -> '
             hie += '**' + name + '**'
-            result = [hie, '~' * len(hie), '']
+            yield from (hie, '~' * len(hie), '')
             content = self.elements.get_self_local(module, name, els)
             sequence = self.sequence.get_self_local_elements(module, name, els)
         else:  # если это нормальный класс
-            result = [name, '=' * len(name), '']
+            yield from (name, '=' * len(name), '')
             if not self.__prop['nohie']:
                 sub = self.classes.get_sub_names(name)
                 sup = self.classes.get_super_names(name)
@@ -208,17 +235,18 @@ class RSTGenerator:
                     sp += s[0] + ', '
                 sp = sp[:-2]
                 if sup:  # если есть супер-классы
-                    result +=\
-                        ['**' + self.__lang['RST_GENERATOR']['sup'] + '**:',
-                         '', sp, '']
+                    yield from (
+                        '**' + self.__lang['RST_GENERATOR']['sup'] + '**:',
+                        '', sp, '')
                 if sub:  # если есть суб-классы
-                    result +=\
-                        ['**' + self.__lang['RST_GENERATOR']['sub'] + '**:',
-                         '', sb, '']
+                    yield from (
+                        '**' + self.__lang['RST_GENERATOR']['sub'] + '**:',
+                        '', sb, '')
             content = self.elements.get_self(module, name)
             sequence = self.sequence.get_self_elements(module, name)
         if doc:  # вставка описания класса
-            result += doc + ['']
+            yield from doc
+            yield ''
         var = []
         classes = []
         func = []
@@ -232,29 +260,31 @@ class RSTGenerator:
                 elif element[0] == ElementType.met:
                     func.append((e_name, element))
         if var or classes or func:
-            result.append('')
+            yield ''
         for first in self.__prop['first']:  # обработка последовательности
             if first == 'v':  # переменные
                 for v in var:
                     doc_vars = self._gen_element(v[0], v[1], ElementType.var)
                     if doc_vars:
-                        result += doc_vars
+                        yield from doc_vars
             elif first == 'f':  # функции
                 for f in func:
-                    doc_func =\
-                        self._gen_element(f[0], f[1], ElementType.met)[3:]
+                    doc_func = self._gen_element(f[0], f[1], ElementType.met,
+                                                 False)
                     if doc_func:
-                        result += [''] + self._gen_func(module, name, f[0],
-                                                        els, doc_func)
+                        yield ''
+                        yield from self._iter_func(module, name, f[0], els,
+                                                   doc_func)
             elif first == 'c':  # классы
                 for c in classes:  # рекурсивное документирование подклассов
-                    doc_cls = self._gen_element(c[0], c[1], ElementType.cl)[3:]
+                    doc_cls = self._gen_element(c[0], c[1], ElementType.cl,
+                                                False)
                     if doc_cls:
-                        result += [''] + self._gen_class(module, c[0], gels,
-                                                         doc_cls)
+                        yield ''
+                        yield from self._iter_class(module, c[0], gels,
+                                                    doc_cls)
         if not els:
-            result.append('')
-        return result
+            yield ''
 
     def _gen_module(self, module):
         """Генерация документации по модулю.
@@ -262,18 +292,27 @@ class RSTGenerator:
         :param module: имя модуля
         :return: list
         """
-        result = ['=' * len(module), module, '=' * len(module), '']
+        return list(self._iter_module(module))
+
+    def _iter_module(self, module):
+        """Генерация документации по модулю (построчно).
+
+        :param module: имя модуля
+        :return: генератор строк
+        """
+        yield from ('=' * len(module), module, '=' * len(module), '')
         elements = self.elements.get_global(module)
         sequence = self.sequence.get_global_elements(module)
         cls_sequence = self.sequence.get_classes(module)
         mod = self.elements.get_module(module)
         if mod:  # генерация документации по модулю
-            m_doc = self._gen_element(module, mod, ElementType.mo)[3:]
-            result += m_doc + ['', '']
+            m_doc = self._gen_element(module, mod, ElementType.mo, False)
+            yield from m_doc
+            yield from ('', '')
             if module == '__init__':  # сохранение описания пакета
                 self.__init = m_doc
         else:
-            result.append('')
+            yield ''
         for first in self.__prop['first']:  # обработка последовательности
             e_type = None  # определение текущего типа
             if first == 'v':
@@ -287,14 +326,9 @@ class RSTGenerator:
                 for name in cls_sequence:
                     if name in elements:
                         element = elements[name]
-                        doc_cls = \
-                            self._gen_element(name, element, ElementType.cl)
-                        if doc_cls:
-                            doc_cls = doc_cls[3:]
-                            result +=\
-                                self._gen_class(module, name, doc=doc_cls)
-                        else:
-                            result += self._gen_class(module, name)
+                        doc_cls = self._gen_element(name, element,
+                                                    ElementType.cl, False)
+                        yield from self._iter_class(module, name, doc=doc_cls)
                 continue
             for name in sequence:  # обработка остальных типов
                 if name in elements:
@@ -302,17 +336,32 @@ class RSTGenerator:
                     if e_type == ElementType.var:  # переменные
                         doc_vars = self._gen_element(name, element, e_type)
                         if doc_vars:
-                            result += doc_vars + ['']
+                            yield from doc_vars
+                            yield ''
                     if e_type == ElementType.fun:  # функции
-                        doc_func =\
-                            self._gen_element(name, element, ElementType.fun)
-                        if doc_func:
-                            doc_func = doc_func[3:]
-                            result += self._gen_func(module, None, name,
-                                                     doc=doc_func)
+                        doc_func = self._gen_element(name, element,
+                                                     ElementType.fun, False)
+                        if doc_func is not None:
+                            yield from self._iter_func(module, None, name,
+                                                       doc=doc_func)
             if first == 'v':
-                result.append('')
-        return result
+                yield ''
+
+    def iter_project(self, modules=None):
+        """Генерация документации по пакету (по странице за раз).
+
+        Каждая страница генерируется построчно при записи, поэтому в памяти
+        не хранится документация всего пакета.
+
+        :param modules: имена модулей, документацию которых нужно создать
+        (None - все модули пакета)
+        :return: генератор tuple, (str, генератор строк),
+        (имя модуля, документация модуля)
+        """
+        if modules is None:
+            modules = self.sequence.get_modules()
+        for module in modules:
+            yield module, self._iter_module(module)
 
     def gen_project(self):
         """Генерация документации по пакету.
@@ -322,7 +371,8 @@ class RSTGenerator:
 
         Ключи для словаря - имена модулей, содержимое - list.
         """
-        modules = self.sequence.get_modules()  # последовательность модулей
+        # последовательность модулей
+        modules = list(self.sequence.get_modules())
         mods = {}  # словарь с документацией по ним
         for module in modules:
             mods[module] = self._gen_module(module)
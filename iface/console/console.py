@@ -1,6 +1,5 @@
 """Модуль с консольным интерфейсом."""
 from iface.iface import IfaceTemplate
-from core.core import Generator
 
 
 class IfaceConsole(IfaceTemplate):
@@ -13,14 +12,119 @@ class IfaceConsole(IfaceTemplate):
         :param help_str: str, справка
          """
         IfaceTemplate.__init__(self, prop, lang, help_str)
-        self.generator = Generator(prop, lang)
+        self.generator = None
+        """Generator из core.core (создаётся при запуске)."""
 
     def start(self):
+        if self._prop['query']:  # запрос к индексу, без генерации
+            self._query()
+            return
+        # генератор (анализаторы, multiprocessing) импортируется только
+        # при запуске, чтобы справка и проверка аргументов были быстрыми
+        import sqlite3
+        from core.core import Generator
+        self.generator = Generator(self._prop, self._lang)
+        watcher = None
+        if self._prop['watch']:  # до генерации, чтобы не пропустить правки
+            from core.watcher import Watcher
+            watcher = Watcher(self._prop['path'], self._prop['include'],
+                              self._prop['exclude'])
         print(self._lang['CONSOLE']['start'])
-        if self.generator.start():
-            print(self._lang['CONSOLE']['end'])
-        else:
-            print(self._lang['CONSOLE']['notfound'])
+        try:
+            try:
+                result = self.generator.start()
+            except sqlite3.DatabaseError:  # -index указывает не на индекс
+                print(self._lang['CONSOLE']['badindex'],
+                      self._get_index())
+                return
+            if result:
+                self._print_result(self._prop['update'])
+                if watcher:
+                    self._watch(watcher)
+            else:
+                print(self._lang['CONSOLE']['notfound'])
+        finally:  # пул процессов сохраняется с опцией watch
+            self.generator.close()
+            if watcher:
+                watcher.close()
+
+    def _query(self):
+        """Вывод ответа на запрос к индексу символов (опция query)."""
+        import sqlite3
+        import core.index as index
+        query = self._prop['query']
+        if query[0] not in index.QUERIES or\
+                len(query) != (1 if query[0] == 'undoc' else 2):
+            print(self._lang['CONSOLE']['badquery'])
+            return
+        path = self._get_index()
+        try:
+            index_ = index.Index(path, False)
+        except (OSError, sqlite3.DatabaseError):
+            print(self._lang['CONSOLE']['noindex'], path)
+            return
+        try:
+            if query[0] == 'def':  # где определён символ
+                rows = index_.find(query[1])
+            elif query[0] == 'sub':  # суб-классы
+                rows = index_.get_subclasses(query[1])
+            else:  # публичные функции и методы без документации
+                rows = index_.get_undocumented()
+        finally:
+            index_.close()
+        print(self._lang['CONSOLE']['found'], len(rows))
+        for module, qualname, kind, signature, path, page in rows:
+            print('%s.%s (%s) %s %s' % (module, qualname, kind, path, page))
+
+    def _get_index(self):
+        """Получить путь к индексу символов (опция index).
+
+        :return: str
+        """
+        import os
+        import core.index as index
+        return self._prop['index'] or\
+            os.path.join(self._prop['out'], index.FILE)
+
+    def _watch(self, watcher):
+        """Обновлять документацию при изменении модулей (опция watch),
+        до прерывания (Ctrl+C).
+
+        :param watcher: core.watcher.Watcher
+        """
+        import traceback
+        print(self._lang['CONSOLE']['watch'])
+        try:
+            while True:
+                changed = watcher.wait()
+                print(self._lang['CONSOLE']['modified'])
+                for path in sorted(changed):
+                    print(path)
+                try:
+                    self.generator.start(changed)
+                except Exception:  # ошибка не прерывает отслеживание
+                    traceback.print_exc()
+                    continue
+                self._print_result(True)
+        except KeyboardInterrupt:
+            pass
+
+    def _print_result(self, changed):
+        """Вывод результата запуска генератора.
+
+        :param changed: bool, True - вывести изменённые файлы
+        """
+        if changed:  # вывод изменённых файлов
+            print(self._lang['CONSOLE']['changed'])
+            for path in self.generator.get_changed():
+                print(path)
+        profile = self.generator.get_profile()
+        if profile:  # вывод самых медленных модулей
+            print(self._lang['CONSOLE']['slowest'])
+            for module, seconds in profile[0].get_slowest():
+                print('%.3f %s' % (seconds, module))
+            print(self._lang['CONSOLE']['report'], profile[1])
+        print(self._lang['CONSOLE']['end'])
 
     def print_help(self):
         print(self._help)
@@ -1,28 +1,84 @@
 """Модуль для работы с локализациями."""
 import os
-import sys
-from configparser import ConfigParser
+import marshal
 
-PATH = os.path.join(sys.path[0], 'lang', 'langs')
+PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'langs')
 """Путь к папке с конфигами."""
 ENCODING = 'UTF-8'
 """Кодировка конфигов (UTF-8)."""
 DEFAULT = 'ru'
 """Локализация по-умолчанию."""
+CACHE = '.cache'
+"""Расширение файлов с скомпилированными локализациями (рядом с
+конфигами)."""
+
+
+def __compile(path_lang):
+    """Прочитать конфиг локализации в обычные словари.
+
+    :param path_lang: str, путь к конфигу
+    :return: dict, {секция: {ключ: строка}}
+    """
+    from configparser import ConfigParser  # только при компиляции
+    config = ConfigParser()
+    config.read(path_lang, ENCODING)
+    return {section: dict(config[section]) for section in config}
+
+
+def __load(path_cache, mtime):
+    """Прочитать скомпилированную локализацию.
+
+    :param path_cache: str, путь к файлу
+    :param mtime: int, время изменения конфига (в наносекундах)
+    :return: dict или None (нет файла или он устарел)
+    """
+    try:
+        with open(path_cache, 'rb') as file:
+            cached = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if type(cached) != tuple or len(cached) != 2 or cached[0] != mtime:
+        return None
+    return cached[1]
+
+
+def __save(path_cache, mtime, result):
+    """Записать скомпилированную локализацию (ошибки записи
+    игнорируются, например, при установке только для чтения).
+
+    :param path_cache: str, путь к файлу
+    :param mtime: int, время изменения конфига (в наносекундах)
+    :param result: dict, локализация
+    """
+    tmp = path_cache + '.' + str(os.getpid())
+    try:
+        with open(tmp, 'wb') as file:
+            marshal.dump((mtime, result), file)
+        os.replace(tmp, path_cache)
+    except OSError:
+        if os.path.isfile(tmp):
+            os.remove(tmp)
 
 
 def get_lang(lang):
     """Получить словарь локализации.
 
+    Конфиг компилируется в обычные словари и сохраняется рядом с ним
+    (файл .cache), пока конфиг не изменится.
+
     :param lang: имя конфига
-    :return: dict
+    :return: dict, {секция: {ключ: строка}}
     """
     path_lang = os.path.join(PATH, lang + '.conf')
-    if os.path.isfile(path_lang):
-        config = ConfigParser()
-        config.read(path_lang, ENCODING)
-        return dict(config)
-    return {}
+    if not os.path.isfile(path_lang):
+        return {}
+    mtime = os.stat(path_lang).st_mtime_ns
+    path_cache = os.path.join(PATH, lang + CACHE)
+    result = __load(path_cache, mtime)
+    if result is None:  # нет или устарела
+        result = __compile(path_lang)
+        __save(path_cache, mtime, result)
+    return result
 
 
 def get_langs():
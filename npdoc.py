@@ -3,19 +3,35 @@
 import sys
 from core import parser
 from iface.enums import IfaceType
-from iface.console.console import IfaceConsole
 
 
 def _get_iface(type_):
-    """Получить нужный интерфейс.
+    """Получить нужный интерфейс (импортируется только выбранный).
 
     :param type_: IfaceType
     :return: интерфейс, наследующий IfaceTemplate
     """
     if type_ == IfaceType.console:
+        from iface.console.console import IfaceConsole
         return IfaceConsole
 
 
+def document(path=None, sources=None, model=False, **options):
+    """Создать документацию в памяти, без записи на диск (см.
+    core.api.document, для повторного использования анализатора -
+    core.api.Documenter).
+
+    :param path: str, путь к Python проекту либо модулю
+    :param sources: dict, {имя модуля: исходный код, ...} (вместо path)
+    :param model: bool, True - вернуть результат анализа (только с sources)
+    :param options: опции, как в командной строке, без дефиса
+    :return: генератор tuple, (имя страницы, генератор строк), или
+    tuple, (Sequence, SubElements, Classes)
+    """
+    from core.api import document as document_
+    return document_(path, sources, model, **options)
+
+
 if __name__ == '__main__':
     lang = parser.get_lang(sys.argv)  # локализация
     prop, help_ = parser.get_dict(sys.argv, lang)  # настройки
@@ -0,0 +1,13 @@
+"""Тесты (запуск из корня проекта: python -m unittest или python -m
+pytest).
+
+- utils: общие функции тестов
+- test_api: программный интерфейс (core.api)
+- test_data: контейнеры данных анализа
+- test_html: генератор html
+- test_index: индекс символов в SQLite
+- test_merged: общая модель пакета (опции -proc и -step)
+- test_pipeline: конвейер генерации
+- test_update: запись только изменившихся файлов (опция -update)
+- test_watch: обновление документации при изменениях (опция -watch)
+"""
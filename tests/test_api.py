@@ -0,0 +1,56 @@
+"""Тесты программного интерфейса (core.api)."""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from analyse.data import encode
+from core.api import Documenter, document
+
+SOURCE = '''class A:
+    """Класс."""
+    def method(self):
+        pass
+'''
+"""Модуль для документации."""
+
+
+class TestApi(unittest.TestCase):
+    def test_model(self):
+        model = document(sources={'mod': SOURCE}, model=True)
+        self.assertIn('A', model[1].get_global('mod'))
+
+    def test_render(self):
+        pages = {name: ''.join(lines) for name, lines in
+                 Documenter(gen='html').render({'mod': SOURCE})}
+        self.assertIn('method', pages['mod'])
+
+    def test_model_with_path(self):
+        with self.assertRaises(ValueError):
+            document(path=os.curdir, model=True)
+        with self.assertRaises(ValueError):
+            document()
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as dir_:
+            model = Documenter(cache=dir_).analyse({'mod': SOURCE})
+            self.assertTrue(os.listdir(dir_))
+            self.assertEqual(encode(Documenter(cache=dir_).analyse(
+                {'mod': SOURCE})), encode(model))
+        with self.assertRaises(ValueError):
+            Documenter(cache='')
+
+    def test_outside(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = ('from core.api import document; '
+                'print(len(list(document(sources={"m": "x = 1"}))))')
+        env = dict(os.environ, PYTHONPATH=root)
+        with tempfile.TemporaryDirectory() as dir_:  # вне директории npdoc
+            result = subprocess.run([sys.executable, '-c', code], cwd=dir_,
+                                    env=env, stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout.strip(), b'1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Тесты контейнеров данных анализа (analyse.data)."""
+import unittest
+from analyse.data import *
+from analyse.enums import ElementType, DocType
+from core.api import Documenter
+
+DOC = (DocType.doc, ('Документация.',))
+"""Документация элементов."""
+VAR = (ElementType.var, (None, ()))
+"""Переменная без документации."""
+SOURCE = '''"""Модуль."""
+x = 1  # переменная
+
+
+def func(a, b=2):
+    """Функция."""
+    y = a
+
+
+class A:
+    """Класс."""
+    z = 'ä'
+
+    def method(self):
+        self.w = 1
+
+    class Inner:
+        pass
+
+
+class B(A):
+    pass
+'''
+"""Модуль для сериализации (функции, классы, локальные переменные)."""
+FUNC = 'func(a, b=2)'
+"""Сигнатура функции модуля SOURCE."""
+
+
+def get_elements():
+    """Создать контейнер с элементами модуля, класса и функций.
+
+    :return: SubElements
+    """
+    elements = SubElements()
+    elements.add(None, 'mod', ElementType.mo, doc=DOC)
+    elements.add('A', 'mod', ElementType.cl, doc=DOC)
+    elements.add('x', 'mod', ElementType.var)
+    elements.add('func', 'mod', ElementType.fun)
+    elements.add('y', 'mod', ElementType.var, sub_el=('func',))
+    elements.add('method', 'mod', ElementType.met, 'A', doc=DOC)
+    elements.add('z', 'mod', ElementType.var, 'A', ('method',))
+    return elements
+
+
+class TestElements(unittest.TestCase):
+    def test_getters(self):
+        elements = get_elements()
+        self.assertEqual(elements.get_global('mod'), {
+            None: (ElementType.mo, DOC), 'A': (ElementType.cl, DOC),
+            'x': VAR, 'func': (ElementType.fun, (None, ()))})
+        self.assertEqual(list(elements.get_global('mod')),
+                         [None, 'A', 'x', 'func'])
+        self.assertEqual(elements.get_global_local('mod', ('func',)),
+                         {'y': {None: VAR}})
+        self.assertEqual(elements.get_self('mod', 'A'),
+                         {'method': (ElementType.met, DOC)})
+        self.assertEqual(elements.get_global('other'), {})
+        self.assertNotIn(None, elements.get_self('mod', 'A'))
+        self.assertEqual(elements.get_self_local('mod', 'A', ('method',)),
+                         {'z': {None: VAR}})
+        self.assertEqual(elements.get_global_local('mod', ('func',))['y']
+                         [None], VAR)
+
+    def test_replace(self):
+        elements = get_elements()
+        elements.add('x', 'mod', ElementType.var, doc=DOC)
+        self.assertEqual(list(elements.get_global('mod')),
+                         [None, 'A', 'x', 'func'])  # место сохраняется
+        self.assertEqual(elements.get_global('mod')['x'],
+                         (ElementType.var, DOC))
+
+    def test_merge(self):
+        elements = get_elements()
+        other = SubElements()
+        other.merge(elements)
+        self.assertEqual(other.els.keys(), elements.els.keys())
+        other.add('new', 'mod', ElementType.var)
+        self.assertNotIn('new', elements.get_global('mod'))
+
+
+class TestSequence(unittest.TestCase):
+    def test_merge(self):
+        sequence = Sequence()
+        sequence.add('mod', el=('x',))
+        sequence.add('mod', 'A', ('method',))
+        other = Sequence()
+        other.merge(sequence)
+        self.assertEqual(other.mods, sequence.mods)
+        other.add('mod', el=('y',))
+        other.add('mod', 'A', ('other',))
+        self.assertEqual(sequence.get_global_elements('mod'), ['x'])
+        self.assertEqual(sequence.get_self_elements('mod', 'A'),
+                         ['method'])
+        self.assertEqual(other.get_global_elements('mod'), ['x', 'y'])
+
+    def test_local(self):
+        sequence = Sequence()
+        sequence.add('mod', 'A', ('method',))
+        sequence.add('mod', 'A', ('method', 'z'))
+        self.assertEqual(
+            sequence.get_self_local_elements('mod', 'A', ('method',)), ['z'])
+
+
+class TestEncode(unittest.TestCase):
+    def test_round_trip(self):
+        model = Documenter().analyse({'mod': SOURCE, 'sub': 'import mod'})
+        data = encode(model)
+        result = decode(data)
+        self.assertEqual(encode(result), data)
+        self.assertEqual(result[0].mods, model[0].mods)
+        self.assertIsInstance(result[1], SubElements)
+        self.assertEqual(set(result[1].els), set(model[1].els))
+        for module in model[0].get_modules():
+            self.assertEqual(result[1].get_global(module),
+                             model[1].get_global(module))
+            for cls in model[0].get_classes(module):
+                self.assertEqual(result[1].get_self(module, cls),
+                                 model[1].get_self(module, cls))
+        self.assertEqual(result[1].get_global_local('mod', (FUNC,)),
+                         model[1].get_global_local('mod', (FUNC,)))
+        self.assertIn('y', result[1].get_global_local('mod', (FUNC,)))
+        self.assertEqual(result[2].cls, model[2].cls)
+        self.assertEqual(result[2].names, model[2].names)
+        self.assertEqual(result[2].get_sub_names('A'),
+                         model[2].get_sub_names('A'))
+        self.assertIn(('B', 'mod'), result[2].get_sub_names('A'))
+
+    def test_none(self):
+        elements = Elements()
+        elements.add('x', 'mod', ElementType.var)
+        sequence, result, classes = decode(encode((None, elements, None)))
+        self.assertIsNone(sequence)
+        self.assertIsNone(classes)
+        self.assertNotIsInstance(result, SubElements)
+        self.assertEqual(result.get_global('mod'), {'x': VAR})
+
+    def test_format(self):
+        data = encode((None, get_elements(), None))
+        with self.assertRaises(ValueError):
+            decode(b'NPDX' + data[4:])
+
+
+if __name__ == '__main__':
+    unittest.main()
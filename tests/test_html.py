@@ -0,0 +1,53 @@
+"""Тесты генератора html (generate.html)."""
+import re
+import unittest
+from core.api import Documenter
+
+SOURCE = '''class K:
+    """Класс."""
+    a = 1
+
+    def one(self):
+        """Первый."""
+        b = 2  # переменная метода
+
+    def two(self):
+        """Второй."""
+        c = 3
+'''
+"""Модуль с переменными класса и методов."""
+
+
+def get_section(page, id_):
+    """Получить содержимое раздела элемента.
+
+    :param page: str, страница
+    :param id_: str, id раздела
+    :return: str
+    """
+    return re.search(r'<section class="\w+" id="%s">(.*?)</section>' %
+                     re.escape(id_), page, re.S).group(1)
+
+
+class TestHtml(unittest.TestCase):
+    def setUp(self):
+        documenter = Documenter(gen='html', engine='ast')
+        self.page = ''.join(dict(documenter.render({'mod': SOURCE}))['mod'])
+
+    def test_method(self):
+        one = get_section(self.page, 'K.one')
+        self.assertIn('Первый.', one)
+        self.assertIn('<dt id="K.one.b">b</dt>', one)
+        self.assertIn('переменная метода', one)
+        self.assertNotIn('id="K.one.a"', one)  # переменная класса
+        two = get_section(self.page, 'K.two')
+        self.assertIn('<dt id="K.two.c">c</dt>', two)
+        self.assertNotIn('K.two.b', two)
+
+    def test_class(self):
+        self.assertEqual(self.page.count('<dt id="K.a">a</dt>'), 1)
+        self.assertNotIn('K.one.a', self.page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Тесты индекса символов (опции -index и -query)."""
+import os
+import sqlite3
+import tempfile
+import unittest
+import core.index as index
+from core.api import Documenter
+
+SOURCE = '''"""Модуль."""
+
+
+class A:
+    """Класс A."""
+    def method(self):
+        pass
+
+
+class B(A):
+    def _private(self):
+        pass
+
+
+class C(B):
+    pass
+
+
+def func(x):
+    """Функция."""
+    return x
+
+
+def undoc():
+    pass
+'''
+"""Модуль для индекса."""
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, index.FILE)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def fill(self):
+        """Создать индекс с модулем SOURCE."""
+        model = Documenter().analyse({'mod': SOURCE})
+        index_ = index.Index(self.path)
+        index_.add('pkg.mod', os.path.join(self.dir.name, 'mod.py'),
+                   'pkg/mod.rst', model, 'mod')
+        index_.commit()
+        index_.close()
+
+    def test_queries(self):
+        self.fill()
+        index_ = index.Index(self.path, False)
+        try:
+            found = index_.find('A.method')
+            self.assertEqual([(row[0], row[1], row[2]) for row in found],
+                             [('pkg.mod', 'A.method', 'method')])
+            self.assertEqual(index_.find('pkg.mod.func')[0][1], 'func')
+            self.assertEqual(
+                [row[1] for row in index_.get_subclasses('A')], ['B', 'C'])
+            self.assertEqual(
+                [row[1] for row in index_.get_undocumented()],
+                ['undoc', 'A.method'])
+        finally:
+            index_.close()
+
+    def test_retain(self):
+        self.fill()
+        index_ = index.Index(self.path)
+        index_.retain(())
+        index_.commit()
+        self.assertEqual(index_.find('A'), [])
+        index_.close()
+
+    def test_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            index.Index(self.path, False)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_empty_file(self):
+        open(self.path, 'w').close()
+        self.fill()
+        index_ = index.Index(self.path, False)
+        self.assertTrue(index_.find('A'))
+        index_.close()
+
+    def test_text_file_kept(self):
+        with open(self.path, 'w') as file:
+            file.write('notes\n')
+        for create in (True, False):
+            with self.assertRaises(sqlite3.DatabaseError):
+                index.Index(self.path, create)
+        with open(self.path) as file:
+            self.assertEqual(file.read(), 'notes\n')
+
+    def test_database_kept(self):
+        db = sqlite3.connect(self.path)
+        db.execute('CREATE TABLE users (name TEXT)')
+        db.execute('CREATE TABLE meta (key TEXT, value TEXT)')
+        db.execute("INSERT INTO meta VALUES ('version', '1')")
+        db.commit()
+        db.close()
+        with self.assertRaises(sqlite3.DatabaseError):
+            index.Index(self.path)
+        db = sqlite3.connect(self.path)
+        tables = [row[0] for row in db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")]
+        db.close()
+        self.assertEqual(tables, ['users', 'meta'])
+
+    def test_old_version(self):
+        self.fill()
+        db = sqlite3.connect(self.path)
+        db.execute("UPDATE meta SET value = '0'")
+        db.commit()
+        db.close()
+        with self.assertRaises(sqlite3.DatabaseError):
+            index.Index(self.path, False)
+        index.Index(self.path).close()  # пересоздаётся
+        index_ = index.Index(self.path, False)
+        self.assertEqual(index_.find('A'), [])
+        index_.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
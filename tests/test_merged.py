@@ -0,0 +1,41 @@
+"""Тесты общей модели пакета: количество процессов и шаг (опции -proc и
+-step) не должны влиять на результат."""
+import os
+import tempfile
+import unittest
+import bench.project as project
+from tests.utils import *
+
+
+class TestMerged(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'proj')
+        project.gen_project(self.path, SHAPE)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def run_generator(self, *args):
+        """Создать документацию проекта.
+
+        :param args: str, дополнительные опции
+        :return: dict, файлы документации (см. read_dir)
+        """
+        out = os.path.join(self.dir.name, 'out' + '_'.join(args))
+        self.assertTrue(get_generator('-path', self.path, '-out', out,
+                                      '-search', *args).start())
+        return read_dir(out)
+
+    def test_same_output(self):
+        expected = self.run_generator('-proc', '1')
+        for args in (('-proc', '1', '-step', '2'),
+                     ('-proc', '2'),
+                     ('-proc', '2', '-step', '2'),
+                     ('-proc', '3', '-step', '5')):
+            with self.subTest(args=args):
+                self.assertEqual(self.run_generator(*args), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Тесты конвейера генерации (core.pipeline)."""
+import os
+import signal
+import threading
+import unittest
+from multiprocessing import Pool
+import core.pipeline as pipeline
+
+
+def work(data):
+    """Обработка задачи (задача 3 завершает процесс аварийно).
+
+    :param data: int, задача
+    :return: int
+    """
+    if data == 3:
+        os.kill(os.getpid(), signal.SIGKILL)
+    return data * 2
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.pool = Pool(2)
+
+    def tearDown(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    def run_pipeline(self, tasks):
+        """Выполнить задачи конвейером (не дольше 10 секунд).
+
+        :param tasks: list, задачи
+        :return: tuple, (list, результаты, BaseException или None)
+        """
+        results = []
+        errors = []
+
+        def target():
+            try:
+                pipeline.run(tasks, self.pool, lambda task: task, work,
+                             results.append, 2, 4, 0.1)
+            except BaseException as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())  # не завис
+        return results, errors[0] if errors else None
+
+    def test_results(self):
+        results, error = self.run_pipeline([0, 1, 2, 4, 5])
+        self.assertIsNone(error)
+        self.assertEqual(sorted(results), [0, 2, 4, 8, 10])
+
+    def test_killed(self):
+        results, error = self.run_pipeline(list(range(8)))
+        self.assertIsInstance(error, RuntimeError)
+
+
+if __name__ == '__main__':
+    unittest.main()
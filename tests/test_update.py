@@ -0,0 +1,52 @@
+"""Тесты записи только изменившихся файлов (опция -update)."""
+import os
+import tempfile
+import unittest
+import bench.project as project
+from tests.utils import *
+
+
+class TestUpdate(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'proj')
+        self.modules = project.gen_project(self.path, SHAPE)
+        self.out = os.path.join(self.dir.name, 'out')
+        self.assertTrue(self.start())
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def start(self):
+        """Запустить генерацию с опцией -update.
+
+        :return: Generator
+        """
+        generator = get_generator('-path', self.path, '-out', self.out,
+                                  '-update')
+        return generator if generator.start() else None
+
+    def test_unchanged(self):
+        self.assertEqual(self.start().get_changed(), [])
+
+    def test_user_pages(self):
+        pages = [os.path.join(self.out, 'intro.rst'),
+                 os.path.join(self.out, 'guide', 'usage.rst')]
+        os.mkdir(os.path.join(self.out, 'guide'))
+        for path in pages:  # страницы, добавленные вручную
+            with open(path, 'w') as file:
+                file.write('Guide\n=====\n')
+        page = os.path.join(self.out, os.path.relpath(
+            self.modules['m2'], self.path))[:-3] + '.rst'
+        self.assertTrue(os.path.isfile(page))
+        os.remove(self.modules['m2'])
+        generator = self.start()
+        self.assertFalse(os.path.isfile(page))  # устаревшая страница
+        for path in pages:
+            self.assertTrue(os.path.isfile(path))
+            self.assertNotIn(path, generator.get_changed())
+        self.assertNotIn(page, generator.get_changed())
+
+
+if __name__ == '__main__':
+    unittest.main()
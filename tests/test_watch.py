@@ -0,0 +1,135 @@
+"""Тесты обновления документации при изменениях (опция -watch): после
+каждого изменения результат должен совпадать с полной генерацией."""
+import os
+import tempfile
+import threading
+import unittest
+import bench.project as project
+from core.watcher import Watcher
+from tests.utils import *
+
+
+class TestWatch(unittest.TestCase):
+    proc = '1'
+    """Количество процессов (опция -proc)."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.modules = project.gen_project(
+            os.path.join(self.dir.name, 'proj'), SHAPE)
+        # путь с ./ и .. (не нормализованный), как в командной строке
+        self.path = os.path.join(os.curdir, os.path.relpath(
+            os.path.join(self.dir.name, 'proj')))
+        self.out = os.path.join(self.dir.name, 'out')
+        self.generator = get_generator(
+            '-path', self.path, '-out', self.out, '-proc', self.proc,
+            '-watch')
+        self.assertTrue(self.generator.start())
+
+    def tearDown(self):
+        self.generator.close()
+        self.dir.cleanup()
+
+    def check(self, changed):
+        """Обновить документацию и сравнить с полной генерацией.
+
+        :param changed: set, пути к изменённым модулям
+        """
+        self.assertTrue(self.generator.start(changed))
+        out = os.path.join(self.dir.name, 'fresh')
+        self.assertTrue(get_generator(
+            '-path', self.path, '-out', out, '-proc', self.proc).start())
+        self.assertEqual(read_dir(self.out), read_dir(out))
+
+    def get_path(self, name):
+        """Получить путь к модулю, как его передаёт Watcher.
+
+        :param name: str, имя модуля проекта
+        :return: str
+        """
+        return os.path.join(self.path, os.path.relpath(
+            self.modules[name], os.path.join(self.dir.name, 'proj')))
+
+    def test_delete(self):
+        path = self.get_path('m2')
+        os.remove(path)
+        self.check({path})
+
+    def test_modify(self):
+        path = self.get_path('m5')
+        with open(path, 'a') as file:
+            file.write('\n\nclass Added(C5_0):\n    """Новый."""\n')
+        self.check({path})
+
+    def test_add(self):
+        path = os.path.join(os.path.dirname(self.get_path('m1')), 'new.py')
+        with open(path, 'w') as file:
+            file.write('class New(C1_0):\n    pass\n')
+        self.check({path})
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'proj')
+        self.modules = project.gen_project(self.path, SHAPE)
+        self.watcher = Watcher(self.path, interval=0.1)
+
+    def tearDown(self):
+        self.watcher.close()
+        self.dir.cleanup()
+
+    def wait(self):
+        """Дождаться изменений (не дольше 5 секунд).
+
+        :return: set, см. Watcher.wait (None - изменения не замечены)
+        """
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(self.watcher.wait()), daemon=True)
+        thread.start()
+        thread.join(5)
+        return result[0] if result else None
+
+    def test_between_waits(self):
+        generator = get_generator(
+            '-path', self.path, '-out', os.path.join(self.dir.name, 'out'),
+            '-watch')
+        try:
+            self.assertTrue(generator.start())
+            self.modify('m3')
+            changed = self.wait()
+            self.assertEqual(changed, {self.modules['m3']})
+            self.assertTrue(generator.start(changed))
+            # правка во время генерации: после обхода, до следующего wait
+            self.modify('m7')
+            self.assertEqual(self.wait(), {self.modules['m7']})
+        finally:
+            generator.close()
+
+    def test_new_dir(self):
+        path = os.path.join(self.path, 'added')
+        os.mkdir(path)
+        with open(os.path.join(path, '__init__.py'), 'w') as file:
+            file.write('')
+        self.assertEqual(self.wait(), {os.path.join(path, '__init__.py')})
+        self.modules['new'] = os.path.join(path, 'new.py')
+        self.modify('new')
+        self.assertEqual(self.wait(), {self.modules['new']})
+
+    def modify(self, name):
+        """Дописать класс в модуль.
+
+        :param name: str, имя модуля проекта
+        """
+        with open(self.modules[name], 'a') as file:
+            file.write('\n\nclass Added:\n    pass\n')
+
+
+class TestWatchMerged(TestWatch):
+    """То же с общей моделью пакета (несколько процессов)."""
+    proc = '2'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""Общие функции тестов."""
+import os
+import core.parser as parser
+from core.core import Generator
+
+__all__ = ['SHAPE', 'get_generator', 'read_dir']
+
+SHAPE = {'modules': 12, 'lines': 80, 'depth': 2, 'classes': 3, 'fanout': 2,
+         'docs': 0.5}
+"""Форма синтетического проекта (см. bench.project.SHAPES): два уровня
+пакетов, классы наследуются от классов предыдущих модулей."""
+
+
+def get_generator(*args):
+    """Создать генератор с опциями командной строки.
+
+    :param args: str, опции (например, '-path', 'proj', '-out', 'out')
+    :return: Generator
+    """
+    lang = parser.get_lang([])
+    return Generator(parser.get_dict(list(args), lang)[0], lang)
+
+
+def read_dir(path):
+    """Прочитать все файлы директории (рекурсивно).
+
+    :param path: str, путь к директории
+    :return: dict, {путь относительно path: содержимое (bytes)}
+    """
+    result = {}
+    for dir_, dirs, files in os.walk(path):
+        for name in files:
+            path_file = os.path.join(dir_, name)
+            with open(path_file, 'rb') as file:
+                result[os.path.relpath(path_file, path)] = file.read()
+    return result